@@ -0,0 +1,41 @@
+"""
+Payload size and serialization time of a full GetGameboardStatusReply against
+a GetGameboardDeltaReply carrying only the changed cells.
+
+Usage: python benchmarks/bench_board_delta.py
+"""
+import random
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import server_pb2
+from benchmarks.common import time_calls
+from game.models.board import Board
+
+SIZES = [10, 100, 1000]
+CHANGED_CELLS = [2, 16]
+
+
+def main():
+    rng = random.Random(5)
+    print(f"{'size':>6} {'changed':>8} {'full B':>10} {'delta B':>8} {'full us':>9} {'delta us':>9}")
+    for size in SIZES:
+        board = Board(size)
+        for _ in range(8):
+            board.set(rng.randrange(size), rng.randrange(size), 'V')
+        full = server_pb2.GetGameboardStatusReply(status=True, visible_cells=board.render())
+        number = 20 if size >= 1000 else 2000
+        full_time = time_calls(full.SerializeToString, number)
+        for changed in CHANGED_CELLS:
+            delta = server_pb2.GetGameboardDeltaReply(
+                status=True, version=board.version, full=False,
+                changes=[server_pb2.CellChange(row=rng.randrange(size), col=rng.randrange(size), value='V')
+                         for _ in range(changed)])
+            delta_time = time_calls(delta.SerializeToString, 2000)
+            print(f"{size:>6} {changed:>8} {full.ByteSize():>10,} {delta.ByteSize():>8,} "
+                  f"{full_time:>9.2f} {delta_time:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Memory held by one board, and by one full game record, for the legacy
+List[List[str]] layout and the bytearray-backed Board.
+
+Usage: python benchmarks/bench_board_memory.py
+"""
+import sys
+import os
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from game.models.board import Board
+from game.patterns.factory import StandardGameFactory
+
+SIZES = [10, 100, 1000]
+
+
+class _IdSource:
+    """Stand-in for GameState exposing what the factory needs."""
+    def __init__(self, board_size):
+        self.board_size = board_size
+
+    def _allocate_game_id(self):
+        return 1
+
+
+def allocated_bytes(build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    obj = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del obj
+    return after - before
+
+
+def main():
+    print(f"{'size':>6} {'lists B':>14} {'Board B':>14} {'game B':>14} {'ratio':>7}")
+    for size in SIZES:
+        legacy = allocated_bytes(lambda: [[' ' for _ in range(size)] for _ in range(size)])
+        compact = allocated_bytes(lambda: Board(size))
+        factory = StandardGameFactory(_IdSource(size))
+        game = allocated_bytes(lambda: factory.create_game())
+        print(f"{size:>6} {legacy:>14,} {compact:>14,} {game:>14,} {legacy / compact:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Cold start against a database seeded with many players: the legacy eager
+load of every party and player against lazy hydration of one active game.
+
+The SQLite file is seeded once and reused between runs.
+
+Usage: python benchmarks/bench_cold_start.py [players] [db_path]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from sqlalchemy import insert, select, func
+
+from benchmarks.common import use_sqlite_file, fresh_game_state
+from db.database import Session
+from db.models import Party, Player, PlayerInParty
+import server_pb2
+
+PLAYERS_PER_PARTY = 8
+ACTIVE_EVERY = 10
+CHUNK = 50000
+
+
+def seed(engine, players):
+    with engine.begin() as connection:
+        if connection.execute(select(func.count()).select_from(Player)).scalar() >= players:
+            return
+    parties = players // PLAYERS_PER_PARTY
+    with engine.begin() as connection:
+        for start in range(0, parties, CHUNK):
+            connection.execute(insert(Party), [
+                {"id_party": p, "title_party": f"Game {p}", "winner": None if p % ACTIVE_EVERY == 0 else "Wolves"}
+                for p in range(start + 1, min(parties, start + CHUNK) + 1)])
+        for start in range(0, players, CHUNK):
+            ids = range(start + 1, min(players, start + CHUNK) + 1)
+            connection.execute(insert(Player), [{"id_player": i, "pseudo": f"P{i}"} for i in ids])
+            connection.execute(insert(PlayerInParty), [
+                {"id_party": (i - 1) // PLAYERS_PER_PARTY + 1, "id_player": i,
+                 "id_role": server_pb2.Wolf if i % PLAYERS_PER_PARTY == 1 else server_pb2.Villager,
+                 "is_alive": True} for i in ids])
+
+
+def legacy_load():
+    """What GameState._load_state_from_db used to do."""
+    session = Session()
+    games, players = {}, {}
+    try:
+        for party in session.query(Party).all():
+            games[party.id_party] = {"id_game": party.id_party, "title": party.title_party, "players": []}
+        for player in session.query(Player).all():
+            players[player.id_player] = {"id_player": player.id_player, "name": player.pseudo, "is_alive": True}
+    finally:
+        session.close()
+    return games, players
+
+
+def measure(label, action):
+    Session.remove()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = action()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{label:>28} {elapsed:>9.3f} s {peak / 2**20:>9.1f} MiB peak")
+    return result
+
+
+def main():
+    players = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    db_path = sys.argv[2] if len(sys.argv) > 2 else os.path.join(tempfile.gettempdir(), f"cold_start_{players}.sqlite")
+    engine = use_sqlite_file(db_path)
+    start = time.perf_counter()
+    seed(engine, players)
+    print(f"{players:,} players in {db_path} (seeded in {time.perf_counter() - start:.1f} s)")
+
+    measure("legacy eager load", legacy_load)
+    game_state = measure("lazy GameState()", fresh_game_state)
+    measure("first access, active game", lambda: game_state.get_game(ACTIVE_EVERY))
+    measure("first access, finished game", lambda: game_state.get_game(1))
+
+
+if __name__ == "__main__":
+    main()
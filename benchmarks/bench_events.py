@@ -0,0 +1,83 @@
+"""
+Cost of raising game events for the thread that raises them.
+
+player_moved is raised --events times, as Move does, with the observers of a
+server attached: a LoggingObserver and a BoardWatchHub, plus a slow observer
+spending --slow-us microseconds per event (analytics, fan-out to another
+service, ...).
+
+    sync            GameEventManager, every observer runs in the caller
+    async           AsyncGameEventManager, events go to per-observer ring
+                    buffers drained in batches by a background thread
+
+The time per event seen by the caller is reported, then, once the queues are
+drained, the events delivered and dropped and the largest lag. Logging runs at
+WARNING unless --log-info is given, in which case the event lines go to a
+handler writing nowhere.
+
+Usage: python benchmarks/bench_events.py [--events 20000] [--slow-us 50] [--policy drop_oldest]
+"""
+import argparse
+import logging
+import sys
+import os
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from game.patterns.observer import Observer, GameEventManager, AsyncGameEventManager, LoggingObserver
+from game.streaming import BoardWatchHub, Subscription
+
+
+class SlowObserver(Observer):
+    def __init__(self, seconds):
+        self.seconds = seconds
+
+    def update(self, game_id, event_type, data):
+        deadline = time.perf_counter() + self.seconds
+        while time.perf_counter() < deadline:
+            pass
+
+
+def run(manager, args, logger):
+    hub = BoardWatchHub()
+    hub.subscribe(Subscription(1, maxsize=10 ** 7))
+    manager.attach(LoggingObserver(logger))
+    manager.attach(hub)
+    manager.attach(SlowObserver(args.slow_us / 1e6))
+
+    start = time.perf_counter()
+    for i in range(args.events):
+        manager.player_moved(1, i % 8 + 1, (0, 0), (0, 1))
+    elapsed = time.perf_counter() - start
+    manager.stop()
+    return elapsed / args.events
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--slow-us", type=float, default=50.0, help="time spent by the slow observer per event")
+    parser.add_argument("--queue-size", type=int, default=4096)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--policy", choices=("drop_oldest", "drop_newest", "block"), default="drop_oldest")
+    parser.add_argument("--log-info", action="store_true", help="log every event at INFO")
+    args = parser.parse_args()
+
+    logger = logging.getLogger("bench_events")
+    logger.propagate = False
+    logger.addHandler(logging.StreamHandler(open(os.devnull, "w")))
+    logger.setLevel(logging.INFO if args.log_info else logging.WARNING)
+
+    print(f"{'dispatch':>10} {'us/event':>10} {'delivered':>10} {'dropped':>10} {'max lag ms':>11}")
+    per_event = run(GameEventManager(), args, logger)
+    print(f"{'sync':>10} {per_event * 1e6:>10.2f} {args.events * 3:>10} {0:>10} {0:>11.1f}")
+    manager = AsyncGameEventManager(workers=1, queue_size=args.queue_size, batch_size=args.batch_size,
+                                    drop_policy=args.policy)
+    per_event = run(manager, args, logger)
+    stats = manager.stats()
+    print(f"{'async':>10} {per_event * 1e6:>10.2f} {stats['delivered']:>10} {stats['dropped']:>10} "
+          f"{stats['max_lag_seconds'] * 1000:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
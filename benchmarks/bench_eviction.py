@@ -0,0 +1,74 @@
+"""
+Soak test for game eviction: play many short games to the end, then
+compare the memory held by GameState before and after evicting them, and
+the cost of bringing one back through GetGameStatus.
+
+Playing the games dominates the runtime, about a minute per 1,000 games
+with tracemalloc on, so the default is 1,000.
+
+Usage: python benchmarks/bench_eviction.py [games]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.common import use_sqlite_memory, fresh_game_state, time_calls
+from game.eviction import GameArchive, GameEvictor
+from game.server import GameServerServicer
+import server_pb2
+
+PLAYERS_PER_GAME = 8
+
+
+def play_games(game_state, games):
+    """Fill games and kill their wolf so they end with a winner."""
+    finished = []
+    for _ in range(games):
+        game_id = game_state.create_new_game()
+        player_ids = [game_state.add_player_to_game(f"P{i}", game_id)[0] for i in range(PLAYERS_PER_GAME)]
+        game_state._kill_player(player_ids[0])
+        finished.append((game_id, player_ids[-1]))
+    return finished
+
+
+def main():
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    use_sqlite_memory()
+    game_state = fresh_game_state()
+    servicer = GameServerServicer()
+
+    with tempfile.TemporaryDirectory() as archive_dir:
+        game_state.archive = GameArchive(archive_dir)
+        evictor = GameEvictor(game_state, finished_ttl=0, idle_ttl=3600)
+
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+        finished = play_games(game_state, games)
+        resident = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        evicted = evictor.run_once()
+        elapsed = time.perf_counter() - start
+        after = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        # The archive writes to a directory of its own under archive_dir
+        directory = game_state.archive.directory
+        archived = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+        print(f"{games:,} finished games of {PLAYERS_PER_GAME} players")
+        print(f"{'in memory before eviction':>28} {(resident - baseline) / 2**20:>9.2f} MiB")
+        print(f"{'in memory after eviction':>28} {(after - baseline) / 2**20:>9.2f} MiB")
+        print(f"{'archive on disk':>28} {archived / 2**20:>9.2f} MiB ({archived / max(evicted, 1):.0f} B/game)")
+        print(f"{'eviction pass':>28} {elapsed * 1000:>9.1f} ms for {evicted:,} games")
+
+        def status():
+            game_id, player_id = finished.pop()
+            servicer.GetGameStatus(server_pb2.GetGameStatusRequest(id_game=game_id, id_player=player_id), None)
+
+        print(f"{'GetGameStatus, restore':>28} {time_calls(status, min(1000, games)):>9.1f} us/call")
+
+
+if __name__ == "__main__":
+    main()
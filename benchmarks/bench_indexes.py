@@ -0,0 +1,115 @@
+"""
+Query plans and timings of the common lookups before and after the indexes.
+
+A database is seeded without the secondary indexes (parties with their
+players, turns and plays), then each query is explained and timed. The
+migration (db.migrations.upgrade) then creates the indexes and the same
+queries are run again.
+
+    players   players of a party
+    alive     alive players of a party
+    turns     turns of a party
+    plays     plays of a turn
+
+SQLite is used unless a database URL is given, PostgreSQL plans come from EXPLAIN.
+The URL must point to an empty scratch database: the tables are created and dropped.
+
+Usage: python benchmarks/bench_indexes.py [parties] [database_url]
+"""
+import datetime
+import logging
+import random
+import sys
+import os
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from sqlalchemy import create_engine, insert, select, text
+from benchmarks.common import time_calls
+from db.database import Base
+from db.migrations import upgrade
+from db.models import Party, Role, Player, PlayerInParty, Turn, PlayerPlay
+from config import MAX_PLAYERS_PER_GAME
+import server_pb2
+
+TURNS_PER_PARTY = 10
+QUERIES = {
+    "players": lambda party, turn: select(PlayerInParty).where(PlayerInParty.id_party == party),
+    "alive": lambda party, turn: select(PlayerInParty).where(PlayerInParty.id_party == party,
+                                                             PlayerInParty.is_alive.is_(True)),
+    "turns": lambda party, turn: select(Turn).where(Turn.id_party == party),
+    "plays": lambda party, turn: select(PlayerPlay).where(PlayerPlay.id_turn == turn),
+}
+
+
+def seed(engine, parties):
+    rng = random.Random(7)
+    now = datetime.datetime.utcnow()
+    Base.metadata.create_all(engine)
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.drop(engine)
+    with engine.begin() as connection:
+        connection.execute(insert(Role), [{"id_role": server_pb2.Wolf, "description_role": "Wolf"},
+                                          {"id_role": server_pb2.Villager, "description_role": "Villager"}])
+        connection.execute(insert(Party), [{"id_party": p, "title_party": f"Game {p}", "winner": "Wolves"}
+                                           for p in range(1, parties + 1)])
+        players, memberships, turns, plays = [], [], [], []
+        for party in range(1, parties + 1):
+            seats = [(party - 1) * MAX_PLAYERS_PER_GAME + seat + 1 for seat in range(MAX_PLAYERS_PER_GAME)]
+            for seat, player in enumerate(seats):
+                players.append({"id_player": player, "pseudo": f"P{player}"})
+                memberships.append({"id_party": party, "id_player": player,
+                                    "id_role": server_pb2.Wolf if seat == 0 else server_pb2.Villager,
+                                    "is_alive": rng.random() < 0.3})
+            for turn in range((party - 1) * TURNS_PER_PARTY + 1, party * TURNS_PER_PARTY + 1):
+                turns.append({"id_turn": turn, "id_party": party, "start_time": now, "end_time": now})
+                plays.extend({"id_player": player, "id_turn": turn, "start_time": now, "action": "move",
+                              "origin_position_row": 0, "origin_position_col": 0,
+                              "target_position_row": 0, "target_position_col": 1} for player in seats)
+        for model, rows in ((Player, players), (PlayerInParty, memberships), (Turn, turns), (PlayerPlay, plays)):
+            connection.execute(insert(model), rows)
+    return len(plays)
+
+
+def explain(connection, statement):
+    sql = str(statement.compile(dialect=connection.dialect, compile_kwargs={"literal_binds": True}))
+    if connection.dialect.name == "sqlite":
+        return "; ".join(row[-1] for row in connection.execute(text(f"EXPLAIN QUERY PLAN {sql}")))
+    return " / ".join(row[0].strip() for row in connection.execute(text(f"EXPLAIN {sql}")))
+
+
+def measure(engine, parties, label):
+    rng = random.Random(11)
+    print(f"\n{label}")
+    with engine.connect() as connection:
+        for name, build in QUERIES.items():
+            party = rng.randint(1, parties)
+            turn = rng.randint(1, parties * TURNS_PER_PARTY)
+            statement = build(party, turn)
+            per_call = time_calls(lambda: connection.execute(statement).all(), 50)
+            print(f"{name:>8} {per_call:>10.0f} us  {explain(connection, statement)}")
+
+
+def main():
+    parties = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    logging.getLogger().setLevel(logging.WARNING)
+    db_dir = tempfile.TemporaryDirectory()
+    url = sys.argv[2] if len(sys.argv) > 2 else f"sqlite:///{os.path.join(db_dir.name, 'indexes.sqlite')}"
+    engine = create_engine(url)
+    try:
+        plays = seed(engine, parties)
+        print(f"{parties:,} parties, {plays:,} plays")
+        measure(engine, parties, "without indexes")
+        upgrade(engine)
+        if engine.dialect.name == "postgresql":
+            with engine.begin() as connection:
+                connection.execute(text("ANALYZE"))
+        measure(engine, parties, "after the migration")
+    finally:
+        Base.metadata.drop_all(engine)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Joins per second on an SQLite file with synchronous persistence.
+
+    check-then-insert   one join per call, the player is looked up before the
+                        Player and PlayerInParty rows are added (previous path)
+    upsert              one join per call, INSERT ... ON CONFLICT DO NOTHING
+    party               a whole party per call with add_players_to_game,
+                        one multi-row upsert per table
+
+Usage: python benchmarks/bench_joins.py [games]
+"""
+import sys
+import os
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from sqlalchemy.exc import SQLAlchemyError
+from benchmarks.common import use_sqlite_file, fresh_game_state
+from config import MAX_PLAYERS_PER_GAME
+from db.models import Player, PlayerInParty
+from db.persistence import SyncPersistence, apply_operations
+
+
+class CheckThenInsertPersistence(SyncPersistence):
+    """The registration path before the upserts: look the player up, then insert."""
+
+    def _write(self, operations):
+        session = self.session_factory()
+        try:
+            for kind, data in operations:
+                if kind != "add_player":
+                    apply_operations(session, [(kind, data)])
+                    continue
+                if session.query(Player).filter_by(id_player=data["id_player"]).first() is None:
+                    session.add(Player(id_player=data["id_player"], pseudo=data["name"]))
+                session.flush()
+                session.add(PlayerInParty(id_party=data["id_party"], id_player=data["id_player"],
+                                          id_role=data["id_role"], is_alive=data.get("is_alive", True)))
+            session.commit()
+            return True
+        except SQLAlchemyError:
+            session.rollback()
+            return False
+        finally:
+            session.close()
+
+
+def join_one_by_one(game_state, game_ids):
+    for game_id in game_ids:
+        for i in range(MAX_PLAYERS_PER_GAME):
+            game_state.add_player_to_game(f"P{i}", game_id)
+
+
+def join_parties(game_state, game_ids):
+    names = [f"P{i}" for i in range(MAX_PLAYERS_PER_GAME)]
+    for game_id in game_ids:
+        game_state.add_players_to_game(names, game_id)
+
+
+def run(db_dir, label, persistence, join, games):
+    use_sqlite_file(os.path.join(db_dir, f"{label}.sqlite"))
+    game_state = fresh_game_state()
+    if persistence is not None:
+        game_state.persistence = persistence
+    game_ids = [game_state.create_new_game() for _ in range(games)]
+
+    start = time.perf_counter()
+    join(game_state, game_ids)
+    elapsed = time.perf_counter() - start
+    game_state.shutdown()
+    return games * MAX_PLAYERS_PER_GAME / elapsed
+
+
+def main():
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    db_dir = tempfile.TemporaryDirectory()
+    print(f"{'path':>18} {'joins/s':>10}")
+    results = [
+        ("check-then-insert", run(db_dir.name, "legacy", CheckThenInsertPersistence(), join_one_by_one, games)),
+        ("upsert", run(db_dir.name, "upsert", None, join_one_by_one, games)),
+        ("party", run(db_dir.name, "party", None, join_parties, games)),
+    ]
+    for label, rate in results:
+        print(f"{label:>18} {rate:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Rows per second written by each MoveJournal flush strategy.
+
+Runs against a throwaway SQLite file by default. Set BENCH_DB_URL to a
+PostgreSQL URL to include the COPY strategy.
+
+Usage: python benchmarks/bench_journal.py [rows]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from db.database import Base
+from db.journal import MoveJournal, FLUSH_STRATEGIES
+
+PLAYERS_PER_ROUND = 8
+
+
+def run(engine, strategy, rows):
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    journal = MoveJournal(sessionmaker(bind=engine), strategy=strategy, batch_size=rows + 1, flush_interval=3600)
+    games = max(1, rows // PLAYERS_PER_ROUND)
+    for game_id in range(1, games + 1):
+        for player in range(PLAYERS_PER_ROUND):
+            journal.record_play(game_id, 1, game_id * PLAYERS_PER_ROUND + player, "move", (0, 0), (0, 1))
+    start = time.perf_counter()
+    written = journal.flush()
+    return written / (time.perf_counter() - start)
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    db_url = os.environ.get("BENCH_DB_URL")
+    path = None
+    if not db_url:
+        fd, path = tempfile.mkstemp(suffix=".sqlite")
+        os.close(fd)
+        db_url = f"sqlite:///{path}"
+    engine = create_engine(db_url)
+    try:
+        print(f"{engine.dialect.name}, {rows} rows")
+        print(f"{'strategy':>12} {'rows/s':>12}")
+        for strategy in FLUSH_STRATEGIES:
+            if strategy == "copy" and engine.dialect.name != "postgresql":
+                print(f"{strategy:>12} {'n/a':>12}")
+                continue
+            print(f"{strategy:>12} {run(engine, strategy, rows):>12.0f}")
+    finally:
+        engine.dispose()
+        if path:
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Measure the cost of the metrics interceptor.
+
+The same closed-loop mix of board polling, status polling and joins runs
+against a server with metrics disabled, then against one with the interceptor
+and database timing enabled. Throughput and client-side p50/p99 are reported
+for both, followed by the server-side view returned by GetServerStats.
+
+Usage: python benchmarks/bench_metrics.py [seconds] [clients]
+"""
+import sys
+import os
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import grpc
+import server_pb2
+import server_pb2_grpc
+from benchmarks.common import running_server, percentiles
+from benchmarks.bench_server_modes import client_loop
+
+
+def run(port, clients, seconds):
+    channel = grpc.insecure_channel(f"localhost:{port}")
+    stub = server_pb2_grpc.GameServerStub(channel)
+    game_ids = [int(stub.CreateGame(server_pb2.CreateGameRequest()).game_id) for _ in range(clients)]
+    deadline = time.perf_counter() + seconds
+    samples = [[] for _ in range(clients)]
+    threads = [threading.Thread(target=client_loop, args=(stub, game_ids, deadline, samples[i], i))
+               for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = stub.GetServerStats(server_pb2.GetServerStatsRequest())
+    channel.close()
+    latencies = [sample for per_client in samples for sample in per_client]
+    return len(latencies) / seconds, percentiles(latencies), stats
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 3.0
+    clients = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    print(f"{'metrics':>8} {'rps':>10} {'p50 ms':>8} {'p99 ms':>8}")
+    results = {}
+    for enabled in (False, True):
+        with running_server("sync", metrics_enabled=enabled, metrics_port=0) as port:
+            rps, latency, stats = run(port, clients, seconds)
+        results[enabled] = rps
+        label = "on" if enabled else "off"
+        print(f"{label:>8} {rps:>10.0f} {latency['p50'] * 1000:>8.2f} {latency['p99'] * 1000:>8.2f}")
+    overhead = (1 - results[True] / results[False]) * 100 if results[False] else 0.0
+    print(f"throughput cost of the interceptor: {overhead:.1f}%")
+
+    print(f"\n{'method':>20} {'calls':>8} {'p50 ms':>8} {'p99 ms':>8} {'db ms/call':>11}")
+    for method in stats.methods:
+        db_per_call = method.db_seconds_sum / method.calls * 1000 if method.calls else 0.0
+        print(f"{method.method:>20} {method.calls:>8} {method.latency_p50 * 1000:>8.2f} "
+              f"{method.latency_p99 * 1000:>8.2f} {db_per_call:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
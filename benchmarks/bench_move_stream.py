@@ -0,0 +1,75 @@
+"""
+Moves per second for a bot fleet: one unary Move call per player against one
+MoveStream call per round carrying every player's move.
+
+The server runs in a child process. Every game is filled so that it starts,
+then each round submits one move per player of every game.
+
+Usage: python benchmarks/bench_move_stream.py [games] [rounds] [sync|async]
+"""
+import random
+import sys
+import os
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import grpc
+import server_pb2
+import server_pb2_grpc
+from benchmarks.common import running_server
+from config import MAX_PLAYERS_PER_GAME
+
+MOVES = ["00", "01", "10", "11"]
+
+
+def setup(stub, games):
+    players = []
+    for _ in range(games):
+        game_id = int(stub.CreateGame(server_pb2.CreateGameRequest()).game_id)
+        for i in range(MAX_PLAYERS_PER_GAME):
+            reply = stub.GameSubscribe(server_pb2.GameSubscribeRequest(player=f"bot{i}", id_game=game_id))
+            players.append((game_id, reply.id_player))
+    return players
+
+
+def round_requests(players, rng):
+    return [server_pb2.MoveRequest(id_party=game_id, id_player=player_id, move=rng.choice(MOVES))
+            for game_id, player_id in players]
+
+
+def unary(stub, players, rounds, rng):
+    accepted = 0
+    for _ in range(rounds):
+        for request in round_requests(players, rng):
+            accepted += stub.Move(request).status
+    return accepted
+
+
+def streamed(stub, players, rounds, rng):
+    accepted = 0
+    for _ in range(rounds):
+        reply = stub.MoveStream(iter(round_requests(players, rng)))
+        accepted += sum(result.status for result in reply.results)
+    return accepted
+
+
+def main():
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    mode = sys.argv[3] if len(sys.argv) > 3 else "sync"
+    print(f"{games} games x {MAX_PLAYERS_PER_GAME} players, {rounds} rounds, {mode} server")
+    print(f"{'rpc':>10} {'moves/s':>10} {'accepted':>9}")
+    for name, submit in (("Move", unary), ("MoveStream", streamed)):
+        with running_server(mode) as port:
+            channel = grpc.insecure_channel(f"localhost:{port}")
+            stub = server_pb2_grpc.GameServerStub(channel)
+            players = setup(stub, games)
+            start = time.perf_counter()
+            accepted = submit(stub, players, rounds, random.Random(7))
+            elapsed = time.perf_counter() - start
+            channel.close()
+        print(f"{name:>10} {len(players) * rounds / elapsed:>10,.0f} {accepted:>9,}")
+
+
+if __name__ == "__main__":
+    main()
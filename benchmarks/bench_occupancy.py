@@ -0,0 +1,55 @@
+"""
+Compare the legacy linear scan of ``GameState._find_player_at_position`` with the
+per-game occupancy index as the number of games on the server grows.
+
+Usage: python benchmarks/bench_occupancy.py [max_games]
+"""
+import random
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.common import use_sqlite_memory, fresh_game_state, time_calls
+
+PLAYERS_PER_GAME = 4
+LOOKUPS = 2000
+
+
+def legacy_find_player_at_position(game_state, game_id, position):
+    for player_id, player in game_state.players.items():
+        if player.id_game == game_id and player.position == position and player.is_alive:
+            return player_id
+    return None
+
+
+def run(game_count):
+    use_sqlite_memory()
+    game_state = fresh_game_state()
+    game_ids = [game_state.create_new_game() for _ in range(game_count)]
+    for game_id in game_ids:
+        for i in range(PLAYERS_PER_GAME):
+            game_state.add_player_to_game(f"p{i}", game_id)
+
+    rng = random.Random(42)
+    probes = [(rng.choice(game_ids), (rng.randrange(game_state.board_size), rng.randrange(game_state.board_size)))
+              for _ in range(LOOKUPS)]
+    it = iter(probes)
+
+    legacy = time_calls(lambda: legacy_find_player_at_position(game_state, *next(it)), LOOKUPS)
+    it = iter(probes)
+    indexed = time_calls(lambda: game_state._find_player_at_position(*next(it)), LOOKUPS)
+    return legacy, indexed
+
+
+def main():
+    max_games = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    print(f"{'games':>8} {'players':>8} {'scan us':>10} {'index us':>10}")
+    game_count = 10
+    while game_count <= max_games:
+        legacy, indexed = run(game_count)
+        print(f"{game_count:>8} {game_count * PLAYERS_PER_GAME:>8} {legacy:>10.2f} {indexed:>10.3f}")
+        game_count *= 10
+
+
+if __name__ == "__main__":
+    main()
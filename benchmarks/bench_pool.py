@@ -0,0 +1,69 @@
+"""
+RPC throughput against the size of the database connection pool.
+
+For each pool size (no overflow) a server runs in a child process on an
+SQLite file and is driven by closed-loop client threads calling RPCs that go to
+the database: joins (one insert each) and game listings. Throughput, p99
+latency, and the checkouts that had to wait for a connection (from the
+db_pool_* gauges of GetServerStats) are reported.
+
+Usage: python benchmarks/bench_pool.py [seconds_per_size] [clients]
+"""
+import sys
+import os
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import grpc
+import server_pb2
+import server_pb2_grpc
+from benchmarks.common import running_server, percentiles
+
+POOL_SIZES = [1, 2, 4, 8, 16]
+
+
+def client_loop(stub, deadline, latencies, index):
+    calls = 0
+    game_id = None
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        if calls % 4 == 0 or game_id is None:
+            game_id = int(stub.CreateGame(server_pb2.CreateGameRequest()).game_id)
+        elif calls % 4 == 3:
+            stub.GameList(server_pb2.GameListRequest())
+        else:
+            stub.GameSubscribe(server_pb2.GameSubscribeRequest(player=f"bench{index}", id_game=game_id))
+        latencies.append(time.perf_counter() - start)
+        calls += 1
+
+
+def run(port, clients, seconds):
+    channel = grpc.insecure_channel(f"localhost:{port}")
+    stub = server_pb2_grpc.GameServerStub(channel)
+    deadline = time.perf_counter() + seconds
+    samples = [[] for _ in range(clients)]
+    threads = [threading.Thread(target=client_loop, args=(stub, deadline, samples[i], i)) for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    gauges = stub.GetServerStats(server_pb2.GetServerStatsRequest()).gauges
+    channel.close()
+    latencies = [sample for per_client in samples for sample in per_client]
+    return len(latencies) / seconds, percentiles(latencies)["p99"] * 1000, gauges
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 3.0
+    clients = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+    print(f"{'pool':>5} {'rps':>8} {'p99 ms':>8} {'waits':>8} {'wait s':>8}")
+    for size in POOL_SIZES:
+        pool = {"pool_size": size, "max_overflow": 0, "pool_timeout": 60}
+        with running_server("sync", pool_kwargs=pool, metrics_enabled=True, metrics_port=0) as port:
+            rps, p99, gauges = run(port, clients, seconds)
+        print(f"{size:>5} {rps:>8.0f} {p99:>8.2f} {gauges['db_pool_waits']:>8.0f} {gauges['db_pool_wait_seconds']:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Memory and speed of the slotted PlayerState / GameRecord types against the
+free-form dicts they replace: bytes per player, field access, and
+throughput of the move handler (MoveCommand execute + undo).
+
+As in microbench.py, database writes go to a write-behind queue and the move
+journal is not flushed before the end of the run, so only the game code is
+timed: replaying moves of the same round would otherwise have the journal
+writer insert the same plays again, on the connection the run is using.
+
+Usage: python benchmarks/bench_records.py [games]
+"""
+import random
+import sys
+import os
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.common import use_sqlite_memory, fresh_game_state, time_calls
+from db.journal import MoveJournal
+from db.persistence import WriteBehindPersistence
+from game.models.records import PlayerState
+from game.patterns.command import MoveCommand
+import server_pb2
+
+PLAYERS_PER_GAME = 8
+MOVES_PER_GAME = 100
+ACCESSES = 1_000_000
+
+
+def legacy_player(player_id):
+    """Player entry as GameState stored it before PlayerState."""
+    return {"id_player": player_id, "name": f"P{player_id}", "role": server_pb2.Villager,
+            "id_game": 1, "is_alive": True, "position": (3, 4), "view_version": 0}
+
+
+def access_time(read, player):
+    start = time.perf_counter()
+    for _ in range(ACCESSES):
+        read(player)
+    return (time.perf_counter() - start) / ACCESSES * 1e9
+
+
+def move_throughput(games):
+    use_sqlite_memory()
+    game_state = fresh_game_state()
+    game_state.persistence = WriteBehindPersistence(queue_size=10 ** 7, batch_size=10 ** 7, flush_interval=3600)
+    game_state.journal = MoveJournal(batch_size=10 ** 9, flush_interval=3600)
+    rng = random.Random(42)
+    moves = []
+    for _ in range(games):
+        game_id = game_state.create_new_game()
+        player_ids = [game_state.add_player_to_game(f"P{i}", game_id)[0] for i in range(PLAYERS_PER_GAME)]
+        game = game_state.games[game_id]
+        game.started = True
+        game.round_in_progress = 0
+        moves.extend((game_id, rng.choice(player_ids), rng.choice(["01", "10", "11"]))
+                     for _ in range(MOVES_PER_GAME))
+    it = iter(moves)
+
+    def move():
+        game_id, player_id, move_str = next(it)
+        command = MoveCommand(game_state, game_id, player_id, move_str)
+        if command.execute()[0]:
+            command.undo()
+
+    return 1e6 / time_calls(move, len(moves))
+
+
+def main():
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    legacy, slotted = legacy_player(1), PlayerState(1, "P1", server_pb2.Villager, 1, True, (3, 4))
+    print(f"{'':>12} {'bytes/player':>13} {'read ns':>9}")
+    print(f"{'dict':>12} {sys.getsizeof(legacy):>13} {access_time(lambda p: p['position'], legacy):>9.1f}")
+    print(f"{'PlayerState':>12} {sys.getsizeof(slotted):>13} {access_time(lambda p: p.position, slotted):>9.1f}")
+    print(f"move handler: {move_throughput(games):,.0f} moves/s over {games * MOVES_PER_GAME:,} moves")
+
+
+if __name__ == "__main__":
+    main()
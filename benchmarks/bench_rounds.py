@@ -0,0 +1,67 @@
+"""
+Rounds per second with many concurrent games on one RoundScheduler.
+
+Every game is filled, which starts it. Each round, half of the games get a
+move from every alive player and resolve early, the other half get a move
+from a single player and resolve when the timer wheel reaches their
+deadline.
+
+Usage: python benchmarks/bench_rounds.py [games] [rounds]
+"""
+import random
+import sys
+import os
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.common import use_sqlite_file, fresh_game_state
+from config import MAX_PLAYERS_PER_GAME
+from db import create_persistence
+from game.scheduler import RoundScheduler
+
+MOVES = ["00", "01", "10", "11"]
+
+
+def main():
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    db_dir = tempfile.TemporaryDirectory()
+    use_sqlite_file(os.path.join(db_dir.name, "rounds.sqlite"))
+    game_state = fresh_game_state()
+    game_state.persistence = create_persistence("write_behind")
+    scheduler = game_state.scheduler = RoundScheduler(game_state, round_duration=1, tick=0.1)
+
+    start = time.perf_counter()
+    game_ids = [game_state.create_new_game() for _ in range(games)]
+    for game_id in game_ids:
+        for i in range(MAX_PLAYERS_PER_GAME):
+            game_state.add_player_to_game(f"P{i}", game_id)
+    print(f"{games:,} games started in {time.perf_counter() - start:.1f} s")
+    # Keep the registration writes out of the measure
+    game_state.persistence.flush()
+
+    rng = random.Random(42)
+    clock = scheduler.wheel.origin
+    resolved = scheduler.rounds_resolved
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for index, game_id in enumerate(game_ids):
+            game = game_state.games[game_id]
+            alive = [p for p in game.players if game_state.players[p].is_alive]
+            for player_id in (alive if index % 2 == 0 else alive[:1]):
+                scheduler.submit_move(game_id, player_id, rng.choice(MOVES))
+        clock += scheduler.round_duration
+        scheduler.run_due(clock)
+    elapsed = time.perf_counter() - start
+    resolved = scheduler.rounds_resolved - resolved
+    game_state.shutdown()
+
+    finished = sum(1 for game_id in game_ids if game_state.games[game_id].winner is not None)
+    print(f"{resolved:,} rounds in {elapsed:.2f} s: {resolved / elapsed:,.0f} rounds/s "
+          f"({finished:,} games finished)")
+    db_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Compare the synchronous thread-pool server with the grpc.aio server.
+
+For each mode the server runs in its own process on in-memory SQLite and is
+driven by an increasing number of closed-loop client threads. Each client mixes
+board polling, status polling and joins. The highest RPS reached and the p99
+latency at each concurrency level are reported.
+
+Usage: python benchmarks/bench_server_modes.py [seconds_per_level]
+"""
+import random
+import sys
+import os
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import grpc
+import server_pb2
+import server_pb2_grpc
+from benchmarks.common import running_server, percentiles
+
+CONCURRENCY_LEVELS = [4, 16, 64]
+
+
+def client_loop(stub, game_ids, deadline, latencies, seed):
+    rng = random.Random(seed)
+    player_ids = {}
+    while time.perf_counter() < deadline:
+        game_id = rng.choice(game_ids)
+        roll = rng.random()
+        start = time.perf_counter()
+        if roll < 0.1 or game_id not in player_ids:
+            reply = stub.GameSubscribe(server_pb2.GameSubscribeRequest(player="bench", id_game=game_id))
+            if reply.status:
+                player_ids[game_id] = reply.id_player
+        elif roll < 0.6:
+            stub.GetGameboardStatus(server_pb2.GetGameboardStatusRequest(id_party=game_id, id_player=player_ids[game_id]))
+        else:
+            stub.GetGameStatus(server_pb2.GetGameStatusRequest(id_game=game_id, id_player=player_ids[game_id]))
+        latencies.append(time.perf_counter() - start)
+
+
+def run_level(port, clients, seconds):
+    channel = grpc.insecure_channel(f"localhost:{port}")
+    stub = server_pb2_grpc.GameServerStub(channel)
+    game_ids = [int(stub.CreateGame(server_pb2.CreateGameRequest()).game_id) for _ in range(clients)]
+    deadline = time.perf_counter() + seconds
+    samples = [[] for _ in range(clients)]
+    threads = [threading.Thread(target=client_loop, args=(stub, game_ids, deadline, samples[i], i))
+               for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    channel.close()
+    latencies = [sample for per_client in samples for sample in per_client]
+    return len(latencies) / seconds, percentiles(latencies)["p99"] * 1000
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 3.0
+    print(f"{'mode':>6} {'clients':>8} {'rps':>10} {'p99 ms':>8}")
+    for mode in ("sync", "async"):
+        with running_server(mode) as port:
+            best = 0.0
+            for clients in CONCURRENCY_LEVELS:
+                rps, p99 = run_level(port, clients, seconds)
+                best = max(best, rps)
+                print(f"{mode:>6} {clients:>8} {rps:>10.0f} {p99:>8.2f}")
+            print(f"{mode:>6} {'max':>8} {best:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
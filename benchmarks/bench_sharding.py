@@ -0,0 +1,102 @@
+"""
+Throughput of the multi-process server as the number of game workers grows
+from 1 to the number of cores.
+
+For each worker count, a router and its workers are started on a throwaway
+SQLite file, games are filled through the router, then client processes
+run a closed loop of board polls, status polls and moves for a fixed time,
+either through the router or straight to the worker owning each game.
+
+Usage: python benchmarks/bench_sharding.py [max_workers] [seconds] [clients]
+"""
+import functools
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import grpc
+import server_pb2
+import server_pb2_grpc
+from benchmarks.common import use_sqlite_file, free_port
+from config import MAX_PLAYERS_PER_GAME
+from game.launcher import serve_sharded, stop_sharded
+from game.router import shard_for
+
+GAMES_PER_WORKER = 20
+
+
+def client(addresses, players, seconds, seed, counter):
+    """Closed-loop client; ``addresses`` has one entry (router) or one per worker."""
+    stubs = [server_pb2_grpc.GameServerStub(grpc.insecure_channel(address)) for address in addresses]
+    rng = random.Random(seed)
+    calls = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        game_id, player_id = rng.choice(players)
+        stub = stubs[shard_for(game_id, len(stubs))]
+        roll = rng.random()
+        if roll < 0.5:
+            stub.GetGameboardStatus(server_pb2.GetGameboardStatusRequest(id_party=game_id, id_player=player_id))
+        elif roll < 0.8:
+            stub.GetGameStatus(server_pb2.GetGameStatusRequest(id_game=game_id, id_player=player_id))
+        else:
+            stub.Move(server_pb2.MoveRequest(id_party=game_id, id_player=player_id, move=rng.choice(["01", "10", "11"])))
+        calls += 1
+    with counter.get_lock():
+        counter.value += calls
+
+
+def measure(addresses, players, seconds, clients):
+    context = multiprocessing.get_context("spawn")
+    counter = context.Value("q", 0)
+    processes = [context.Process(target=client, args=(addresses, players, seconds, seed, counter))
+                 for seed in range(clients)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    return counter.value / seconds
+
+
+def run(workers, seconds, clients):
+    db_dir = tempfile.TemporaryDirectory()
+    db_path = os.path.join(db_dir.name, "shards.sqlite")
+    # Create the schema once, before the workers bind to the file
+    use_sqlite_file(db_path).dispose()
+    port, base_port = free_port(), free_port()
+    router, processes = serve_sharded(workers, port, base_port, functools.partial(use_sqlite_file, db_path))
+    try:
+        channel = grpc.insecure_channel(f"localhost:{port}")
+        stub = server_pb2_grpc.GameServerStub(channel)
+        players = []
+        for _ in range(GAMES_PER_WORKER * workers):
+            game_id = int(stub.CreateGame(server_pb2.CreateGameRequest()).game_id)
+            for i in range(MAX_PLAYERS_PER_GAME):
+                reply = stub.GameSubscribe(server_pb2.GameSubscribeRequest(player=f"P{i}", id_game=game_id))
+                players.append((game_id, reply.id_player))
+        channel.close()
+        routed = measure([f"localhost:{port}"], players, seconds, clients)
+        direct = measure([f"localhost:{base_port + index}" for index in range(workers)], players, seconds, clients)
+    finally:
+        stop_sharded(router, processes)
+        db_dir.cleanup()
+    return routed, direct
+
+
+def main():
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count()
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 5
+    clients = int(sys.argv[3]) if len(sys.argv) > 3 else 2 * max_workers
+    print(f"{clients} client processes, {seconds:.0f} s per run")
+    print(f"{'workers':>8} {'router rps':>11} {'direct rps':>11}")
+    for workers in range(1, max_workers + 1):
+        routed, direct = run(workers, seconds, clients)
+        print(f"{workers:>8} {routed:>11,.0f} {direct:>11,.0f}")
+
+
+if __name__ == "__main__":
+    main()
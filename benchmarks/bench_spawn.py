@@ -0,0 +1,43 @@
+"""
+Join placement latency: the legacy full-board scan for empty cells against
+Board.random_free_cell, on boards holding a full party of players.
+
+Usage: python benchmarks/bench_spawn.py
+"""
+import random
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.common import time_calls
+from config import MAX_PLAYERS_PER_GAME
+from game.models.board import Board
+
+SIZES = [10, 100, 500, 1000, 2000]
+
+
+def legacy_random_empty_position(board, board_size):
+    empty_positions = []
+    for i in range(board_size):
+        for j in range(board_size):
+            if board.is_empty(i, j):
+                empty_positions.append((i, j))
+    return random.choice(empty_positions) if empty_positions else (0, 0)
+
+
+def main():
+    rng = random.Random(9)
+    print(f"{'size':>6} {'scan us':>14} {'free index us':>14}")
+    for size in SIZES:
+        board = Board(size)
+        for _ in range(MAX_PLAYERS_PER_GAME - 1):
+            row, col = board.random_free_cell(rng)
+            board.set(row, col, 'V')
+        number = 1 if size >= 500 else 20
+        scan = time_calls(lambda: legacy_random_empty_position(board, size), number)
+        indexed = time_calls(lambda: board.random_free_cell(rng), 20000)
+        print(f"{size:>6} {scan:>14,.1f} {indexed:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
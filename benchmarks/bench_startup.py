@@ -0,0 +1,111 @@
+"""
+Import time and time to first RPC of the server.
+
+    imports         python -X importtime of a module, the cumulative time of
+                    the slowest imports and of the module itself
+    first RPC       main.py started in a child process on a throwaway SQLite
+                    file (DB_URL), timed from the spawn to the first GameList
+                    answered, with the database already holding --games games
+
+Each measure is repeated --repeat times in fresh processes, the median is
+reported. Importing db no longer resolves the host nor creates the engine, so
+"import db" stays flat whatever DB_HOST points to.
+
+Usage: python benchmarks/bench_startup.py [--games 200] [--repeat 5] [--top 10]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import os
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+import grpc
+import server_pb2
+import server_pb2_grpc
+from benchmarks.common import free_port, use_sqlite_file, fresh_game_state
+
+MODULES = ["db", "game.state", "game.server", "main"]
+
+
+def import_times(module, env):
+    """Cumulative microseconds of every module imported by ``import module``, from -X importtime."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def seed(db_path, games):
+    use_sqlite_file(db_path)
+    game_state = fresh_game_state()
+    for _ in range(games):
+        game_state.create_new_game()
+    game_state.shutdown()
+
+
+def first_rpc(env, port, timeout=30.0):
+    """Seconds from the start of main.py to its first GameList reply."""
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, "main.py"], cwd=ROOT, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        with grpc.insecure_channel(f"localhost:{port}") as channel:
+            stub = server_pb2_grpc.GameServerStub(channel)
+            while time.perf_counter() - start < timeout:
+                if process.poll() is not None:
+                    raise SystemExit(f"main.py exited with status {process.returncode}")
+                try:
+                    stub.GameList(server_pb2.GameListRequest(), timeout=1.0, wait_for_ready=True)
+                    return time.perf_counter() - start
+                except grpc.RpcError:
+                    time.sleep(0.005)
+        raise SystemExit(f"no reply from main.py after {timeout:.0f}s")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--games", type=int, default=200, help="games in the database before start (default: 200)")
+    parser.add_argument("--repeat", type=int, default=5, help="runs of each measure (default: 5)")
+    parser.add_argument("--top", type=int, default=10, help="slowest imports listed (default: 10)")
+    parser.add_argument("--mode", choices=("sync", "async"), default="sync")
+    args = parser.parse_args()
+
+    db_dir = tempfile.TemporaryDirectory()
+    db_path = os.path.join(db_dir.name, "startup.sqlite")
+    env = dict(os.environ, DB_URL=f"sqlite:///{db_path}", SERVER_MODE=args.mode, SERVER_WORKERS="1",
+               METRICS_PORT="0", PYTHONDONTWRITEBYTECODE="1")
+
+    print(f"{'import':>14} {'median ms':>10}")
+    runs = {module: [import_times(module, env) for _ in range(args.repeat)] for module in MODULES}
+    for module, samples in runs.items():
+        print(f"{module:>14} {statistics.median(s[module] for s in samples) / 1000:>10.1f}")
+
+    print(f"\nslowest imports under main (cumulative)")
+    names = runs["main"][0].keys()
+    slowest = sorted(names, key=lambda name: -statistics.median(s.get(name, 0) for s in runs["main"]))
+    for name in slowest[:args.top]:
+        print(f"{name:>40} {statistics.median(s.get(name, 0) for s in runs['main']) / 1000:>8.1f} ms")
+
+    seed(db_path, args.games)
+    samples = []
+    for _ in range(args.repeat):
+        port = free_port()
+        samples.append(first_rpc(dict(env, SERVER_PORT=str(port)), port))
+    print(f"\nfirst RPC ({args.mode}, {args.games} games in the database): "
+          f"median {statistics.median(samples) * 1000:.0f} ms, min {min(samples) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Board rendering cost for GetGameboardStatus: the legacy per-cell string
+concatenation against Board.render (cached wolf view) and Board.render_window
+(villager view), at several board sizes.
+
+Usage: python benchmarks/bench_visibility.py
+"""
+import random
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.common import time_calls
+from game.models.board import Board
+
+SIZES = [10, 50, 200, 1000]
+
+
+def legacy_wolf(board, size):
+    result = ""
+    for row in range(size):
+        for col in range(size):
+            result += board.get(row, col) if not board.is_empty(row, col) else '0'
+    return result
+
+
+def legacy_villager(board, size, position):
+    result = ""
+    player_row, player_col = position
+    for row in range(size):
+        for col in range(size):
+            if max(abs(row - player_row), abs(col - player_col)) <= 2:
+                result += board.get(row, col) if not board.is_empty(row, col) else '0'
+            else:
+                result += 'X'
+    return result
+
+
+def main():
+    rng = random.Random(1)
+    print(f"{'size':>6} {'legacy wolf':>12} {'wolf miss':>10} {'wolf hit':>9} {'legacy vil':>11} {'villager':>9}  (us/call)")
+    for size in SIZES:
+        board = Board(size)
+        for _ in range(8):
+            board.set(rng.randrange(size), rng.randrange(size), 'V')
+        position = (size // 2, size // 2)
+        number = 3 if size >= 1000 else 50
+
+        legacy_w = time_calls(lambda: legacy_wolf(board, size), number)
+        legacy_v = time_calls(lambda: legacy_villager(board, size, position), number)
+
+        def render_after_mutation():
+            board.set(0, 0, 'V')
+            return board.render()
+
+        miss = time_calls(render_after_mutation, number * 20)
+        hit = time_calls(board.render, number * 20)
+        villager = time_calls(lambda: board.render_window(position, 2), number * 20)
+        print(f"{size:>6} {legacy_w:>12.1f} {miss:>10.1f} {hit:>9.2f} {legacy_v:>11.1f} {villager:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Load test comparing board polling with the WatchGameboard stream.
+
+Each watcher is the wolf of its own game. A changer thread joins new players
+into random games at a fixed rate. In the polling model every watcher calls
+GetGameboardStatus and GetGameStatus every POLL_INTERVAL; in the streaming
+model it holds one WatchGameboard stream. The script reports the number of
+requests or messages, response bytes and how many board changes were seen.
+
+Usage: python benchmarks/bench_watch_vs_poll.py [watchers] [seconds]
+"""
+import random
+import sys
+import os
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import grpc
+import server_pb2
+import server_pb2_grpc
+from benchmarks.common import running_server
+
+POLL_INTERVAL = 0.05
+CHANGES_PER_SECOND = 100
+
+
+def setup_games(stub, watchers):
+    games = []
+    for _ in range(watchers):
+        game_id = int(stub.CreateGame(server_pb2.CreateGameRequest()).game_id)
+        wolf = stub.GameSubscribe(server_pb2.GameSubscribeRequest(player="watcher", id_game=game_id))
+        games.append((game_id, wolf.id_player))
+    return games
+
+
+def changer(stub, games, stop):
+    rng = random.Random(0)
+    open_games = [game_id for game_id, _ in games]
+    while not stop.is_set() and open_games:
+        game_id = rng.choice(open_games)
+        if not stub.GameSubscribe(server_pb2.GameSubscribeRequest(player="joiner", id_game=game_id)).status:
+            open_games.remove(game_id)
+        time.sleep(1.0 / CHANGES_PER_SECOND)
+
+
+def poll_watcher(stub, game_id, player_id, stop, totals, lock):
+    requests = size = changes = 0
+    last = None
+    while not stop.is_set():
+        board = stub.GetGameboardStatus(server_pb2.GetGameboardStatusRequest(id_party=game_id, id_player=player_id))
+        status = stub.GetGameStatus(server_pb2.GetGameStatusRequest(id_game=game_id, id_player=player_id))
+        requests += 2
+        size += board.ByteSize() + status.ByteSize()
+        if board.visible_cells != last:
+            changes += 1
+            last = board.visible_cells
+        time.sleep(POLL_INTERVAL)
+    with lock:
+        totals["calls"] += requests
+        totals["bytes"] += size
+        totals["changes"] += changes
+
+
+def stream_watcher(stub, game_id, player_id, stop, totals, lock, streams):
+    messages = size = 0
+    stream = stub.WatchGameboard(server_pb2.WatchGameboardRequest(id_party=game_id, id_player=player_id))
+    with lock:
+        streams.append(stream)
+    try:
+        for reply in stream:
+            messages += 1
+            size += reply.ByteSize()
+    except grpc.RpcError:
+        pass
+    with lock:
+        totals["calls"] += messages
+        totals["bytes"] += size
+        totals["changes"] += messages
+
+
+def run(model, port, watchers, seconds):
+    channel = grpc.insecure_channel(f"localhost:{port}")
+    stub = server_pb2_grpc.GameServerStub(channel)
+    games = setup_games(stub, watchers)
+    stop = threading.Event()
+    lock = threading.Lock()
+    totals = {"calls": 0, "bytes": 0, "changes": 0}
+    streams = []
+    if model == "poll":
+        threads = [threading.Thread(target=poll_watcher, args=(stub, g, p, stop, totals, lock)) for g, p in games]
+    else:
+        threads = [threading.Thread(target=stream_watcher, args=(stub, g, p, stop, totals, lock, streams))
+                   for g, p in games]
+    for thread in threads:
+        thread.start()
+    change_thread = threading.Thread(target=changer, args=(stub, games, stop))
+    change_thread.start()
+    time.sleep(seconds)
+    stop.set()
+    change_thread.join()
+    with lock:
+        for stream in streams:
+            stream.cancel()
+    for thread in threads:
+        thread.join()
+    channel.close()
+    return totals
+
+
+def main():
+    watchers = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 3.0
+    print(f"{'model':>7} {'calls/msgs':>11} {'per s':>8} {'KiB':>8} {'changes seen':>13}")
+    for model in ("poll", "stream"):
+        with running_server("async") as port:
+            totals = run(model, port, watchers, seconds)
+        print(f"{model:>7} {totals['calls']:>11} {totals['calls'] / seconds:>8.0f} "
+              f"{totals['bytes'] / 1024:>8.1f} {totals['changes']:>13}")
+
+
+if __name__ == "__main__":
+    main()
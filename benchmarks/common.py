@@ -0,0 +1,121 @@
+"""Shared helpers for the benchmark scripts."""
+import contextlib
+import logging
+import statistics
+import sys
+import os
+import time
+from typing import Callable, Dict, List
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+
+from db.database import Base, Session, create_pooled_engine
+
+
+def use_sqlite_memory():
+    """Bind the shared Session to a fresh in-memory SQLite database usable from any thread."""
+    logging.getLogger().setLevel(logging.WARNING)
+    engine = create_engine('sqlite://', poolclass=StaticPool,
+                           connect_args={'check_same_thread': False})
+    Base.metadata.create_all(engine)
+    Session.remove()
+    Session.configure(bind=engine)
+    return engine
+
+
+def fresh_game_state():
+    """Drop the GameState singleton and build a new one."""
+    from game.state import GameState
+    GameState._instance = None
+    return GameState()
+
+
+def time_calls(fn: Callable[[], object], number: int) -> float:
+    """Return the mean wall time of ``fn`` in microseconds over ``number`` calls."""
+    start = time.perf_counter()
+    for _ in range(number):
+        fn()
+    return (time.perf_counter() - start) / number * 1e6
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """Summarize latency samples (any unit) as mean/p50/p95/p99."""
+    if not samples:
+        return {"mean": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0}
+    ordered = sorted(samples)
+
+    def pick(q):
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    return {
+        "mean": statistics.fmean(ordered),
+        "p50": pick(0.50),
+        "p95": pick(0.95),
+        "p99": pick(0.99),
+    }
+
+
+def free_port() -> int:
+    """Ask the OS for a currently unused TCP port."""
+    import socket
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def use_sqlite_file(path: str, **pool_kwargs):
+    """Bind the shared Session to an SQLite file through a pooled engine (see create_pooled_engine)."""
+    logging.getLogger().setLevel(logging.WARNING)
+    engine = create_pooled_engine(f"sqlite:///{path}", connect_args={'timeout': 30}, **pool_kwargs)
+    Base.metadata.create_all(engine)
+    Session.remove()
+    Session.configure(bind=engine)
+    return engine
+
+
+def _run_server(mode: str, port: int, db_path: str, ready, serve_kwargs, pool_kwargs) -> None:
+    import asyncio
+    use_sqlite_file(db_path, **pool_kwargs)
+    if mode == "async":
+        from game.aio_server import serve_async
+
+        async def run():
+            server = await serve_async(port, **serve_kwargs)
+            ready.set()
+            await server.wait_for_termination()
+
+        asyncio.run(run())
+    else:
+        from game.server import serve
+        server = serve(port, **serve_kwargs)
+        ready.set()
+        server.wait_for_termination()
+
+
+@contextlib.contextmanager
+def running_server(mode: str = "sync", pool_kwargs=None, **serve_kwargs):
+    """
+    Run a game server backed by a throwaway SQLite file in a child process, yield its port.
+    ``pool_kwargs`` go to create_pooled_engine, extra keyword arguments to serve() /
+    serve_async(); metrics are off unless asked for.
+    """
+    import multiprocessing
+    import tempfile
+    port = free_port()
+    fd, db_path = tempfile.mkstemp(suffix=".sqlite")
+    os.close(fd)
+    ready = multiprocessing.Event()
+    serve_kwargs.setdefault("metrics_enabled", False)
+    process = multiprocessing.Process(target=_run_server,
+                                      args=(mode, port, db_path, ready, serve_kwargs, pool_kwargs or {}), daemon=True)
+    process.start()
+    try:
+        if not ready.wait(30):
+            raise RuntimeError(f"{mode} server did not start")
+        yield port
+    finally:
+        process.terminate()
+        process.join()
+        os.remove(db_path)
@@ -0,0 +1,277 @@
+"""
+End-to-end load generator for the GameServer.
+
+Virtual clients are asyncio tasks sharing a few grpc.aio channels, so
+thousands of them fit in one process. Each client joins an open game (creating
+one when none is left), then runs a closed loop of RPCs drawn from a weighted
+mix until the end of the run:
+
+    poll    GetGameboardStatus      delta   GetGameboardDelta
+    status  GetGameStatus           move    Move
+    list    GameList                create  CreateGame then join it
+
+Unless --target is given, the server runs in a child process on a throwaway
+SQLite file and an ephemeral port (benchmarks.common.running_server).
+
+Throughput, error rate and p50/p95/p99 latency per RPC are printed as JSON and
+optionally written to --output together with the commit and the settings, so
+that a later run can be checked against it with --compare.
+
+Usage:
+    python benchmarks/loadgen.py --clients 1000 --duration 20 --mix poll=40,status=20,move=30,delta=10
+    python benchmarks/loadgen.py --output before.json
+    python benchmarks/loadgen.py --compare before.json
+"""
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import sys
+import os
+import time
+from collections import defaultdict
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import grpc
+import server_pb2
+import server_pb2_grpc
+from benchmarks.common import running_server, percentiles
+
+DEFAULT_MIX = "poll=40,status=20,move=30,delta=5,list=3,create=2"
+MOVES = ["00", "01", "10", "11"]
+
+
+def parse_mix(text):
+    mix = {}
+    for item in text.split(","):
+        name, _, weight = item.partition("=")
+        if name not in ACTIONS:
+            raise SystemExit(f"unknown action '{name}', expected one of {', '.join(ACTIONS)}")
+        mix[name] = float(weight)
+    return mix
+
+
+class Recorder:
+    """Latencies per RPC plus failed calls (RpcError) and refused calls (status false)."""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.refused = defaultdict(int)
+        self.recording = False
+
+    async def call(self, name, rpc, request):
+        start = time.perf_counter()
+        try:
+            reply = await rpc(request)
+        except grpc.RpcError:
+            if self.recording:
+                self.errors[name] += 1
+            return None
+        if self.recording:
+            self.latencies[name].append(time.perf_counter() - start)
+            if hasattr(reply, "status") and not reply.status:
+                self.refused[name] += 1
+        return reply
+
+
+class Lobby:
+    """Games still accepting players, shared by every client."""
+
+    def __init__(self):
+        self.open_games = []
+        # One creation at a time, otherwise every client starting together opens its own game
+        self.creating = asyncio.Lock()
+
+    async def join(self, client):
+        while True:
+            if not self.open_games:
+                async with self.creating:
+                    if not self.open_games:
+                        reply = await client.recorder.call("CreateGame", client.stub.CreateGame,
+                                                           server_pb2.CreateGameRequest())
+                        if reply is None:
+                            return False
+                        self.open_games.append(int(reply.game_id))
+            game_id = self.open_games[-1]
+            reply = await client.recorder.call("GameSubscribe", client.stub.GameSubscribe,
+                                               server_pb2.GameSubscribeRequest(player="load", id_game=game_id))
+            if reply is not None and reply.status:
+                client.game_id, client.player_id, client.version = game_id, reply.id_player, -1
+                return True
+            # Full game: forget it and try the next one
+            if self.open_games and self.open_games[-1] == game_id:
+                self.open_games.pop()
+
+
+class Client:
+    def __init__(self, stub, recorder, lobby, rng):
+        self.stub = stub
+        self.recorder = recorder
+        self.lobby = lobby
+        self.rng = rng
+        self.game_id = self.player_id = None
+        self.version = -1
+
+
+async def do_poll(client):
+    await client.recorder.call("GetGameboardStatus", client.stub.GetGameboardStatus,
+                               server_pb2.GetGameboardStatusRequest(id_party=client.game_id, id_player=client.player_id))
+
+
+async def do_delta(client):
+    reply = await client.recorder.call("GetGameboardDelta", client.stub.GetGameboardDelta,
+                                       server_pb2.GetGameboardDeltaRequest(id_party=client.game_id,
+                                                                           id_player=client.player_id,
+                                                                           since_version=client.version))
+    if reply is not None and reply.status:
+        client.version = reply.version
+
+
+async def do_status(client):
+    reply = await client.recorder.call("GetGameStatus", client.stub.GetGameStatus,
+                                       server_pb2.GetGameStatusRequest(id_game=client.game_id, id_player=client.player_id))
+    # A dead player or a finished game has nothing left to do: move on to another game
+    if reply is not None and reply.status and (reply.winner or not reply.alive):
+        await client.lobby.join(client)
+
+
+async def do_move(client):
+    await client.recorder.call("Move", client.stub.Move,
+                               server_pb2.MoveRequest(id_party=client.game_id, id_player=client.player_id,
+                                                      move=client.rng.choice(MOVES)))
+
+
+async def do_list(client):
+    await client.recorder.call("GameList", client.stub.GameList, server_pb2.GameListRequest())
+
+
+async def do_create(client):
+    client.lobby.open_games.clear()
+    await client.lobby.join(client)
+
+
+ACTIONS = {"poll": do_poll, "delta": do_delta, "status": do_status, "move": do_move,
+           "list": do_list, "create": do_create}
+
+
+async def client_loop(client, mix, deadline, think):
+    if not await client.lobby.join(client):
+        return
+    actions = [ACTIONS[name] for name in mix]
+    weights = list(mix.values())
+    while time.perf_counter() < deadline:
+        await client.rng.choices(actions, weights)[0](client)
+        if think:
+            await asyncio.sleep(client.rng.expovariate(1 / think))
+
+
+async def run_load(target, args):
+    mix = parse_mix(args.mix)
+    recorder = Recorder()
+    lobby = Lobby()
+    channels = [grpc.aio.insecure_channel(target) for _ in range(args.channels)]
+    stubs = [server_pb2_grpc.GameServerStub(channel) for channel in channels]
+    rng = random.Random(args.seed)
+    clients = [Client(stubs[i % len(stubs)], recorder, lobby, random.Random(rng.random()))
+               for i in range(args.clients)]
+
+    start = time.perf_counter()
+    deadline = start + args.warmup + args.duration
+    tasks = [asyncio.create_task(client_loop(client, mix, deadline, args.think / 1000)) for client in clients]
+    await asyncio.sleep(args.warmup)
+    recorder.recording = True
+    measured_from = time.perf_counter()
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - measured_from
+    for channel in channels:
+        await channel.close()
+    return recorder, elapsed
+
+
+def summarize(recorder, elapsed):
+    rpcs = {}
+    total = errors = 0
+    for name in sorted(set(recorder.latencies) | set(recorder.errors)):
+        samples = recorder.latencies[name]
+        summary = percentiles(samples)
+        count = len(samples) + recorder.errors[name]
+        total += count
+        errors += recorder.errors[name]
+        rpcs[name] = {
+            "calls": count,
+            "rps": count / elapsed,
+            "errors": recorder.errors[name],
+            "refused": recorder.refused[name],
+            **{f"{key}_ms": value * 1000 for key, value in summary.items()},
+        }
+    return {
+        "seconds": elapsed,
+        "calls": total,
+        "rps": total / elapsed if elapsed else 0.0,
+        "error_rate": errors / total if total else 0.0,
+        "rpcs": rpcs,
+    }
+
+
+def current_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline, results):
+    """Print the throughput and p99 change of every RPC present in both runs."""
+    print(f"{'rpc':>20} {'rps':>10} {'base':>10} {'change':>8} {'p99 ms':>8} {'base':>8} {'change':>8}")
+    rows = [("total", results, baseline["results"])]
+    rows += [(name, stats, baseline["results"]["rpcs"][name]) for name, stats in results["rpcs"].items()
+             if name in baseline["results"]["rpcs"]]
+    for name, now, before in rows:
+        rps_change = (now["rps"] / before["rps"] - 1) * 100 if before["rps"] else 0.0
+        line = f"{name:>20} {now['rps']:>10.0f} {before['rps']:>10.0f} {rps_change:>+7.1f}%"
+        if "p99_ms" in now:
+            p99_change = (now["p99_ms"] / before["p99_ms"] - 1) * 100 if before["p99_ms"] else 0.0
+            line += f" {now['p99_ms']:>8.2f} {before['p99_ms']:>8.2f} {p99_change:>+7.1f}%"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--clients", type=int, default=200, help="virtual clients (default: 200)")
+    parser.add_argument("--duration", type=float, default=10.0, help="measured seconds (default: 10)")
+    parser.add_argument("--warmup", type=float, default=2.0, help="unmeasured seconds first (default: 2)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"action weights (default: {DEFAULT_MIX})")
+    parser.add_argument("--think", type=float, default=0.0, help="mean pause between calls in ms (default: 0)")
+    parser.add_argument("--channels", type=int, default=4, help="gRPC channels shared by the clients (default: 4)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--mode", choices=("sync", "async"), default="sync", help="server started by the harness")
+    parser.add_argument("--target", help="host:port of a running server instead of starting one")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--compare", help="JSON file of an earlier run to compare with")
+    args = parser.parse_args()
+
+    if args.target:
+        recorder, elapsed = asyncio.run(run_load(args.target, args))
+    else:
+        with running_server(args.mode) as port:
+            recorder, elapsed = asyncio.run(run_load(f"localhost:{port}", args))
+
+    report = {
+        "commit": current_commit(),
+        "settings": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        "results": summarize(recorder, elapsed),
+    }
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), report["results"])
+
+
+if __name__ == "__main__":
+    main()
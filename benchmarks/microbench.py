@@ -0,0 +1,282 @@
+"""
+Microbenchmarks of the game hot paths, across board sizes and player counts.
+
+Each case builds a started game in memory from a fixed seed: the players are
+placed with BoardManager.get_random_empty_position, one wolf for four players.
+Database writes go to a write-behind queue that is not drained during the run
+and the move journal never flushes, so only the game code is timed.
+
+Every benchmark is warmed up, then timed over --repeat samples of at least
+--min-time seconds each. Benchmarks that change the game (process_move) rebuild
+the fixture before each sample, outside the timed section. The median, mean,
+standard deviation and min of the time per call are reported.
+
+--save writes the results as JSON; --compare reads such a file and flags every
+benchmark whose median is more than --threshold percent slower, exiting with
+status 1 if there is one.
+
+Usage:
+    python benchmarks/microbench.py [--filter visibility] [--save base.json]
+    python benchmarks/microbench.py --compare base.json [--threshold 10]
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import os
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.common import use_sqlite_memory, fresh_game_state
+from db.journal import MoveJournal
+from db.persistence import WriteBehindPersistence
+from game.models.board import BoardManager
+from game.models.records import PlayerState
+from game.patterns.factory import StandardGameFactory
+from game.patterns.strategy import WolfVisibilityStrategy, VillagerVisibilityStrategy
+from game.rules.movement import validate_move, process_move
+from game.rules.win_condition import check_game_winner
+import server_pb2
+
+CASES = [(10, 8), (50, 8), (50, 32), (200, 8), (200, 128)]
+MOVES = ["00", "01", "10", "11"]
+GAME_ID = 1
+
+
+def build_game(game_state, board_size, players, seed):
+    """A started game of ``players`` players on a ``board_size`` board, fresh in ``game_state``."""
+    random.seed(seed)
+    game_state.games.clear()
+    game_state.players.clear()
+    game_state.board_size = board_size
+    game_state.journal = MoveJournal(batch_size=10 ** 9, flush_interval=3600)
+    game = game_state.game_factory.create_game(game_id=GAME_ID)
+    game_state.games[GAME_ID] = game
+    for player_id in range(1, players + 1):
+        role = server_pb2.Wolf if player_id % 4 == 1 else server_pb2.Villager
+        position = BoardManager.get_random_empty_position(game.board, board_size)
+        game_state.players[player_id] = PlayerState(player_id, f"P{player_id}", role, GAME_ID, position=position)
+        game_state._place_player(game, player_id, position)
+        game.players.append(player_id)
+        game.alive_counts[role] += 1
+    game.started = True
+    game.round_in_progress = 1
+    return game
+
+
+def cycle(items):
+    """A function returning the items one after the other, forever."""
+    state = {"index": -1}
+    count = len(items)
+
+    def next_item():
+        state["index"] = (state["index"] + 1) % count
+        return items[state["index"]]
+    return next_item
+
+
+# Each benchmark takes (game_state, game, rng) and returns (fn, calls per sample or None to calibrate)
+
+def bench_validate_move(game_state, game, rng):
+    players = cycle([(game_state.players[p], rng.choice(MOVES)) for p in game.players])
+    size = game_state.board_size
+
+    def run():
+        player, move = players()
+        validate_move(game, player, move, size)
+    return run, None
+
+
+def bench_process_move(game_state, game, rng):
+    # One move per player, like a round: kills and blocked moves included
+    moves = cycle([(p, rng.choice(MOVES)) for p in game.players])
+
+    def run():
+        player_id, move = moves()
+        process_move(game_state, GAME_ID, player_id, move)
+    return run, len(game.players)
+
+
+def bench_find_player_at_position(game_state, game, rng):
+    size = game_state.board_size
+    occupied = [game_state.players[p].position for p in game.players]
+    positions = cycle([rng.choice(occupied) if i % 2 else (rng.randrange(size), rng.randrange(size))
+                       for i in range(256)])
+
+    def run():
+        game_state._find_player_at_position(GAME_ID, positions())
+    return run, None
+
+
+def bench_check_game_winner(game_state, game, rng):
+    players = game_state.players
+
+    def run():
+        check_game_winner(game, players)
+    return run, None
+
+
+def bench_wolf_visibility(game_state, game, rng):
+    strategy = WolfVisibilityStrategy()
+    players = game_state.players
+    wolves = cycle([p for p in game.players if game_state.players[p].role == server_pb2.Wolf])
+    size = game_state.board_size
+
+    def run():
+        # A move since the last call, so that the cached view has to be rebuilt
+        game.board.version += 1
+        strategy.get_visible_cells(game.board, players[wolves()], size)
+    return run, None
+
+
+def bench_villager_visibility(game_state, game, rng):
+    strategy = VillagerVisibilityStrategy()
+    players = game_state.players
+    villagers = cycle([p for p in game.players if game_state.players[p].role == server_pb2.Villager])
+    size = game_state.board_size
+
+    def run():
+        strategy.get_visible_cells(game.board, players[villagers()], size)
+    return run, None
+
+
+def bench_random_empty_position(game_state, game, rng):
+    board = game.board
+    size = game_state.board_size
+
+    def run():
+        BoardManager.get_random_empty_position(board, size)
+    return run, None
+
+
+def bench_create_game(game_state, game, rng):
+    factory = StandardGameFactory(game_state)
+
+    def run():
+        factory.create_game(game_id=GAME_ID)
+    return run, None
+
+
+BENCHMARKS = {
+    "validate_move": (bench_validate_move, False),
+    "process_move": (bench_process_move, True),
+    "find_player_at_position": (bench_find_player_at_position, False),
+    "check_game_winner": (bench_check_game_winner, False),
+    "wolf_visibility": (bench_wolf_visibility, False),
+    "villager_visibility": (bench_villager_visibility, False),
+    "random_empty_position": (bench_random_empty_position, False),
+    "create_game": (bench_create_game, False),
+}
+
+
+def calibrate(fn, min_time):
+    """Smallest power of two of calls taking at least ``min_time`` seconds."""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        if time.perf_counter() - start >= min_time or number >= 1 << 24:
+            return number
+        number *= 2
+
+
+def time_sample(fn, number):
+    start = time.perf_counter()
+    for _ in range(number):
+        fn()
+    return (time.perf_counter() - start) / number
+
+
+def run_benchmark(game_state, make, mutates, board_size, players, args):
+    """Seconds per call of every sample."""
+    def setup():
+        game = build_game(game_state, board_size, players, args.seed)
+        return make(game_state, game, random.Random(args.seed))
+
+    fn, number = setup()
+    if number is None:
+        number = calibrate(fn, args.min_time)
+
+    def sample():
+        if not mutates:
+            return time_sample(fn, number)
+        # A mutating sample is short, average it over several fresh fixtures
+        return statistics.fmean(time_sample(setup()[0], number) for _ in range(args.inner))
+
+    for _ in range(args.warmup):
+        sample()
+    return [sample() for _ in range(args.repeat)]
+
+
+def summarize(samples):
+    return {
+        "median_us": statistics.median(samples) * 1e6,
+        "mean_us": statistics.fmean(samples) * 1e6,
+        "stdev_us": (statistics.stdev(samples) if len(samples) > 1 else 0.0) * 1e6,
+        "min_us": min(samples) * 1e6,
+    }
+
+
+def compare(baseline, results, threshold):
+    """Print the change of every benchmark also in ``baseline``, return the names of the regressions."""
+    regressions = []
+    print(f"\n{'benchmark':>44} {'base us':>10} {'now us':>10} {'change':>8}")
+    for name, now in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        change = (now["median_us"] / before["median_us"] - 1) * 100 if before["median_us"] else 0.0
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:>44} {before['median_us']:>10.3f} {now['median_us']:>10.3f} {change:>+7.1f}%{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--filter", default="", help="only run benchmarks whose name contains this text")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=7, help="timed samples per benchmark (default: 7)")
+    parser.add_argument("--warmup", type=int, default=2, help="untimed samples first (default: 2)")
+    parser.add_argument("--inner", type=int, default=20,
+                        help="fresh fixtures per sample of a mutating benchmark (default: 20)")
+    parser.add_argument("--min-time", type=float, default=0.02, help="minimum seconds per sample (default: 0.02)")
+    parser.add_argument("--save", help="write the results as JSON to this file")
+    parser.add_argument("--compare", help="JSON file of an earlier run to compare with")
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="slowdown in percent reported as a regression (default: 10)")
+    args = parser.parse_args()
+
+    use_sqlite_memory()
+    game_state = fresh_game_state()
+    game_state.persistence = WriteBehindPersistence(queue_size=10 ** 7, batch_size=10 ** 7, flush_interval=3600)
+
+    results = {}
+    print(f"{'benchmark':>44} {'median us':>10} {'mean us':>10} {'stdev':>8} {'min us':>10}")
+    for bench, (make, mutates) in BENCHMARKS.items():
+        for board_size, players in CASES:
+            name = f"{bench}[size={board_size},players={players}]"
+            if args.filter not in name:
+                continue
+            stats = summarize(run_benchmark(game_state, make, mutates, board_size, players, args))
+            results[name] = stats
+            print(f"{name:>44} {stats['median_us']:>10.3f} {stats['mean_us']:>10.3f} "
+                  f"{stats['stdev_us']:>8.3f} {stats['min_us']:>10.3f}")
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(json.load(f), results, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) above {args.threshold:.0f}%")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
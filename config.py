@@ -1,5 +1,6 @@
 import logging
 import os
+import tempfile
 
 # Configuration de la base de données
 DB_CONFIG = {
@@ -10,11 +11,83 @@ DB_CONFIG = {
     "port": os.environ.get("DB_PORT", "5432")
 }
 
+# URL SQLAlchemy complète, remplace DB_CONFIG si elle est définie (ex: sqlite:///jeu.sqlite)
+DB_URL = os.environ.get("DB_URL")
+
+# Pool de connexions PostgreSQL: taille, connexions supplémentaires au-delà, attente maximale (s)
+# avant erreur, vérification des connexions avant usage, recyclage (s, -1 = jamais) et durée
+# maximale d'une requête (ms, 0 = illimitée)
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", "30"))
+DB_POOL_PRE_PING = os.environ.get("DB_POOL_PRE_PING", "1") == "1"
+DB_POOL_RECYCLE = int(os.environ.get("DB_POOL_RECYCLE", "1800"))
+DB_STATEMENT_TIMEOUT_MS = int(os.environ.get("DB_STATEMENT_TIMEOUT_MS", "5000"))
+
+# Persistance: "sync" (une transaction par mutation) ou "write_behind" (écriture différée par lots)
+PERSISTENCE_MODE = os.environ.get("PERSISTENCE_MODE", "sync")
+WRITE_BEHIND_QUEUE_SIZE = int(os.environ.get("WRITE_BEHIND_QUEUE_SIZE", "10000"))
+WRITE_BEHIND_FLUSH_INTERVAL = float(os.environ.get("WRITE_BEHIND_FLUSH_INTERVAL", "0.05"))
+WRITE_BEHIND_BATCH_SIZE = int(os.environ.get("WRITE_BEHIND_BATCH_SIZE", "500"))
+
+# Diffusion des événements de partie aux observateurs: "sync" (dans le thread de l'appel) ou "async"
+# (file circulaire bornée par observateur, vidée par lots par EVENT_WORKERS threads).
+# Politique quand la file d'un observateur est pleine: "drop_oldest", "drop_newest" ou "block"
+EVENT_DISPATCH_MODE = os.environ.get("EVENT_DISPATCH_MODE", "sync")
+EVENT_QUEUE_SIZE = int(os.environ.get("EVENT_QUEUE_SIZE", "4096"))
+EVENT_BATCH_SIZE = int(os.environ.get("EVENT_BATCH_SIZE", "256"))
+EVENT_WORKERS = int(os.environ.get("EVENT_WORKERS", "1"))
+EVENT_DROP_POLICY = os.environ.get("EVENT_DROP_POLICY", "drop_oldest")
+
+# Journal des coups (tables turns / players_play): "orm", "executemany", "values" ou "copy" (PostgreSQL)
+JOURNAL_FLUSH_STRATEGY = os.environ.get("JOURNAL_FLUSH_STRATEGY", "executemany")
+JOURNAL_BATCH_SIZE = int(os.environ.get("JOURNAL_BATCH_SIZE", "1000"))
+# Écrit par un thread dédié toutes les JOURNAL_FLUSH_INTERVAL secondes, ou dès JOURNAL_BATCH_SIZE coups en attente
+JOURNAL_FLUSH_INTERVAL = float(os.environ.get("JOURNAL_FLUSH_INTERVAL", "1.0"))
+
 # Configuration du serveur gRPC
 SERVER_PORT = int(os.environ.get("SERVER_PORT", "9990"))
+SERVER_MAX_WORKERS = int(os.environ.get("SERVER_MAX_WORKERS", "32"))
+# "sync" (grpc.server + thread pool) ou "async" (grpc.aio)
+SERVER_MODE = os.environ.get("SERVER_MODE", "sync")
+# Threads réservés aux appels bloquants vers la base en mode async
+DB_EXECUTOR_WORKERS = int(os.environ.get("DB_EXECUTOR_WORKERS", "8"))
+# Mode multi-processus: au-delà de 1, SERVER_PORT est servi par un routeur et chaque
+# processus de jeu écoute sur WORKER_BASE_PORT + son index
+SERVER_WORKERS = int(os.environ.get("SERVER_WORKERS", "1"))
+WORKER_BASE_PORT = int(os.environ.get("WORKER_BASE_PORT", str(SERVER_PORT + 1)))
+
+# Métriques par RPC (intercepteur gRPC) exposées au format Prometheus sur
+# http://METRICS_HOST:METRICS_PORT/metrics (0 = pas d'endpoint HTTP)
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "1") == "1"
+METRICS_HOST = os.environ.get("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.environ.get("METRICS_PORT", "9464"))
+
+# Flux WatchGameboard: événements en attente par abonné, délai (s) entre deux vérifications sans événement
+WATCH_QUEUE_SIZE = int(os.environ.get("WATCH_QUEUE_SIZE", "16"))
+WATCH_KEEPALIVE = float(os.environ.get("WATCH_KEEPALIVE", "5.0"))
+
+# Nombre de modifications du plateau conservées par partie pour GetGameboardDelta
+BOARD_CHANGE_LOG_SIZE = int(os.environ.get("BOARD_CHANGE_LOG_SIZE", "256"))
+
+# Éviction des parties inactives hors de la mémoire (durées en secondes, 0 = pas de limite de parties)
+ARCHIVE_DIR = os.environ.get("ARCHIVE_DIR", os.path.join(tempfile.gettempdir(), "moteur_jeu_archive"))
+EVICTION_INTERVAL = float(os.environ.get("EVICTION_INTERVAL", "30"))
+EVICTION_FINISHED_TTL = float(os.environ.get("EVICTION_FINISHED_TTL", "300"))
+EVICTION_IDLE_TTL = float(os.environ.get("EVICTION_IDLE_TTL", "3600"))
+EVICTION_MAX_RESIDENT_GAMES = int(os.environ.get("EVICTION_MAX_RESIDENT_GAMES", "0"))
+
+# Déroulement des parties: une partie démarre pleine ou après LOBBY_TIMEOUT secondes,
+# chaque tour dure au plus ROUND_DURATION secondes (durées en secondes)
+LOBBY_TIMEOUT = float(os.environ.get("LOBBY_TIMEOUT", "60"))
+ROUND_DURATION = float(os.environ.get("ROUND_DURATION", "5"))
+SCHEDULER_TICK = float(os.environ.get("SCHEDULER_TICK", "0.05"))
+SCHEDULER_WHEEL_SLOTS = int(os.environ.get("SCHEDULER_WHEEL_SLOTS", "512"))
+# Nombre de déplacements de MoveStream appliqués ensemble
+MOVE_STREAM_CHUNK = int(os.environ.get("MOVE_STREAM_CHUNK", "512"))
 
 # Configuration du jeu
-BOARD_SIZE = 10
+BOARD_SIZE = int(os.environ.get("BOARD_SIZE", "10"))
 MAX_PLAYERS_PER_GAME = 8
 
 # Configuration du logging
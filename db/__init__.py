@@ -1,7 +1,17 @@
-from .database import engine, Session, Base
+from .database import get_engine, Session, Base
 from .models import Party, Role, Player, PlayerInParty, Turn, PlayerPlay
+from .persistence import Persistence, SyncPersistence, WriteBehindPersistence, create_persistence
+from .journal import MoveJournal
 
 __all__ = [
-    'engine', 'Session', 'Base',
-    'Party', 'Role', 'Player', 'PlayerInParty', 'Turn', 'PlayerPlay'
+    'get_engine', 'Session', 'Base',
+    'Party', 'Role', 'Player', 'PlayerInParty', 'Turn', 'PlayerPlay',
+    'Persistence', 'SyncPersistence', 'WriteBehindPersistence', 'create_persistence',
+    'MoveJournal'
 ]
+
+def __getattr__(name):
+    # Le moteur n'est créé qu'au premier accès à db.engine (absent de __all__: import * ne le crée pas)
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
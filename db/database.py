@@ -1,13 +1,22 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, scoped_session
+from sqlalchemy.orm import Session as OrmSession
+from sqlalchemy.pool import QueuePool, SingletonThreadPool, StaticPool
+import contextlib
+import contextvars
 import sys
 import os
 import socket
+import threading
+import time
+from typing import Dict, Optional
 
 # Ajouter le répertoire parent au chemin de recherche pour pouvoir importer config
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from config import DB_CONFIG, logger
+from config import (DB_CONFIG, DB_URL as CONFIGURED_DB_URL, logger, DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_PRE_PING,
+                    DB_POOL_RECYCLE, DB_STATEMENT_TIMEOUT_MS)
 
 def is_hostname_resolvable(hostname):
     try:
@@ -16,24 +25,153 @@ def is_hostname_resolvable(hostname):
     except socket.gaierror:
         return False
 
-# Try the configured host first, fall back to localhost if not resolvable
-db_host = DB_CONFIG['host']
-if not is_hostname_resolvable(db_host) and db_host == "db":
-    logger.warning(f"Could not resolve hostname '{db_host}', falling back to localhost")
-    db_host = "localhost"
+# Hôte, URL et moteur sont résolus au premier usage (get_engine), pas à l'import:
+# un outil ou un test qui n'ouvre pas de connexion ne paie ni résolution DNS ni moteur
+_engine: Optional[Engine] = None
+_db_url: Optional[str] = None
+_engine_lock = threading.Lock()
 
-# Construire l'URL de connexion SQLAlchemy
-DB_URL = f"postgresql://{DB_CONFIG['user']}:{DB_CONFIG['password']}@{db_host}:{DB_CONFIG['port']}/{DB_CONFIG['database']}"
+def resolve_db_host() -> str:
+    """Try the configured host first, fall back to localhost if the default "db" is not resolvable."""
+    db_host = DB_CONFIG['host']
+    if db_host == "db" and not is_hostname_resolvable(db_host):
+        logger.warning(f"Could not resolve hostname '{db_host}', falling back to localhost")
+        db_host = "localhost"
+    return db_host
 
-# Créer le moteur SQLAlchemy
-engine = create_engine(DB_URL, echo=False)
+def get_db_url() -> str:
+    """SQLAlchemy URL of the configured database, resolved once."""
+    global _db_url
+    if _db_url is None and CONFIGURED_DB_URL:
+        _db_url = CONFIGURED_DB_URL
+    if _db_url is None:
+        # Construire l'URL de connexion SQLAlchemy
+        _db_url = (f"postgresql://{DB_CONFIG['user']}:{DB_CONFIG['password']}@{resolve_db_host()}:"
+                   f"{DB_CONFIG['port']}/{DB_CONFIG['database']}")
+    return _db_url
+
+class MonitoredQueuePool(QueuePool):
+    """QueuePool counting the checkouts that found every connection in use and had to wait."""
+    def __init__(self, creator, pool_size: int = 5, max_overflow: int = 10, **kw):
+        super().__init__(creator, pool_size=pool_size, max_overflow=max_overflow, **kw)
+        self.max_overflow = max_overflow
+        self.waits = 0
+        self.wait_seconds = 0.0
+    
+    def _do_get(self):
+        exhausted = (self.max_overflow >= 0 and self.checkedin() == 0
+                     and self.checkedout() >= self.size() + self.max_overflow)
+        if not exhausted:
+            return super()._do_get()
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.waits += 1
+            self.wait_seconds += time.perf_counter() - started
+
+def create_pooled_engine(url: str, pool_size: int = DB_POOL_SIZE, max_overflow: int = DB_MAX_OVERFLOW,
+                         pool_timeout: float = DB_POOL_TIMEOUT, pool_pre_ping: bool = DB_POOL_PRE_PING,
+                         pool_recycle: int = DB_POOL_RECYCLE,
+                         statement_timeout_ms: int = DB_STATEMENT_TIMEOUT_MS, **kwargs) -> Engine:
+    """Create an engine on a MonitoredQueuePool configured from config.py."""
+    connect_args = kwargs.pop("connect_args", {})
+    if statement_timeout_ms and url.startswith("postgresql"):
+        connect_args = {**connect_args, "options": f"-c statement_timeout={statement_timeout_ms}"}
+    return create_engine(url, echo=False, poolclass=MonitoredQueuePool, pool_size=pool_size,
+                         max_overflow=max_overflow, pool_timeout=pool_timeout, pool_pre_ping=pool_pre_ping,
+                         pool_recycle=pool_recycle, connect_args=connect_args, **kwargs)
+
+def get_engine() -> Engine:
+    """The engine of the configured database, created on first call."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = create_pooled_engine(get_db_url())
+    return _engine
+
+def __getattr__(name: str):
+    # ``engine`` and ``DB_URL`` stay importable, they are built when first read
+    if name == "engine":
+        return get_engine()
+    if name == "DB_URL":
+        return get_db_url()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+class _UnitOfWork:
+    __slots__ = ("connection",)
+    
+    def __init__(self):
+        self.connection = None
+
+# Unité de travail de l'appel en cours (voir unit_of_work)
+_current_unit: contextvars.ContextVar[Optional[_UnitOfWork]] = contextvars.ContextVar("unit_of_work", default=None)
+
+class RequestSession(OrmSession):
+    """
+    Session running on the connection of the current unit of work, when there
+    is one. Without an explicit bind it uses the configured database.
+    """
+    def __init__(self, bind=None, **kwargs):
+        if bind is None and not kwargs.get("binds"):
+            bind = get_engine()
+        super().__init__(bind=bind, **kwargs)
+    
+    def get_bind(self, *args, **kwargs):
+        bind = super().get_bind(*args, **kwargs)
+        unit = _current_unit.get()
+        # Single-connection pools (SQLite tests) have no checkouts to save
+        if unit is None or not isinstance(bind, Engine) or isinstance(bind.pool, (StaticPool, SingletonThreadPool)):
+            return bind
+        if unit.connection is None or unit.connection.engine is not bind:
+            if unit.connection is not None:
+                unit.connection.close()
+            unit.connection = bind.connect()
+        return unit.connection
+
+@contextlib.contextmanager
+def unit_of_work():
+    """
+    Serve everything done inside the block (one RPC) from a single pooled connection.
+    
+    The connection is checked out on the first query only, so RPCs answered from
+    memory do not touch the pool. Sessions still commit their own transactions;
+    the connection goes back to the pool when the block exits. Long-lived
+    streaming RPCs are not run in a unit of work (see game.interceptors).
+    """
+    if _current_unit.get() is not None:
+        yield
+        return
+    unit = _UnitOfWork()
+    token = _current_unit.set(unit)
+    try:
+        yield
+    finally:
+        _current_unit.reset(token)
+        if unit.connection is not None:
+            # The thread's session would otherwise keep using the connection after it is returned
+            Session.remove()
+            unit.connection.close()
 
 # Créer une factory de sessions
-session_factory = sessionmaker(bind=engine)
+session_factory = sessionmaker(class_=RequestSession)
 
 # Créer un contexte de session thread-safe
 Session = scoped_session(session_factory)
 
+def pool_stats(bind: Optional[Engine] = None) -> Dict[str, float]:
+    """Connections of the pool behind ``Session`` (or ``bind``): size, checked out, waits and time waited."""
+    if bind is None:
+        bind = Session.session_factory.kw.get("bind") or get_engine()
+    pool = bind.pool
+    return {
+        "size": pool.size() if hasattr(pool, "size") else 0,
+        "checked_out": pool.checkedout() if hasattr(pool, "checkedout") else 0,
+        "waits": getattr(pool, "waits", 0),
+        "wait_seconds": getattr(pool, "wait_seconds", 0.0),
+    }
+
 # Classe de base pour les modèles
 Base = declarative_base()
 
@@ -44,7 +182,12 @@ def init_db():
         from .models import Party, Role, Player, PlayerInParty, Turn, PlayerPlay
         
         # Créer les tables dans la base de données
+        engine = get_engine()
         Base.metadata.create_all(engine)
+        
+        # Mettre à jour le schéma d'une base existante
+        from .migrations import upgrade
+        upgrade(engine)
         logger.info("Base de données initialisée avec succès")
     except Exception as e:
         logger.error(f"Erreur lors de l'initialisation de la base de données: {e}")
@@ -0,0 +1,240 @@
+import atexit
+import csv
+import datetime
+import io
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import insert, update
+from sqlalchemy.exc import SQLAlchemyError
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import logger, JOURNAL_FLUSH_STRATEGY, JOURNAL_BATCH_SIZE, JOURNAL_FLUSH_INTERVAL
+from .database import Session
+from .models import Turn, PlayerPlay
+
+FLUSH_STRATEGIES = ("orm", "executemany", "values", "copy")
+
+# Rows per multi-row INSERT, keeps SQLite under its bound parameter limit
+VALUES_CHUNK_SIZE = 1000
+
+PLAY_COLUMNS = ["id_player", "id_turn", "start_time", "end_time", "action",
+                "origin_position_row", "origin_position_col",
+                "target_position_row", "target_position_col"]
+
+class _RoundBuffer:
+    __slots__ = ("game_id", "round_number", "id_turn", "start_time", "end_time", "plays")
+
+    def __init__(self, game_id: int, round_number: int):
+        self.game_id = game_id
+        self.round_number = round_number
+        self.id_turn: Optional[int] = None
+        self.start_time = datetime.datetime.utcnow()
+        self.end_time: Optional[datetime.datetime] = None
+        # Keyed by player: a player has a single play per turn
+        self.plays: Dict[int, Dict[str, Any]] = {}
+
+class MoveJournal:
+    """
+    Buffers PlayerPlay rows per game and round and writes them in bulk.
+    
+    A Turn row is opened for the first play of a round and closed when the
+    game moves on to a later round or when close_round is called. Plays are
+    written with one of FLUSH_STRATEGIES by a background thread, started with
+    the first play, every ``flush_interval`` seconds or as soon as
+    batch_size rows are pending; record_play itself never touches the
+    database. Plays of a failed write are kept for the next one.
+    """
+    def __init__(self, session_factory=Session, strategy: str = JOURNAL_FLUSH_STRATEGY,
+                 batch_size: int = JOURNAL_BATCH_SIZE, flush_interval: float = JOURNAL_FLUSH_INTERVAL):
+        if strategy not in FLUSH_STRATEGIES:
+            raise ValueError(f"Unknown journal flush strategy: {strategy}")
+        self.session_factory = session_factory
+        self.strategy = strategy
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._rounds: Dict[Tuple[int, int], _RoundBuffer] = {}
+        self._open_round: Dict[int, int] = {}
+        self._pending = 0
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+    
+    def record_play(self, game_id: int, round_number: int, player_id: int, action: str,
+                    origin: Tuple[int, int], target: Tuple[int, int]) -> None:
+        """Buffer a player's action for a round, the writer is woken up when the batch is full."""
+        now = datetime.datetime.utcnow()
+        with self._lock:
+            buffer = self._round_buffer(game_id, round_number)
+            if player_id not in buffer.plays:
+                self._pending += 1
+            buffer.plays[player_id] = {
+                "id_player": player_id,
+                "start_time": now,
+                "end_time": now,
+                "action": action,
+                "origin_position_row": origin[0],
+                "origin_position_col": origin[1],
+                "target_position_row": target[0],
+                "target_position_col": target[1],
+            }
+            if self._thread is None and not self._stopped:
+                self._thread = threading.Thread(target=self._run, name="move-journal", daemon=True)
+                self._thread.start()
+                atexit.register(self.stop)
+            if self._pending >= self.batch_size:
+                self._wakeup.notify()
+    
+    def close_round(self, game_id: int, round_number: int) -> None:
+        """Mark a round's Turn as finished, it is written on the next flush."""
+        with self._lock:
+            buffer = self._rounds.get((game_id, round_number))
+            if buffer is not None and buffer.end_time is None:
+                buffer.end_time = datetime.datetime.utcnow()
+            if self._open_round.get(game_id) == round_number:
+                del self._open_round[game_id]
+    
+    def pending(self) -> int:
+        with self._lock:
+            return self._pending
+    
+    def stop(self) -> None:
+        """Stop the background writer and write what is left."""
+        with self._lock:
+            self._stopped = True
+            thread = self._thread
+            self._wakeup.notify()
+        if thread is not None:
+            thread.join()
+        self.flush()
+    
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                self._wakeup.wait_for(lambda: self._stopped or self._pending >= self.batch_size,
+                                      timeout=self.flush_interval)
+                stopping = self._stopped
+            self.flush()
+            # A scoped session would stay bound to the engine of its first flush
+            remove = getattr(self.session_factory, "remove", None)
+            if remove is not None:
+                remove()
+            if stopping:
+                return
+    
+    def flush(self) -> int:
+        """Write buffered turns and plays, return the number of plays written."""
+        with self._flush_lock:
+            with self._lock:
+                # Rounds with nothing new to write are left alone
+                buffers = [buffer for buffer in self._rounds.values() if buffer.plays or buffer.end_time is not None]
+                batches = [(buffer, list(buffer.plays.values())) for buffer in buffers]
+                for buffer in buffers:
+                    buffer.plays = {}
+                    if buffer.end_time is not None:
+                        del self._rounds[(buffer.game_id, buffer.round_number)]
+                self._pending = 0
+            if not batches:
+                return 0
+            
+            opened: List[_RoundBuffer] = []
+            session = self.session_factory()
+            try:
+                rows = self._write_turns(session, batches, opened)
+                self._write_plays(session, rows)
+                session.commit()
+                return len(rows)
+            except SQLAlchemyError as e:
+                session.rollback()
+                self._restore(batches, opened)
+                logger.error(f"Error writing move journal to database: {e}")
+                return 0
+            finally:
+                session.close()
+    
+    def _restore(self, batches, opened: List[_RoundBuffer]) -> None:
+        """Put the turns and plays of a failed write back, plays recorded since then win."""
+        with self._lock:
+            # Turns inserted by the failed transaction do not exist
+            for buffer in opened:
+                buffer.id_turn = None
+            for buffer, plays in batches:
+                current = self._rounds.setdefault((buffer.game_id, buffer.round_number), buffer)
+                for play in plays:
+                    if play["id_player"] not in current.plays:
+                        current.plays[play["id_player"]] = play
+                        self._pending += 1
+    
+    def _round_buffer(self, game_id: int, round_number: int) -> _RoundBuffer:
+        open_round = self._open_round.get(game_id)
+        if open_round is not None and open_round != round_number:
+            previous = self._rounds.get((game_id, open_round))
+            if previous is not None and previous.end_time is None:
+                previous.end_time = datetime.datetime.utcnow()
+        self._open_round[game_id] = round_number
+        
+        key = (game_id, round_number)
+        if key not in self._rounds:
+            self._rounds[key] = _RoundBuffer(game_id, round_number)
+        return self._rounds[key]
+    
+    def _write_turns(self, session, batches, opened: List[_RoundBuffer]) -> List[Dict[str, Any]]:
+        new_turns = []
+        for buffer, _ in batches:
+            if buffer.id_turn is None:
+                new_turns.append((buffer, Turn(id_party=buffer.game_id, start_time=buffer.start_time,
+                                               end_time=buffer.end_time)))
+            elif buffer.end_time is not None:
+                session.execute(update(Turn).where(Turn.id_turn == buffer.id_turn).values(end_time=buffer.end_time))
+        
+        # A single flush lets SQLAlchemy insert all new turns in one batch
+        session.add_all([turn for _, turn in new_turns])
+        session.flush()
+        for buffer, turn in new_turns:
+            buffer.id_turn = turn.id_turn
+            opened.append(buffer)
+        
+        rows = []
+        for buffer, plays in batches:
+            for play in plays:
+                play["id_turn"] = buffer.id_turn
+                rows.append(play)
+        return rows
+    
+    def _write_plays(self, session, rows: List[Dict[str, Any]]) -> None:
+        if not rows:
+            return
+        strategy = self.strategy
+        if strategy == "copy" and session.get_bind().dialect.name != "postgresql":
+            strategy = "executemany"
+        
+        if strategy == "orm":
+            session.add_all([PlayerPlay(**row) for row in rows])
+            session.flush()
+        elif strategy == "executemany":
+            session.execute(insert(PlayerPlay), rows)
+        elif strategy == "values":
+            for start in range(0, len(rows), VALUES_CHUNK_SIZE):
+                session.execute(insert(PlayerPlay).values(rows[start:start + VALUES_CHUNK_SIZE]))
+        else:
+            self._copy_plays(session, rows)
+    
+    @staticmethod
+    def _copy_plays(session, rows: List[Dict[str, Any]]) -> None:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow([row[column] for column in PLAY_COLUMNS])
+        buffer.seek(0)
+        
+        cursor = session.connection().connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {PlayerPlay.__tablename__} ({', '.join(PLAY_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+                buffer
+            )
+        finally:
+            cursor.close()
@@ -0,0 +1,37 @@
+from sqlalchemy import inspect, text
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import logger
+
+def _add_party_winner(connection) -> None:
+    columns = {column["name"] for column in inspect(connection).get_columns("parties")}
+    if "winner" not in columns:
+        connection.execute(text("ALTER TABLE parties ADD COLUMN winner VARCHAR"))
+        logger.info("Added column parties.winner")
+
+def _add_indexes(connection) -> None:
+    # Index declared on the models but missing from a database created before them
+    from .database import Base
+    inspector = inspect(connection)
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(connection)
+                logger.info(f"Created index {index.name} on {table.name}")
+
+# Idempotent steps bringing a database created by an older version up to date
+MIGRATIONS = [
+    _add_party_winner,
+    _add_indexes,
+]
+
+def upgrade(engine) -> None:
+    """Apply every migration step to an existing database."""
+    with engine.begin() as connection:
+        for migration in MIGRATIONS:
+            migration(connection)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Table
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Table, Index
 from sqlalchemy.orm import relationship
 import datetime
 from .database import Base
@@ -8,6 +8,7 @@ class Party(Base):
     
     id_party = Column(Integer, primary_key=True, autoincrement=True)
     title_party = Column(String)
+    winner = Column(String, nullable=True)
     
     # Relations
     players = relationship("PlayerInParty", back_populates="party")
@@ -34,6 +35,8 @@ class Player(Base):
 
 class PlayerInParty(Base):
     __tablename__ = 'players_in_parties'
+    # Joueurs (vivants) d'une partie
+    __table_args__ = (Index('ix_players_in_parties_party_alive', 'id_party', 'is_alive'),)
     
     id_party = Column(Integer, ForeignKey('parties.id_party'), primary_key=True)
     id_player = Column(Integer, ForeignKey('players.id_player'), primary_key=True)
@@ -47,6 +50,8 @@ class PlayerInParty(Base):
 
 class Turn(Base):
     __tablename__ = 'turns'
+    # Tours d'une partie
+    __table_args__ = (Index('ix_turns_id_party', 'id_party'),)
     
     id_turn = Column(Integer, primary_key=True, autoincrement=True)
     id_party = Column(Integer, ForeignKey('parties.id_party'))
@@ -59,6 +64,8 @@ class Turn(Base):
 
 class PlayerPlay(Base):
     __tablename__ = 'players_play'
+    # Coups d'un tour: la clé primaire commence par id_player et ne sert pas ici
+    __table_args__ = (Index('ix_players_play_id_turn', 'id_turn'),)
     
     id_player = Column(Integer, ForeignKey('players.id_player'), primary_key=True)
     id_turn = Column(Integer, ForeignKey('turns.id_turn'), primary_key=True)
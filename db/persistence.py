@@ -0,0 +1,295 @@
+from abc import ABC, abstractmethod
+import atexit
+import contextlib
+import itertools
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy.exc import SQLAlchemyError
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import (logger, PERSISTENCE_MODE, WRITE_BEHIND_QUEUE_SIZE,
+                    WRITE_BEHIND_FLUSH_INTERVAL, WRITE_BEHIND_BATCH_SIZE)
+from .database import Session
+from .models import Party, Player, PlayerInParty
+
+Operation = Tuple[str, Dict[str, Any]]
+
+# Rows per multi-row upsert, keeps SQLite under its bound parameter limit
+UPSERT_CHUNK_SIZE = 1000
+
+def coalesce_operations(operations: List[Operation]) -> List[Operation]:
+    """
+    Merge operations of one batch without changing their outcome.
+    
+    A kill following a registration in the same batch is folded into the
+    registration, and repeated kills of a player are written once.
+    """
+    pending_joins: Dict[Tuple[int, int], Dict[str, Any]] = {}
+    killed = set()
+    result: List[Operation] = []
+    
+    for kind, data in operations:
+        if kind == "add_player":
+            data = dict(data)
+            pending_joins[(data["id_party"], data["id_player"])] = data
+        elif kind == "kill_player":
+            key = (data["id_party"], data["id_player"])
+            if key in killed:
+                continue
+            killed.add(key)
+            if key in pending_joins:
+                pending_joins[key]["is_alive"] = False
+                continue
+        result.append((kind, data))
+    
+    return result
+
+def _insert_ignoring_existing(session, model, rows: List[Dict[str, Any]], keys: List[str]) -> bool:
+    """
+    Insert rows several per statement, skipping those whose ``keys`` already exist
+    (INSERT ... ON CONFLICT DO NOTHING). Returns False if the dialect has no such upsert.
+    """
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return False
+    for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+        statement = dialect_insert(model).values(rows[start:start + UPSERT_CHUNK_SIZE])
+        session.execute(statement.on_conflict_do_nothing(index_elements=keys))
+    return True
+
+def register_players(session, joins: List[Dict[str, Any]]) -> None:
+    """
+    Write players and their party memberships with one upsert per table.
+    
+    A player or membership already in the database is left as is, so a join
+    written twice or racing another writer does not fail the transaction.
+    """
+    # Parties created earlier in the transaction must exist before the memberships
+    session.flush()
+    players = {data["id_player"]: {"id_player": data["id_player"], "pseudo": data["name"]} for data in joins}
+    memberships = {(data["id_party"], data["id_player"]): {"id_party": data["id_party"], "id_player": data["id_player"],
+                                                           "id_role": data["id_role"],
+                                                           "is_alive": data.get("is_alive", True)}
+                   for data in joins}
+    if (_insert_ignoring_existing(session, Player, list(players.values()), ["id_player"])
+            and _insert_ignoring_existing(session, PlayerInParty, list(memberships.values()),
+                                          ["id_party", "id_player"])):
+        return
+    for data in joins:
+        if session.get(Player, data["id_player"]) is None:
+            session.add(Player(id_player=data["id_player"], pseudo=data["name"]))
+        session.add(PlayerInParty(id_party=data["id_party"], id_player=data["id_player"],
+                                  id_role=data["id_role"], is_alive=data.get("is_alive", True)))
+
+def apply_operations(session, operations: List[Operation]) -> None:
+    """Apply operations in order within the caller's transaction, consecutive joins together."""
+    for joins, group in itertools.groupby(operations, key=lambda operation: operation[0] == "add_player"):
+        if joins:
+            register_players(session, [data for _, data in group])
+            continue
+        for kind, data in group:
+            if kind == "create_party":
+                session.add(Party(id_party=data["id_party"], title_party=data["title"]))
+            elif kind == "end_party":
+                session.flush()
+                party = session.get(Party, data["id_party"])
+                if party:
+                    setattr(party, 'winner', data["winner"])
+            elif kind == "kill_player":
+                session.flush()
+                player_in_party = session.get(PlayerInParty, (data["id_party"], data["id_player"]))
+                if player_in_party:
+                    setattr(player_in_party, 'is_alive', False)
+            else:
+                raise ValueError(f"Unknown persistence operation: {kind}")
+
+class Persistence(ABC):
+    """Records game mutations in the database."""
+    def __init__(self, session_factory=Session):
+        self.session_factory = session_factory
+    
+    def create_party(self, game_id: int, title: str) -> None:
+        self.submit("create_party", {"id_party": game_id, "title": title})
+    
+    def add_player(self, player_id: int, player_name: str, game_id: int, role: int) -> None:
+        self.submit("add_player", {"id_player": player_id, "name": player_name,
+                                   "id_party": game_id, "id_role": role, "is_alive": True})
+    
+    def add_players(self, game_id: int, players: List[Tuple[int, str, int]]) -> None:
+        """Register (player_id, name, role) players of a game, written together."""
+        with self.batch():
+            for player_id, player_name, role in players:
+                self.add_player(player_id, player_name, game_id, role)
+    
+    def kill_player(self, player_id: int, game_id: int) -> None:
+        self.submit("kill_player", {"id_player": player_id, "id_party": game_id})
+    
+    def end_party(self, game_id: int, winner: str) -> None:
+        self.submit("end_party", {"id_party": game_id, "winner": winner})
+    
+    @abstractmethod
+    def submit(self, kind: str, data: Dict[str, Any]) -> None:
+        pass
+    
+    @contextlib.contextmanager
+    def batch(self):
+        """Write the operations this thread submits inside the block together, when the backend allows it."""
+        yield
+    
+    def flush(self) -> None:
+        """Block until every submitted operation has been written."""
+    
+    def stop(self) -> None:
+        """Flush and release resources."""
+    
+    def _write(self, operations: List[Operation]) -> bool:
+        session = self.session_factory()
+        try:
+            apply_operations(session, operations)
+            session.commit()
+            return True
+        except SQLAlchemyError as e:
+            session.rollback()
+            logger.error(f"Error writing {len(operations)} operation(s) to database: {e}")
+            return False
+        finally:
+            session.close()
+
+class SyncPersistence(Persistence):
+    """
+    Writes each operation in its own transaction before returning, or all
+    the operations of a ``batch()`` block in one transaction when it exits.
+    """
+    def __init__(self, session_factory=Session):
+        super().__init__(session_factory)
+        self._local = threading.local()
+    
+    def submit(self, kind: str, data: Dict[str, Any]) -> None:
+        pending = getattr(self._local, "pending", None)
+        if pending is not None:
+            pending.append((kind, data))
+            return
+        self._write([(kind, data)])
+    
+    @contextlib.contextmanager
+    def batch(self):
+        if getattr(self._local, "pending", None) is not None:
+            # Nested block, the outermost one writes
+            yield
+            return
+        self._local.pending = []
+        try:
+            yield
+        finally:
+            operations, self._local.pending = self._local.pending, None
+            if operations:
+                self._write(coalesce_operations(operations))
+
+class WriteBehindPersistence(Persistence):
+    """
+    Queues operations and writes them from a background thread.
+    
+    The writer waits up to ``flush_interval`` seconds to gather up to
+    ``batch_size`` operations, coalesces them and commits them in a single
+    transaction. Batches are written in submission order by a single thread.
+    When the queue is full, ``submit`` blocks until the writer catches up
+    and the wait is counted in ``stats()``.
+    """
+    _STOP = ("stop", {})
+    
+    def __init__(self, session_factory=Session, queue_size: int = WRITE_BEHIND_QUEUE_SIZE,
+                 flush_interval: float = WRITE_BEHIND_FLUSH_INTERVAL,
+                 batch_size: int = WRITE_BEHIND_BATCH_SIZE):
+        super().__init__(session_factory)
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._queue: "queue.Queue[Operation]" = queue.Queue(maxsize=queue_size)
+        self._stats_lock = threading.Lock()
+        self._stats = {"submitted": 0, "processed": 0, "batches": 0, "failed": 0,
+                       "backpressure_waits": 0, "backpressure_seconds": 0.0}
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+    
+    def submit(self, kind: str, data: Dict[str, Any]) -> None:
+        if self._stopped:
+            raise RuntimeError("Write-behind persistence is stopped")
+        try:
+            self._queue.put_nowait((kind, data))
+        except queue.Full:
+            start = time.perf_counter()
+            logger.warning(f"Write-behind queue full ({self._queue.maxsize}), waiting for the database")
+            self._queue.put((kind, data))
+            with self._stats_lock:
+                self._stats["backpressure_waits"] += 1
+                self._stats["backpressure_seconds"] += time.perf_counter() - start
+        with self._stats_lock:
+            self._stats["submitted"] += 1
+    
+    def flush(self) -> None:
+        self._queue.join()
+    
+    def stop(self) -> None:
+        if self._stopped:
+            return
+        self._stopped = True
+        self._queue.put(self._STOP)
+        self._thread.join()
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["queue_depth"] = self._queue.qsize()
+        return stats
+    
+    def _next_batch(self) -> Tuple[List[Operation], bool]:
+        batch: List[Operation] = [self._queue.get()]
+        deadline = time.monotonic() + self.flush_interval
+        while batch[-1] is not self._STOP and len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        stopping = batch[-1] is self._STOP
+        return batch, stopping
+    
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch, stopping = self._next_batch()
+            operations = [operation for operation in batch if operation is not self._STOP]
+            if operations:
+                self._write_batch(coalesce_operations(operations))
+            with self._stats_lock:
+                self._stats["processed"] += len(operations)
+                self._stats["batches"] += 1 if operations else 0
+            for _ in batch:
+                self._queue.task_done()
+    
+    def _write_batch(self, operations: List[Operation]) -> None:
+        if self._write(operations):
+            return
+        # Retry one operation per transaction so a single bad row does not drop the batch
+        for operation in operations:
+            if not self._write([operation]):
+                with self._stats_lock:
+                    self._stats["failed"] += 1
+
+def create_persistence(mode: Optional[str] = None, session_factory=Session) -> Persistence:
+    """Build the persistence backend selected by PERSISTENCE_MODE."""
+    mode = mode or PERSISTENCE_MODE
+    if mode == "write_behind":
+        return WriteBehindPersistence(session_factory)
+    if mode == "sync":
+        return SyncPersistence(session_factory)
+    raise ValueError(f"Unknown persistence mode: {mode}")
@@ -1,4 +1,5 @@
 from .state import GameState
 from .server import GameServerServicer, serve
+from .aio_server import AsyncGameServerServicer, serve_async
 
-__all__ = ['GameState', 'GameServerServicer', 'serve']
+__all__ = ['GameState', 'GameServerServicer', 'serve', 'AsyncGameServerServicer', 'serve_async']
@@ -0,0 +1,115 @@
+import asyncio
+import contextvars
+import functools
+import grpc
+from concurrent import futures
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import (logger, SERVER_PORT, DB_EXECUTOR_WORKERS, WATCH_KEEPALIVE, MOVE_STREAM_CHUNK,
+                    METRICS_ENABLED, METRICS_PORT)
+import server_pb2
+import server_pb2_grpc
+from .server import GameServerServicer
+from .streaming import AsyncSubscription
+from .metrics import ServerMetrics, AsyncMetricsInterceptor, start_metrics_http
+from .interceptors import AsyncUnitOfWorkInterceptor
+
+class AsyncGameServerServicer(server_pb2_grpc.GameServerServicer):
+    """
+    grpc.aio servicer sharing the game logic of GameServerServicer.
+    
+    Every game handler is pushed to a bounded executor: besides SQLAlchemy
+    round-trips, reads may load a game from the database or the archive, and
+    take game locks held by threads resolving a round. Only GetServerStats,
+    which reads counters, runs directly on the event loop.
+    """
+    def __init__(self, db_workers: int = DB_EXECUTOR_WORKERS):
+        self.servicer = GameServerServicer()
+        self.game_state = self.servicer.game_state
+        self.event_manager = self.servicer.event_manager
+        self.executor = futures.ThreadPoolExecutor(max_workers=db_workers, thread_name_prefix="db")
+    
+    async def _run_blocking(self, handler, *args):
+        # Carry the request context over, so that database time is charged to the request
+        loop = asyncio.get_running_loop()
+        call = functools.partial(contextvars.copy_context().run, handler, *args)
+        return await loop.run_in_executor(self.executor, call)
+    
+    async def GameList(self, request, context):
+        return await self._run_blocking(self.servicer.GameList, request, context)
+    
+    async def GameSubscribe(self, request, context):
+        return await self._run_blocking(self.servicer.GameSubscribe, request, context)
+    
+    async def GameSubscribeParty(self, request, context):
+        return await self._run_blocking(self.servicer.GameSubscribeParty, request, context)
+    
+    async def GetGameStatus(self, request, context):
+        return await self._run_blocking(self.servicer.GetGameStatus, request, context)
+    
+    async def GetGameboardStatus(self, request, context):
+        return await self._run_blocking(self.servicer.GetGameboardStatus, request, context)
+    
+    async def GetGameboardDelta(self, request, context):
+        return await self._run_blocking(self.servicer.GetGameboardDelta, request, context)
+    
+    async def Move(self, request, context):
+        return await self._run_blocking(self.servicer.Move, request, context)
+    
+    async def MoveStream(self, request_iterator, context):
+        results = []
+        chunk = []
+        async for request in request_iterator:
+            chunk.append((request.id_party, request.id_player, request.move))
+            if len(chunk) >= MOVE_STREAM_CHUNK:
+                results.extend(await self._run_blocking(self.servicer.apply_moves, chunk))
+                chunk = []
+        if chunk:
+            results.extend(await self._run_blocking(self.servicer.apply_moves, chunk))
+        return server_pb2.MoveStreamReply(results=results)
+    
+    async def GetServerStats(self, request, context):
+        return self.servicer.GetServerStats(request, context)
+    
+    async def CreateGame(self, request, context):
+        return await self._run_blocking(self.servicer.CreateGame, request, context)
+    
+    async def WatchGameboard(self, request, context):
+        hub = self.servicer.watch_hub
+        subscription = hub.subscribe(AsyncSubscription(request.id_party, asyncio.get_running_loop()))
+        try:
+            last_reply = None
+            while True:
+                reply = await self._run_blocking(self.servicer.watch_snapshot, request.id_party, request.id_player)
+                if reply != last_reply:
+                    yield reply
+                    last_reply = reply
+                if self.servicer.watch_finished(reply):
+                    return
+                if subscription.dropped:
+                    await context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, "Subscriber too slow, events were dropped")
+                await subscription.wait_async(WATCH_KEEPALIVE)
+        finally:
+            hub.unsubscribe(subscription)
+
+
+async def serve_async(port: int = SERVER_PORT, metrics_port: int = METRICS_PORT,
+                      metrics_enabled: bool = METRICS_ENABLED):
+    metrics = ServerMetrics() if metrics_enabled else None
+    server = grpc.aio.server(interceptors=([AsyncMetricsInterceptor(metrics)] if metrics else [])
+                                          + [AsyncUnitOfWorkInterceptor()])
+    servicer = AsyncGameServerServicer()
+    servicer.servicer.game_state.bootstrap()
+    if metrics:
+        servicer.servicer.attach_metrics(metrics)
+    server_pb2_grpc.add_GameServerServicer_to_server(servicer, server)
+    server.add_insecure_port(f'[::]:{port}')
+    await server.start()
+    if metrics and metrics_port:
+        start_metrics_http(metrics, metrics_port)
+    servicer.game_state.evictor.start()
+    servicer.game_state.scheduler.start()
+    logger.info(f"Async server started listening on port {port}")
+    return server
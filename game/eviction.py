@@ -0,0 +1,147 @@
+import atexit
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import zlib
+from typing import Any, Dict, List, Optional
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import (logger, ARCHIVE_DIR, EVICTION_INTERVAL, EVICTION_FINISHED_TTL,
+                    EVICTION_IDLE_TTL, EVICTION_MAX_RESIDENT_GAMES)
+from .models.records import GameRecord, PlayerState
+
+class GameArchive:
+    """
+    Compact on-disk copy of evicted games: one zlib-compressed JSON document
+    per game holding its status, the moves pending for the round in
+    progress and, for every player, id, name, role, alive flag and position.
+    
+    Each archive writes to a directory of its own under ``directory``,
+    removed at exit: the documents only make sense to the process and the
+    database that produced them, another server sharing ARCHIVE_DIR or a
+    later run on a reset database must not pick them up.
+    """
+    def __init__(self, directory: str = ARCHIVE_DIR):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = tempfile.mkdtemp(prefix=f"archive-{os.getpid()}-", dir=directory)
+        atexit.register(self.clear)
+    
+    def clear(self) -> None:
+        """Remove the archive and every document in it."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+    
+    def _path(self, game_id: int) -> str:
+        return os.path.join(self.directory, f"game_{game_id}.json.z")
+    
+    def save(self, game: GameRecord, players: List[PlayerState]) -> None:
+        document = {
+            "id_game": game.id_game,
+            "title": game.title,
+            "started": game.started,
+            "round_in_progress": game.round_in_progress,
+            "turn_count": game.turn_count,
+            "winner": game.winner,
+            "board_version": game.board.version,
+            # Pairs, JSON object keys would turn the player IDs into strings
+            "pending_moves": [[player_id, move] for player_id, move in game.pending_moves.items()],
+            "players": [
+                [p.id_player, p.name, p.role, p.is_alive,
+                 list(p.position) if p.position is not None else None]
+                for p in players
+            ],
+        }
+        data = zlib.compress(json.dumps(document, separators=(",", ":")).encode("utf-8"))
+        path = self._path(game.id_game)
+        with open(path + ".tmp", "wb") as f:
+            f.write(data)
+        os.replace(path + ".tmp", path)
+    
+    def load(self, game_id: int) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(game_id), "rb") as f:
+                return json.loads(zlib.decompress(f.read()))
+        except FileNotFoundError:
+            return None
+    
+    def delete(self, game_id: int) -> None:
+        try:
+            os.remove(self._path(game_id))
+        except FileNotFoundError:
+            pass
+
+class GameEvictor:
+    """
+    Periodically moves games out of memory into the GameState archive.
+    
+    Finished games are evicted after ``finished_ttl`` seconds without access,
+    other games after ``idle_ttl``. When more than ``max_resident`` games are
+    in memory, the least recently accessed ones are evicted as well
+    (0 disables the limit). Evicted games come back on their next access.
+    """
+    def __init__(self, game_state, interval: float = EVICTION_INTERVAL,
+                 finished_ttl: float = EVICTION_FINISHED_TTL, idle_ttl: float = EVICTION_IDLE_TTL,
+                 max_resident: int = EVICTION_MAX_RESIDENT_GAMES):
+        self.game_state = game_state
+        self.interval = interval
+        self.finished_ttl = finished_ttl
+        self.idle_ttl = idle_ttl
+        self.max_resident = max_resident
+        self.evicted = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def candidates(self, now: float) -> List[int]:
+        """Game IDs to evict, in eviction order."""
+        last_access = self.game_state.last_access_times()
+        selected = []
+        for game_id, accessed in last_access.items():
+            game = self.game_state.games.get(game_id)
+            if game is None:
+                continue
+            ttl = self.finished_ttl if game.winner is not None else self.idle_ttl
+            if now - accessed >= ttl:
+                selected.append(game_id)
+        
+        if self.max_resident and len(last_access) - len(selected) > self.max_resident:
+            evicted = set(selected)
+            remaining = sorted((accessed, game_id) for game_id, accessed in last_access.items()
+                               if game_id not in evicted)
+            overflow = len(remaining) - self.max_resident
+            selected.extend(game_id for _, game_id in remaining[:overflow])
+        return selected
+    
+    def run_once(self, now: Optional[float] = None) -> int:
+        """Evict every current candidate, return how many games were evicted."""
+        now = time.monotonic() if now is None else now
+        count = 0
+        for game_id in self.candidates(now):
+            if self.game_state.evict_game(game_id, accessed_before=now):
+                count += 1
+        self.evicted += count
+        if count:
+            logger.info(f"Evicted {count} games, {len(self.game_state.games)} still in memory")
+        return count
+    
+    def start(self) -> None:
+        if self._thread is not None or self.interval <= 0:
+            return
+        self._thread = threading.Thread(target=self._run, name="game-evictor", daemon=True)
+        self._thread.start()
+    
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._stop.clear()
+    
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"Error evicting games: {e}")
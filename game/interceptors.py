@@ -0,0 +1,105 @@
+from typing import Callable, ContextManager
+import grpc
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from db.database import unit_of_work
+
+def method_name(handler_call_details) -> str:
+    return handler_call_details.method.rsplit('/', 1)[-1]
+
+class HandlerInterceptor(grpc.ServerInterceptor):
+    """
+    Runs every RPC of a grpc.server inside the context manager ``around(method)``,
+    streams included unless ``streams`` is False.
+    """
+    def __init__(self, around: Callable[[str], ContextManager], streams: bool = True):
+        self.around = around
+        self.streams = streams
+    
+    def intercept_service(self, continuation, handler_call_details):
+        handler = continuation(handler_call_details)
+        if handler is None or (not self.streams and not handler.unary_unary):
+            return handler
+        method = method_name(handler_call_details)
+        around = self.around
+    
+        def call(behavior):
+            def wrapper(request, context):
+                with around(method):
+                    return behavior(request, context)
+            return wrapper
+    
+        def stream(behavior):
+            def wrapper(request, context):
+                with around(method):
+                    yield from behavior(request, context)
+            return wrapper
+    
+        serializers = dict(request_deserializer=handler.request_deserializer,
+                           response_serializer=handler.response_serializer)
+        if handler.unary_unary:
+            return grpc.unary_unary_rpc_method_handler(call(handler.unary_unary), **serializers)
+        if handler.unary_stream:
+            return grpc.unary_stream_rpc_method_handler(stream(handler.unary_stream), **serializers)
+        if handler.stream_unary:
+            return grpc.stream_unary_rpc_method_handler(call(handler.stream_unary), **serializers)
+        return grpc.stream_stream_rpc_method_handler(stream(handler.stream_stream), **serializers)
+
+class AsyncHandlerInterceptor(grpc.aio.ServerInterceptor):
+    """
+    Runs every RPC of a grpc.aio server inside the context manager ``around(method)``,
+    streams included unless ``streams`` is False.
+    """
+    def __init__(self, around: Callable[[str], ContextManager], streams: bool = True):
+        self.around = around
+        self.streams = streams
+    
+    async def intercept_service(self, continuation, handler_call_details):
+        handler = await continuation(handler_call_details)
+        if handler is None or (not self.streams and not handler.unary_unary):
+            return handler
+        method = method_name(handler_call_details)
+        around = self.around
+    
+        def call(behavior):
+            async def wrapper(request, context):
+                with around(method):
+                    return await behavior(request, context)
+            return wrapper
+    
+        def stream(behavior):
+            async def wrapper(request, context):
+                with around(method):
+                    async for response in behavior(request, context):
+                        yield response
+            return wrapper
+    
+        serializers = dict(request_deserializer=handler.request_deserializer,
+                           response_serializer=handler.response_serializer)
+        if handler.unary_unary:
+            return grpc.unary_unary_rpc_method_handler(call(handler.unary_unary), **serializers)
+        if handler.unary_stream:
+            return grpc.unary_stream_rpc_method_handler(stream(handler.unary_stream), **serializers)
+        if handler.stream_unary:
+            return grpc.stream_unary_rpc_method_handler(call(handler.stream_unary), **serializers)
+        return grpc.stream_stream_rpc_method_handler(stream(handler.stream_stream), **serializers)
+
+def _unit_of_work(method: str) -> ContextManager:
+    return unit_of_work()
+
+class UnitOfWorkInterceptor(HandlerInterceptor):
+    """
+    Serves the database work of each unary RPC from one pooled connection (see
+    db.database.unit_of_work). Streams stay open for as long as the client wants
+    (WatchGameboard, bot MoveStreams): holding a connection for their whole life
+    would drain the pool, so their sessions check out a connection per access.
+    """
+    def __init__(self):
+        super().__init__(_unit_of_work, streams=False)
+
+class AsyncUnitOfWorkInterceptor(AsyncHandlerInterceptor):
+    """grpc.aio variant of UnitOfWorkInterceptor, the executor calls of an RPC share its connection."""
+    def __init__(self):
+        super().__init__(_unit_of_work, streams=False)
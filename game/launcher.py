@@ -0,0 +1,78 @@
+import multiprocessing
+import signal
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import logger, SERVER_PORT, SERVER_WORKERS, WORKER_BASE_PORT, METRICS_PORT
+from .router import serve_router
+
+WORKER_START_TIMEOUT = 60
+
+def _run_worker(index: int, count: int, port: int, ready, initializer: Optional[Callable[[], None]]) -> None:
+    """Entry point of a worker process: serve the games of one shard until SIGTERM."""
+    if initializer is not None:
+        initializer()
+    from .server import serve
+    from .state import GameState
+    
+    stopping = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stopping.set())
+    
+    game_state = GameState()
+    game_state.set_shard(index, count)
+    # The router exports its metrics on METRICS_PORT, worker i on the i-th next port
+    server = serve(port, metrics_port=METRICS_PORT + 1 + index if METRICS_PORT else 0)
+    ready.set()
+    try:
+        stopping.wait()
+    except KeyboardInterrupt:
+        pass
+    server.stop(0).wait()
+    game_state.shutdown()
+
+def serve_sharded(workers: int = SERVER_WORKERS, port: int = SERVER_PORT,
+                  base_port: int = WORKER_BASE_PORT,
+                  initializer: Optional[Callable[[], None]] = None) -> Tuple[object, List[multiprocessing.Process]]:
+    """
+    Start ``workers`` game server processes, each owning one shard of the
+    game IDs, and a router on ``port`` in this process.
+    
+    Worker ``i`` listens on ``base_port + i``. ``initializer`` (picklable)
+    runs first in every worker, e.g. to bind the database. Returns the
+    router server and the worker processes, to be passed to stop_sharded.
+    """
+    context = multiprocessing.get_context("spawn")
+    processes = []
+    readiness = []
+    for index in range(workers):
+        ready = context.Event()
+        process = context.Process(target=_run_worker, name=f"game-worker-{index}", daemon=True,
+                                  args=(index, workers, base_port + index, ready, initializer))
+        process.start()
+        processes.append(process)
+        readiness.append(ready)
+    
+    deadline = time.monotonic() + WORKER_START_TIMEOUT
+    for index, (process, ready) in enumerate(zip(processes, readiness)):
+        while not ready.wait(0.1):
+            if not process.is_alive() or time.monotonic() > deadline:
+                stop_sharded(None, processes)
+                raise RuntimeError(f"Game worker {index} did not start")
+    logger.info(f"{workers} game workers started on ports {base_port}-{base_port + workers - 1}")
+    
+    router = serve_router([f"localhost:{base_port + index}" for index in range(workers)], port)
+    return router, processes
+
+def stop_sharded(router, processes: List[multiprocessing.Process]) -> None:
+    """Stop the router, then let every worker flush its pending writes and exit."""
+    if router is not None:
+        router.stop(0).wait()
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+    for process in processes:
+        process.join()
@@ -0,0 +1,222 @@
+import bisect
+import contextlib
+import contextvars
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import logger, METRICS_HOST
+import server_pb2
+from .interceptors import HandlerInterceptor, AsyncHandlerInterceptor
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Database time spent on behalf of the request being served, in a one-item list
+_db_time: contextvars.ContextVar[Optional[List[float]]] = contextvars.ContextVar("db_time", default=None)
+_db_timing_installed = False
+
+# The start time lives on the statement's execution context: a statement that
+# raises never reaches after_cursor_execute, and its context is simply dropped
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._metrics_query_start = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_metrics_query_start", None)
+    spent = _db_time.get()
+    if started is not None and spent is not None:
+        spent[0] += time.perf_counter() - started
+
+def install_db_timing() -> None:
+    """Time every SQL statement and charge it to the request being served, if any."""
+    global _db_timing_installed
+    if not _db_timing_installed:
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        _db_timing_installed = True
+
+class Histogram:
+    """Counts per fixed bucket, the extra last bucket holding values above the highest bound."""
+    __slots__ = ("bounds", "counts", "count", "total")
+    
+    def __init__(self, bounds: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+    
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+    
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by linear interpolation inside its bucket."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.bounds[index - 1] if index > 0 else 0.0
+                upper = self.bounds[index] if index < len(self.bounds) else self.bounds[-1]
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return self.bounds[-1]
+
+class MethodStats:
+    __slots__ = ("lock", "latency", "db_seconds", "in_flight", "errors")
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latency = Histogram()
+        self.db_seconds = 0.0
+        self.in_flight = 0
+        self.errors = 0
+
+class ServerMetrics:
+    """
+    Per-RPC latency histograms, in-flight counts, error counts and database
+    time, plus gauges read from callbacks when the metrics are exported.
+    """
+    def __init__(self):
+        self.methods: Dict[str, MethodStats] = {}
+        self.gauges: Dict[str, Tuple[str, Callable[[], float]]] = {}
+        self._lock = threading.Lock()
+        install_db_timing()
+    
+    def add_gauge(self, name: str, help_text: str, read: Callable[[], float]) -> None:
+        self.gauges[name] = (help_text, read)
+    
+    def _method(self, method: str) -> MethodStats:
+        stats = self.methods.get(method)
+        if stats is None:
+            with self._lock:
+                stats = self.methods.setdefault(method, MethodStats())
+        return stats
+    
+    def begin(self, method: str) -> Tuple[MethodStats, float, contextvars.Token]:
+        stats = self._method(method)
+        with stats.lock:
+            stats.in_flight += 1
+        return stats, time.perf_counter(), _db_time.set([0.0])
+    
+    def end(self, call: Tuple[MethodStats, float, contextvars.Token], failed: bool) -> None:
+        stats, started, token = call
+        elapsed = time.perf_counter() - started
+        db_seconds = _db_time.get()[0]
+        _db_time.reset(token)
+        with stats.lock:
+            stats.in_flight -= 1
+            stats.latency.observe(elapsed)
+            stats.db_seconds += db_seconds
+            stats.errors += failed
+    
+    @contextlib.contextmanager
+    def track(self, method: str):
+        """Record the code run inside the block as one call of ``method``, failed if it raises."""
+        call = self.begin(method)
+        failed = True
+        try:
+            yield
+            failed = False
+        finally:
+            self.end(call, failed)
+    
+    def gauge_values(self) -> Dict[str, float]:
+        values = {}
+        for name, (_, read) in list(self.gauges.items()):
+            try:
+                values[name] = float(read())
+            except Exception as e:
+                logger.error(f"Error reading gauge {name}: {e}")
+        return values
+    
+    def stats_reply(self) -> server_pb2.GetServerStatsReply:
+        methods = []
+        for method, stats in sorted(self.methods.items()):
+            with stats.lock:
+                latency = stats.latency
+                methods.append(server_pb2.MethodStats(
+                    method=method, calls=latency.count, errors=stats.errors, in_flight=stats.in_flight,
+                    latency_seconds_sum=latency.total, latency_p50=latency.quantile(0.5),
+                    latency_p95=latency.quantile(0.95), latency_p99=latency.quantile(0.99),
+                    db_seconds_sum=stats.db_seconds))
+        return server_pb2.GetServerStatsReply(status=True, methods=methods, gauges=self.gauge_values())
+    
+    def render_prometheus(self) -> str:
+        lines = [
+            "# HELP grpc_server_handling_seconds Time to handle an RPC, streams included.",
+            "# TYPE grpc_server_handling_seconds histogram",
+        ]
+        in_flight, errors, db_seconds = [], [], []
+        for method, stats in sorted(self.methods.items()):
+            with stats.lock:
+                latency = stats.latency
+                cumulative = 0
+                for bound, count in zip(latency.bounds, latency.counts):
+                    cumulative += count
+                    lines.append(f'grpc_server_handling_seconds_bucket{{method="{method}",le="{bound}"}} {cumulative}')
+                lines.append(f'grpc_server_handling_seconds_bucket{{method="{method}",le="+Inf"}} {latency.count}')
+                lines.append(f'grpc_server_handling_seconds_sum{{method="{method}"}} {latency.total}')
+                lines.append(f'grpc_server_handling_seconds_count{{method="{method}"}} {latency.count}')
+                in_flight.append(f'grpc_server_in_flight{{method="{method}"}} {stats.in_flight}')
+                errors.append(f'grpc_server_errors_total{{method="{method}"}} {stats.errors}')
+                db_seconds.append(f'grpc_server_db_seconds_total{{method="{method}"}} {stats.db_seconds}')
+        lines += ["# HELP grpc_server_in_flight RPCs being handled.", "# TYPE grpc_server_in_flight gauge"] + in_flight
+        lines += ["# HELP grpc_server_errors_total RPCs that raised or were aborted.",
+                  "# TYPE grpc_server_errors_total counter"] + errors
+        lines += ["# HELP grpc_server_db_seconds_total Database time spent handling RPCs.",
+                  "# TYPE grpc_server_db_seconds_total counter"] + db_seconds
+        values = self.gauge_values()
+        for name, (help_text, _) in list(self.gauges.items()):
+            if name in values:
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge", f"{name} {values[name]}"]
+        return "\n".join(lines) + "\n"
+
+class MetricsInterceptor(HandlerInterceptor):
+    """Records every RPC of a grpc.server in a ServerMetrics."""
+    def __init__(self, metrics: ServerMetrics):
+        super().__init__(metrics.track)
+        self.metrics = metrics
+
+class AsyncMetricsInterceptor(AsyncHandlerInterceptor):
+    """Records every RPC of a grpc.aio server in a ServerMetrics."""
+    def __init__(self, metrics: ServerMetrics):
+        super().__init__(metrics.track)
+        self.metrics = metrics
+
+def start_metrics_http(metrics: ServerMetrics, port: int, host: str = METRICS_HOST) -> Optional[ThreadingHTTPServer]:
+    """Serve the metrics in Prometheus text format on http://host:port/metrics from a daemon thread."""
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?', 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = metrics.render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        
+        def log_message(self, format, *args):
+            pass
+    
+    try:
+        http_server = ThreadingHTTPServer((host, port), MetricsHandler)
+    except OSError as e:
+        logger.warning(f"Metrics endpoint not started on {host}:{port}: {e}")
+        return None
+    http_server.daemon_threads = True
+    threading.Thread(target=http_server.serve_forever, name="metrics-http", daemon=True).start()
+    logger.info(f"Metrics available on http://{host}:{http_server.server_port}/metrics")
+    return http_server
@@ -1,3 +1,4 @@
-from .board import BoardManager
+from .board import Board, BoardManager
+from .records import PlayerState, GameRecord
 
-__all__ = ['BoardManager']
\ No newline at end of file
+__all__ = ['Board', 'BoardManager', 'PlayerState', 'GameRecord']
@@ -1,29 +1,135 @@
+import bisect
 import random
-from typing import Tuple, List, Dict, Any
+from typing import Tuple, List, Dict, Any, Optional
+
+class Board:
+    """
+    Square game board stored as one byte per cell in a flat bytearray.
+    
+    Cells hold a one-character marker (' ' for an empty cell, 'W' or 'V').
+    Cell (row, col) lives at index row * size + col.
+    
+    The sorted indices of occupied cells are kept alongside the cells. A game
+    has at most MAX_PLAYERS_PER_GAME occupied cells, so picking a random free
+    cell costs a walk over a handful of entries whatever the board size.
+    """
+    __slots__ = ("size", "cells", "version", "_view", "_view_version", "_occupied")
+    
+    EMPTY = ' '
+    _EMPTY_BYTE = ord(EMPTY)
+    # Empty cells are sent to clients as '0'
+    _VIEW_TABLE = bytes.maketrans(b' ', b'0')
+    
+    def __init__(self, size: int):
+        self.size = size
+        self.cells = bytearray(b' ' * (size * size))
+        self.version = 0
+        self._view: Optional[str] = None
+        self._view_version = -1
+        self._occupied: List[int] = []
+    
+    def get(self, row: int, col: int) -> str:
+        """Marker at a cell."""
+        return chr(self.cells[row * self.size + col])
+    
+    def set(self, row: int, col: int, marker: str) -> None:
+        """Put a one-character marker on a cell."""
+        if marker == self.EMPTY:
+            self.clear(row, col)
+            return
+        index = row * self.size + col
+        if self.cells[index] == self._EMPTY_BYTE:
+            bisect.insort(self._occupied, index)
+        self.cells[index] = ord(marker)
+        self.version += 1
+    
+    def clear(self, row: int, col: int) -> None:
+        """Empty a cell."""
+        index = row * self.size + col
+        if self.cells[index] != self._EMPTY_BYTE:
+            del self._occupied[bisect.bisect_left(self._occupied, index)]
+        self.cells[index] = self._EMPTY_BYTE
+        self.version += 1
+    
+    def free_count(self) -> int:
+        """Number of empty cells."""
+        return len(self.cells) - len(self._occupied)
+    
+    def random_free_cell(self, rng=random) -> Optional[Tuple[int, int]]:
+        """A uniformly chosen empty cell, or None when the board is full."""
+        free = self.free_count()
+        if free == 0:
+            return None
+        # Rank among free cells, shifted past every occupied cell before it
+        index = rng.randrange(free)
+        for occupied in self._occupied:
+            if occupied > index:
+                break
+            index += 1
+        return divmod(index, self.size)
+    
+    def render(self) -> str:
+        """
+        The whole board as sent to clients, row by row, empty cells as '0'.
+        
+        The string is cached until the next mutation bumps ``version``.
+        """
+        if self._view_version != self.version:
+            self._view = self.cells.translate(self._VIEW_TABLE).decode('ascii')
+            self._view_version = self.version
+        return self._view
+    
+    def render_window(self, center: Tuple[int, int], radius: int, hidden: str = 'X') -> str:
+        """
+        The rendered board with every cell farther than ``radius`` (Chebyshev
+        distance) from ``center`` replaced by ``hidden``.
+        """
+        size = self.size
+        view = self.render()
+        center_row, center_col = center
+        first_row, last_row = max(0, center_row - radius), min(size - 1, center_row + radius)
+        first_col, last_col = max(0, center_col - radius), min(size - 1, center_col + radius)
+        
+        hidden_row = hidden * size
+        left = hidden * first_col
+        right = hidden * (size - last_col - 1)
+        parts = [hidden_row] * first_row
+        for row in range(first_row, last_row + 1):
+            start = row * size
+            parts.append(left)
+            parts.append(view[start + first_col:start + last_col + 1])
+            parts.append(right)
+        parts.extend([hidden_row] * (size - last_row - 1))
+        return "".join(parts)
+    
+    def is_empty(self, row: int, col: int) -> bool:
+        return self.cells[row * self.size + col] == self._EMPTY_BYTE
+    
+    def row(self, row: int) -> str:
+        """A row as a string of markers."""
+        start = row * self.size
+        return self.cells[start:start + self.size].decode('ascii')
+    
+    def to_rows(self) -> List[List[str]]:
+        """Nested list copy of the board, one string per cell."""
+        return [list(self.row(row)) for row in range(self.size)]
 
 class BoardManager:
     """Manages game board operations"""
     
     @staticmethod
-    def create_empty_board(size: int) -> List[List[str]]:
+    def create_empty_board(size: int) -> Board:
         """Create an empty game board"""
-        return [[' ' for _ in range(size)] for _ in range(size)]
+        return Board(size)
     
     @staticmethod
-    def get_random_empty_position(board: List[List[str]], board_size: int) -> Tuple[int, int]:
-        """Get a random empty position on the board."""
-        empty_positions = []
-        
-        for i in range(board_size):
-            for j in range(board_size):
-                if board[i][j] == ' ':
-                    empty_positions.append((i, j))
-        
-        return random.choice(empty_positions) if empty_positions else (0, 0)
+    def get_random_empty_position(board: Board, board_size: int) -> Optional[Tuple[int, int]]:
+        """Get a random empty position on the board, None if the board is full."""
+        return board.random_free_cell()
     
     @staticmethod
-    def update_board_with_player(board: List[List[str]], position: Tuple[int, int], 
+    def update_board_with_player(board: Board, position: Tuple[int, int], 
                                 marker: str) -> None:
         """Update the board with a player marker at a position."""
         row, col = position
-        board[row][col] = marker
\ No newline at end of file
+        board.set(row, col, marker)
@@ -0,0 +1,54 @@
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional, Tuple
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from config import BOARD_CHANGE_LOG_SIZE
+from .board import Board
+from ..rules.win_condition import new_alive_counts
+
+@dataclass(slots=True, eq=False)
+class PlayerState:
+    """
+    In-memory state of a player.
+    
+    ``role`` is the server_pb2 role code and ``position`` a (row, col) tuple,
+    None until the player is placed. ``view_version`` is the board version at
+    which the player's view window last moved.
+    """
+    id_player: int
+    name: str
+    role: int
+    id_game: int
+    is_alive: bool = True
+    position: Optional[Tuple[int, int]] = None
+    view_version: int = 0
+
+@dataclass(slots=True, eq=False)
+class GameRecord:
+    """
+    In-memory state of a game.
+    
+    ``occupancy`` maps each occupied cell to its alive player, ``changes``
+    holds (board version, row, col) for the latest board modifications and
+    ``alive_counts`` the number of alive players by role code.
+    ``pending_moves`` holds the move each player submitted for the round in
+    progress. Every field is guarded by ``lock``.
+    """
+    id_game: int
+    title: str
+    board: Board
+    players: List[int] = field(default_factory=list)
+    started: bool = False
+    round_in_progress: int = -1
+    occupancy: Dict[Tuple[int, int], int] = field(default_factory=dict)
+    changes: Deque[Tuple[int, int, int]] = field(default_factory=lambda: deque(maxlen=BOARD_CHANGE_LOG_SIZE))
+    alive_counts: Dict[int, int] = field(default_factory=new_alive_counts)
+    turn_count: int = 0
+    pending_moves: Dict[int, str] = field(default_factory=dict)
+    winner: Optional[str] = None
+    evicted: bool = False
+    lock: threading.RLock = field(default_factory=threading.RLock, repr=False)
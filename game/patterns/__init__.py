@@ -1,11 +1,13 @@
 from .factory import GameFactory, StandardGameFactory
 from .strategy import VisibilityStrategy, WolfVisibilityStrategy, VillagerVisibilityStrategy
 from .command import Command, MoveCommand
-from .observer import Observer, Subject, GameEventManager, LoggingObserver
+from .observer import (Observer, Subject, GameEventManager, AsyncGameEventManager, ObserverQueue,
+                       LoggingObserver, create_event_manager)
 
 __all__ = [
     'GameFactory', 'StandardGameFactory',
     'VisibilityStrategy', 'WolfVisibilityStrategy', 'VillagerVisibilityStrategy',
     'Command', 'MoveCommand',
-    'Observer', 'Subject', 'GameEventManager', 'LoggingObserver'
+    'Observer', 'Subject', 'GameEventManager', 'AsyncGameEventManager', 'ObserverQueue',
+    'LoggingObserver', 'create_event_manager'
 ]
\ No newline at end of file
@@ -27,15 +27,20 @@ class MoveCommand(Command):
     def execute(self) -> Tuple[bool, Optional[str]]:
         from ..state import GameState  # Import here to avoid circular imports
         
+        game = self.game_state.get_game(self.game_id)
+        if not game:
+            return False, "Game not found"
+            
         player = self.game_state.players.get(self.player_id)
         if not player:
             return False, "Player not found"
             
-        self.original_position = player["position"]
-        success, move_obj = self.game_state._process_move(self.game_id, self.player_id, self.move_str)
-        
-        if success:
-            self.new_position = self.game_state.players[self.player_id]["position"]
+        with game.lock:
+            self.original_position = player.position
+            success, move_obj = self.game_state._process_move(self.game_id, self.player_id, self.move_str)
+            
+            if success:
+                self.new_position = player.position
         
         return success, None
         
@@ -52,14 +57,17 @@ class MoveCommand(Command):
         if not game:
             return False, "Game not found"
             
-        # Clear current position in board
-        curr_row, curr_col = player["position"]
-        game["board"][curr_row][curr_col] = ' '
-        
-        # Restore original position
-        player["position"] = self.original_position
-        orig_row, orig_col = self.original_position
-        role_marker = 'W' if player["role"] == server_pb2.Wolf else 'V'
-        game["board"][orig_row][orig_col] = role_marker
+        with game.lock:
+            occupant = game.occupancy.get(self.original_position)
+            if occupant is not None and occupant != self.player_id:
+                return False, "Original position is occupied"
+                
+            # Clear current position in board and occupancy index
+            self.game_state._clear_player(game, self.player_id, player.position)
+            
+            # Restore original position
+            player.position = self.original_position
+            if player.is_alive:
+                self.game_state._place_player(game, self.player_id, self.original_position)
         
         return True, None
\ No newline at end of file
@@ -1,27 +1,25 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Optional
+from ..models.board import BoardManager
+from ..models.records import GameRecord
 
 class GameFactory(ABC):
     @abstractmethod
-    def create_game(self, title: str) -> Dict[str, Any]:
+    def create_game(self, title: Optional[str] = None, game_id: Optional[int] = None) -> GameRecord:
         pass
 
 class StandardGameFactory(GameFactory):
     def __init__(self, game_state):
         self.game_state = game_state
         
-    def create_game(self, title: str) -> Dict[str, Any]:
-        game_id = self.game_state.next_game_id
-        self.game_state.next_game_id += 1
+    def create_game(self, title: Optional[str] = None, game_id: Optional[int] = None) -> GameRecord:
+        if game_id is None:
+            game_id = self.game_state._allocate_game_id()
+        if title is None:
+            title = f"Game {game_id}"
         
-        game = {
-            "id_game": game_id,
-            "title": title,
-            "players": [],
-            "started": False,
-            "round_in_progress": -1,
-            "board": [[' ' for _ in range(self.game_state.board_size)] for _ in range(self.game_state.board_size)],
-            "turn_count": 0
-        }
-        
-        return game
\ No newline at end of file
+        return GameRecord(
+            id_game=game_id,
+            title=title,
+            board=BoardManager.create_empty_board(self.game_state.board_size)
+        )
\ No newline at end of file
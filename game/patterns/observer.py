@@ -1,11 +1,34 @@
-from typing import List, Dict, Any, Callable
+from collections import deque
+from typing import List, Dict, Any, Callable, Deque, Optional, Tuple
+import atexit
 import datetime
+import itertools
+import logging
+import threading
+import time
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from config import (logger, EVENT_DISPATCH_MODE, EVENT_QUEUE_SIZE, EVENT_BATCH_SIZE, EVENT_WORKERS,
+                    EVENT_DROP_POLICY)
+
+# (game_id, event_type, data)
+Event = Tuple[int, str, Dict[str, Any]]
 
 class Observer:
     """Interface for all observers that want to be notified of game events."""
+    # What asynchronous dispatch does when this observer falls behind, None for EVENT_DROP_POLICY
+    drop_policy: Optional[str] = None
+    
     def update(self, game_id: int, event_type: str, data: Dict[str, Any]) -> None:
         """Receive update notification with event data."""
         pass
+    
+    def update_batch(self, events: List[Event]) -> None:
+        """Receive several events in order, asynchronous dispatch delivers them this way."""
+        for game_id, event_type, data in events:
+            self.update(game_id, event_type, data)
 
 class Subject:
     """Base class for all subjects that can notify observers."""
@@ -57,17 +80,248 @@ class GameEventManager(Subject):
             'timestamp': datetime.datetime.now()
         })
     
+    def round_started(self, game_id: int, round_number: int) -> None:
+        """Notify when a new round begins, the first one starting the game."""
+        self.notify(game_id, 'round_started', {
+            'round': round_number,
+            'timestamp': datetime.datetime.now()
+        })
+    
     def game_ended(self, game_id: int, winner: str) -> None:
         """Notify when a game ends."""
         self.notify(game_id, 'game_ended', {
             'winner': winner,
             'timestamp': datetime.datetime.now()
         })
+    
+    def flush(self) -> None:
+        """Wait until every event is delivered, nothing to wait for when dispatch is synchronous."""
+        pass
+    
+    def stop(self) -> None:
+        """Deliver the pending events and stop dispatching in the background."""
+        pass
+
+DROP_POLICIES = ("drop_oldest", "drop_newest", "block")
+
+class _DispatchWorker:
+    """A thread delivering the events of its observer queues, one batch per queue at a time."""
+    def __init__(self, name: str):
+        self.lock = threading.Lock()
+        self.has_events = threading.Condition(self.lock)
+        self.has_room = threading.Condition(self.lock)
+        self.queues: List["ObserverQueue"] = []
+        self.delivering = False
+        self.stopping = False
+        self.thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self.thread.start()
+    
+    def idle(self) -> bool:
+        return not self.delivering and not any(queue.events for queue in self.queues)
+    
+    def _run(self) -> None:
+        while True:
+            with self.lock:
+                while not self.stopping and not any(queue.events for queue in self.queues):
+                    self.has_events.wait()
+                now = time.monotonic()
+                batches = [(queue, queue.take(now)) for queue in self.queues if queue.events]
+                if not batches:
+                    return
+                self.delivering = True
+                # Room for the publishers waiting on a full "block" queue
+                self.has_room.notify_all()
+            for queue, events in batches:
+                queue.deliver(events)
+            with self.lock:
+                self.delivering = False
+                self.has_room.notify_all()
+
+class ObserverQueue:
+    """
+    Bounded ring buffer of the events waiting for one observer.
+    
+    When it is full, ``drop_oldest`` overwrites the oldest event,
+    ``drop_newest`` discards the new one and ``block`` makes the notifying
+    thread wait for the worker. Dropped events and the time spent waiting
+    are counted, as well as the lag: how long events wait before delivery.
+    """
+    def __init__(self, observer: Observer, worker: _DispatchWorker, capacity: int, batch_size: int,
+                 drop_policy: str):
+        if drop_policy not in DROP_POLICIES:
+            raise ValueError(f"Unknown drop policy: {drop_policy}")
+        self.observer = observer
+        self.worker = worker
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.drop_policy = drop_policy
+        # (enqueued at, event), guarded by worker.lock
+        self.events: Deque[Tuple[float, Event]] = deque(maxlen=capacity)
+        self.delivered = 0
+        self.dropped = 0
+        self.batches = 0
+        self.failed = 0
+        self.blocked_seconds = 0.0
+        self.max_lag = 0.0
+    
+    def offer(self, event: Event, now: float) -> None:
+        worker = self.worker
+        with worker.lock:
+            if len(self.events) >= self.capacity:
+                if self.drop_policy == "block":
+                    while len(self.events) >= self.capacity and not worker.stopping:
+                        worker.has_room.wait()
+                    self.blocked_seconds += time.monotonic() - now
+                if len(self.events) >= self.capacity:
+                    self.dropped += 1
+                    if self.drop_policy == "drop_newest":
+                        return
+            # A full deque discards its oldest item on append
+            self.events.append((now, event))
+            if len(self.events) == 1:
+                worker.has_events.notify()
+    
+    def take(self, now: float) -> List[Event]:
+        """Remove the next batch, called by the worker holding its lock."""
+        count = min(self.batch_size, len(self.events))
+        self.max_lag = max(self.max_lag, now - self.events[0][0])
+        return [self.events.popleft()[1] for _ in range(count)]
+    
+    def deliver(self, events: List[Event]) -> None:
+        try:
+            self.observer.update_batch(events)
+        except Exception as e:
+            # One failing observer must not stop the dispatch to the others
+            self.failed += len(events)
+            logger.error(f"Observer {type(self.observer).__name__} failed on {len(events)} events: {e}")
+        with self.worker.lock:
+            self.delivered += len(events)
+            self.batches += 1
+    
+    def stats(self, now: float) -> Dict[str, Any]:
+        with self.worker.lock:
+            return {
+                "queue_depth": len(self.events),
+                "delivered": self.delivered,
+                "dropped": self.dropped,
+                "failed": self.failed,
+                "batches": self.batches,
+                "blocked_seconds": self.blocked_seconds,
+                "lag_seconds": now - self.events[0][0] if self.events else 0.0,
+                "max_lag_seconds": self.max_lag,
+            }
+
+class AsyncGameEventManager(GameEventManager):
+    """
+    GameEventManager delivering events from background threads.
+    
+    notify only appends the event to the ring buffer of each observer
+    (ObserverQueue), so a slow observer no longer delays the RPC that raised
+    the event. Each observer is served by one of ``workers`` threads, which
+    hands it up to ``batch_size`` events at a time through update_batch, in
+    the order they were raised. The drop policy of an observer is the one
+    given to attach, else its ``drop_policy`` attribute, else ``drop_policy``.
+    """
+    def __init__(self, workers: int = EVENT_WORKERS, queue_size: int = EVENT_QUEUE_SIZE,
+                 batch_size: int = EVENT_BATCH_SIZE, drop_policy: str = EVENT_DROP_POLICY):
+        super().__init__()
+        if drop_policy not in DROP_POLICIES:
+            raise ValueError(f"Unknown drop policy: {drop_policy}")
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.drop_policy = drop_policy
+        self._workers = [_DispatchWorker(f"game-events-{i}") for i in range(max(1, workers))]
+        self._next_worker = itertools.cycle(self._workers)
+        # Replaced, never mutated, so that notify can iterate without a lock
+        self._queues: Tuple[ObserverQueue, ...] = ()
+        self._attach_lock = threading.Lock()
+        self._stopped = False
+        atexit.register(self.stop)
+    
+    def attach(self, observer: Observer, drop_policy: Optional[str] = None, queue_size: Optional[int] = None,
+               batch_size: Optional[int] = None) -> None:
+        """Attach an observer, with its own drop policy, queue size or batch size if given."""
+        with self._attach_lock:
+            if observer in self._observers:
+                return
+            worker = next(self._next_worker)
+            queue = ObserverQueue(observer, worker, queue_size or self.queue_size, batch_size or self.batch_size,
+                                  drop_policy or observer.drop_policy or self.drop_policy)
+            with worker.lock:
+                worker.queues.append(queue)
+            self._queues = self._queues + (queue,)
+            super().attach(observer)
+    
+    def detach(self, observer: Observer) -> None:
+        """Detach an observer, its undelivered events are discarded."""
+        with self._attach_lock:
+            for queue in self._queues:
+                if queue.observer is observer:
+                    with queue.worker.lock:
+                        queue.worker.queues.remove(queue)
+                    self._queues = tuple(q for q in self._queues if q is not queue)
+            super().detach(observer)
+    
+    def notify(self, game_id: int, event_type: str, data: Dict[str, Any]) -> None:
+        if self._stopped:
+            # Events raised during shutdown go straight to the observers
+            super().notify(game_id, event_type, data)
+            return
+        now = time.monotonic()
+        event = (game_id, event_type, data)
+        for queue in self._queues:
+            queue.offer(event, now)
+    
+    def flush(self) -> None:
+        for worker in self._workers:
+            with worker.lock:
+                worker.has_room.wait_for(worker.idle)
+    
+    def stop(self) -> None:
+        if self._stopped:
+            return
+        self._stopped = True
+        for worker in self._workers:
+            with worker.lock:
+                worker.stopping = True
+                worker.has_events.notify()
+                worker.has_room.notify_all()
+        for worker in self._workers:
+            worker.thread.join()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Totals over the observers, the lag being the age of the oldest undelivered event."""
+        now = time.monotonic()
+        observers = {type(queue.observer).__name__: queue.stats(now) for queue in self._queues}
+        return {
+            "queue_depth": sum(s["queue_depth"] for s in observers.values()),
+            "delivered": sum(s["delivered"] for s in observers.values()),
+            "dropped": sum(s["dropped"] for s in observers.values()),
+            "lag_seconds": max((s["lag_seconds"] for s in observers.values()), default=0.0),
+            "max_lag_seconds": max((s["max_lag_seconds"] for s in observers.values()), default=0.0),
+            "observers": observers,
+        }
+
+def create_event_manager(mode: Optional[str] = None) -> GameEventManager:
+    """Build the event manager selected by EVENT_DISPATCH_MODE."""
+    mode = mode or EVENT_DISPATCH_MODE
+    if mode == "async":
+        return AsyncGameEventManager()
+    if mode == "sync":
+        return GameEventManager()
+    raise ValueError(f"Unknown event dispatch mode: {mode}")
 
 class LoggingObserver(Observer):
-    """Observer that logs game events."""
+    """Observer that logs game events, formatting them only when INFO is enabled."""
     def __init__(self, logger):
         self.logger = logger
     
     def update(self, game_id: int, event_type: str, data: Dict[str, Any]) -> None:
-        self.logger.info(f"Game {game_id} event: {event_type} - {data}")
\ No newline at end of file
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("Game %s event: %s - %s", game_id, event_type, data)
+    
+    def update_batch(self, events: List[Event]) -> None:
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        for game_id, event_type, data in events:
+            self.logger.info("Game %s event: %s - %s", game_id, event_type, data)
@@ -0,0 +1,128 @@
+import itertools
+from concurrent import futures
+from typing import Dict, List
+import grpc
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import logger, SERVER_PORT, SERVER_MAX_WORKERS, METRICS_ENABLED, METRICS_PORT
+import server_pb2
+import server_pb2_grpc
+from .metrics import ServerMetrics, MetricsInterceptor, start_metrics_http
+
+def shard_for(game_id: int, shard_count: int) -> int:
+    """Index of the worker owning a game."""
+    return game_id % shard_count
+
+class GameRouterServicer(server_pb2_grpc.GameServerServicer):
+    """
+    Front end of the multi-process server.
+    
+    Each worker owns the games whose ID maps to its index with shard_for.
+    RPCs about one game are forwarded to its owner, GameList is gathered
+    from every worker and new games are spread round-robin.
+    """
+    def __init__(self, worker_addresses: List[str]):
+        self.channels = [grpc.insecure_channel(address) for address in worker_addresses]
+        self.stubs = [server_pb2_grpc.GameServerStub(channel) for channel in self.channels]
+        self._next_worker = itertools.count()
+        self.metrics = None
+    
+    def _owner(self, game_id: int) -> server_pb2_grpc.GameServerStub:
+        return self.stubs[shard_for(game_id, len(self.stubs))]
+    
+    @staticmethod
+    def _forward(call, request, context):
+        try:
+            return call(request)
+        except grpc.RpcError as e:
+            context.abort(e.code(), e.details())
+    
+    def GameList(self, request, context):
+        """The games of every worker that answered, an error only when none did."""
+        game_ids = set()
+        errors = []
+        for worker, future in enumerate([stub.GameList.future(request) for stub in self.stubs]):
+            try:
+                game_ids.update(future.result().id_games)
+            except grpc.RpcError as e:
+                logger.error(f"GameList failed on worker {worker}: {e.code()} {e.details()}")
+                errors.append(e)
+        if len(errors) == len(self.stubs):
+            context.abort(errors[0].code(), errors[0].details())
+        return server_pb2.GameListReply(status=True, id_games=sorted(game_ids))
+    
+    def CreateGame(self, request, context):
+        stub = self.stubs[next(self._next_worker) % len(self.stubs)]
+        return self._forward(stub.CreateGame, request, context)
+    
+    def GameSubscribe(self, request, context):
+        return self._forward(self._owner(request.id_game).GameSubscribe, request, context)
+    
+    def GameSubscribeParty(self, request, context):
+        return self._forward(self._owner(request.id_game).GameSubscribeParty, request, context)
+    
+    def GetGameStatus(self, request, context):
+        return self._forward(self._owner(request.id_game).GetGameStatus, request, context)
+    
+    def GetGameboardStatus(self, request, context):
+        return self._forward(self._owner(request.id_party).GetGameboardStatus, request, context)
+    
+    def GetGameboardDelta(self, request, context):
+        return self._forward(self._owner(request.id_party).GetGameboardDelta, request, context)
+    
+    def Move(self, request, context):
+        return self._forward(self._owner(request.id_party).Move, request, context)
+    
+    def MoveStream(self, request_iterator, context):
+        requests = list(request_iterator)
+        by_worker: Dict[int, List[int]] = {}
+        for index, request in enumerate(requests):
+            by_worker.setdefault(shard_for(request.id_party, len(self.stubs)), []).append(index)
+        
+        calls = {worker: self.stubs[worker].MoveStream.future(iter([requests[index] for index in indices]))
+                 for worker, indices in by_worker.items()}
+        results = [None] * len(requests)
+        for worker, call in calls.items():
+            try:
+                reply = call.result()
+            except grpc.RpcError as e:
+                context.abort(e.code(), e.details())
+            for index, result in zip(by_worker[worker], reply.results):
+                results[index] = result
+        return server_pb2.MoveStreamReply(results=results)
+    
+    def WatchGameboard(self, request, context):
+        stream = self._owner(request.id_party).WatchGameboard(request)
+        context.add_callback(stream.cancel)
+        try:
+            yield from stream
+        except grpc.RpcError as e:
+            if e.code() != grpc.StatusCode.CANCELLED:
+                context.abort(e.code(), e.details())
+    
+    def GetServerStats(self, request, context):
+        # Latencies seen by the clients, forwarding included; workers export their own
+        if self.metrics is None:
+            return server_pb2.GetServerStatsReply(status=False)
+        return self.metrics.stats_reply()
+    
+    def close(self) -> None:
+        for channel in self.channels:
+            channel.close()
+
+def serve_router(worker_addresses: List[str], port: int = SERVER_PORT, metrics_port: int = METRICS_PORT,
+                 metrics_enabled: bool = METRICS_ENABLED):
+    metrics = ServerMetrics() if metrics_enabled else None
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=SERVER_MAX_WORKERS),
+                         interceptors=[MetricsInterceptor(metrics)] if metrics else [])
+    servicer = GameRouterServicer(worker_addresses)
+    servicer.metrics = metrics
+    server_pb2_grpc.add_GameServerServicer_to_server(servicer, server)
+    server.add_insecure_port(f'[::]:{port}')
+    server.start()
+    if metrics and metrics_port:
+        start_metrics_http(metrics, metrics_port)
+    logger.info(f"Router started listening on port {port} for {len(worker_addresses)} workers")
+    return server
@@ -1,4 +1,5 @@
-from .win_condition import check_game_winner, check_game_end
+from .win_condition import check_game_winner, check_game_end, winner_from_counts, new_alive_counts
 from .movement import validate_move, process_move
 
-__all__ = ['check_game_winner', 'check_game_end', 'validate_move', 'process_move']
\ No newline at end of file
+__all__ = ['check_game_winner', 'check_game_end', 'winner_from_counts', 'new_alive_counts',
+           'validate_move', 'process_move']
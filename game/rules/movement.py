@@ -1,27 +1,30 @@
-from typing import Tuple, Dict, Any, Optional, List
+from typing import TYPE_CHECKING, Tuple, Optional
 import sys
 import os
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 import server_pb2
 
-def validate_move(game: Dict[str, Any], player: Dict[str, Any], move_str: str, board_size: int) -> Tuple[bool, Optional[Tuple[int, int]]]:
+if TYPE_CHECKING:
+    from ..models.records import GameRecord, PlayerState
+
+def validate_move(game: "GameRecord", player: "PlayerState", move_str: str, board_size: int) -> Tuple[bool, Optional[Tuple[int, int]]]:
     """
     Validate if a move is legal.
     
     Args:
-        game: Game state dictionary
-        player: Player state dictionary
+        game: Game record
+        player: Player state
         move_str: Movement string (e.g., "01" for moving right)
         board_size: Size of the game board
     
     Returns:
         Tuple of (is_valid, new_position)
     """
-    if not player["is_alive"]:
+    if not player.is_alive:
         return False, None
         
-    if not game["started"] or game["round_in_progress"] < 0:
+    if not game.started or game.round_in_progress < 0:
         return False, None
     
     # Parse move string
@@ -34,7 +37,7 @@ def validate_move(game: Dict[str, Any], player: Dict[str, Any], move_str: str, b
     if not (-1 <= d_row <= 1) or not (-1 <= d_col <= 1):
         return False, None
     
-    curr_row, curr_col = player["position"]
+    curr_row, curr_col = player.position
     new_row = curr_row + d_row
     new_col = curr_col + d_col
     
@@ -58,9 +61,9 @@ def process_move(game_state, game_id: int, player_id: int, move_str: str) -> Tup
     if not is_valid or new_position is None:
         return False, None
     
-    # Update board and player position
-    old_row, old_col = player["position"]
     new_row, new_col = new_position
+    old_position = player.position
+    action = "move"
     
     # Check if there's another player at the target position
     target_player_id = game_state._find_player_at_position(game_id, new_position)
@@ -68,23 +71,23 @@ def process_move(game_state, game_id: int, player_id: int, move_str: str) -> Tup
         target_player = game_state.players[target_player_id]
         
         # If wolf meets villager, kill villager
-        if player["role"] == server_pb2.Wolf and target_player["role"] == server_pb2.Villager:
+        if player.role == server_pb2.Wolf and target_player.role == server_pb2.Villager:
             game_state._kill_player(target_player_id)
+            action = "kill"
         # If villager meets wolf, villager dies
-        elif player["role"] == server_pb2.Villager and target_player["role"] == server_pb2.Wolf:
+        elif player.role == server_pb2.Villager and target_player.role == server_pb2.Wolf:
+            game_state._record_play(game_id, player_id, "died", old_position, new_position)
             game_state._kill_player(player_id)
             return True, None
-    
-    # Update board
-    game["board"][old_row][old_col] = ' '
-    role_marker = 'W' if player["role"] == server_pb2.Wolf else 'V'
-    game["board"][new_row][new_col] = role_marker
-    
-    # Update player position
-    player["position"] = new_position
-    
-    # Check if game has ended
-    game_state._check_game_end(game_id)
+        # A cell holds a single player, teammates block each other
+        else:
+            return False, None
+    
+    # Update board, occupancy index and player position
+    game_state._clear_player(game, player_id, old_position)
+    player.position = new_position
+    game_state._place_player(game, player_id, new_position)
+    game_state._record_play(game_id, player_id, action, old_position, new_position)
     
     # Create response
     move_obj = server_pb2.Move()
@@ -1,20 +1,23 @@
-from typing import Optional, Dict, Any, List
+from typing import TYPE_CHECKING, Optional, Dict
 import sys
 import os
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 import server_pb2
 
-def check_game_winner(game: Dict[str, Any], players: Dict[int, Dict[str, Any]]) -> Optional[str]:
+if TYPE_CHECKING:
+    from ..models.records import GameRecord, PlayerState
+
+def check_game_winner(game: "GameRecord", players: Dict[int, "PlayerState"]) -> Optional[str]:
     """Determine if there's a winner for the game."""
     alive_wolves = 0
     alive_villagers = 0
     
-    for player_id in game["players"]:
-        if player_id in players and players[player_id]["is_alive"]:
-            if players[player_id]["role"] == server_pb2.Wolf:
+    for player_id in game.players:
+        if player_id in players and players[player_id].is_alive:
+            if players[player_id].role == server_pb2.Wolf:
                 alive_wolves += 1
-            elif players[player_id]["role"] == server_pb2.Villager:
+            elif players[player_id].role == server_pb2.Villager:
                 alive_villagers += 1
     
     if alive_wolves == 0:
@@ -23,12 +26,26 @@ def check_game_winner(game: Dict[str, Any], players: Dict[int, Dict[str, Any]])
         return "Wolves"
     return None
 
-def check_game_end(game: Dict[str, Any], players: Dict[int, Dict[str, Any]]) -> bool:
+def winner_from_counts(alive_counts: Dict[int, int]) -> Optional[str]:
+    """Determine the winner from a game's alive counters by role, in constant time."""
+    if alive_counts.get(server_pb2.Wolf, 0) == 0:
+        return "Villagers"
+    if alive_counts.get(server_pb2.Villager, 0) == 0:
+        return "Wolves"
+    return None
+
+def new_alive_counts() -> Dict[int, int]:
+    """Alive counters for a game without players."""
+    return {server_pb2.Wolf: 0, server_pb2.Villager: 0}
+
+def check_game_end(game: "GameRecord") -> bool:
     """Check if the game has ended and update game status accordingly."""
-    winner = check_game_winner(game, players)
+    if game.winner is not None:
+        return False
+    winner = winner_from_counts(game.alive_counts)
     if winner:
-        game["winner"] = winner
-        game["started"] = False
-        game["round_in_progress"] = -1
+        game.winner = winner
+        game.started = False
+        game.round_in_progress = -1
         return True
-    return False
\ No newline at end of file
+    return False
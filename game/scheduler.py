@@ -0,0 +1,230 @@
+import math
+import threading
+import time
+from typing import Dict, Hashable, List, Optional, Tuple
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import (logger, LOBBY_TIMEOUT, ROUND_DURATION, SCHEDULER_TICK, SCHEDULER_WHEEL_SLOTS,
+                    MAX_PLAYERS_PER_GAME)
+from .models.records import GameRecord
+from .patterns.command import MoveCommand
+from .rules.movement import validate_move
+
+# Timer key round number of a game waiting in its lobby
+LOBBY = -1
+
+class TimerWheel:
+    """
+    Hashed timer wheel: timers are dropped in the slot of their due tick, so
+    scheduling is O(1) and advancing only visits the slots of elapsed ticks.
+    Cancellation is left to the caller, which ignores timers that no longer
+    apply when they fire.
+    """
+    def __init__(self, tick: float = SCHEDULER_TICK, slots: int = SCHEDULER_WHEEL_SLOTS,
+                 now: Optional[float] = None):
+        self.tick = tick
+        self.slots: List[List[Tuple[int, Hashable]]] = [[] for _ in range(slots)]
+        self.origin = time.monotonic() if now is None else now
+        self.current = 0
+        self._lock = threading.Lock()
+    
+    def schedule(self, delay: float, key: Hashable) -> None:
+        """Fire ``key`` after at least ``delay`` seconds."""
+        with self._lock:
+            due = self.current + max(1, math.ceil(delay / self.tick))
+            self.slots[due % len(self.slots)].append((due, key))
+    
+    def advance(self, now: Optional[float] = None) -> List[Hashable]:
+        """Move the wheel up to ``now`` and return the keys of the expired timers in due order."""
+        now = time.monotonic() if now is None else now
+        target = int((now - self.origin) / self.tick)
+        expired = []
+        with self._lock:
+            if target - self.current >= len(self.slots):
+                # A full turn elapsed, every slot has to be visited once
+                due_slots = range(len(self.slots))
+            else:
+                due_slots = [tick % len(self.slots) for tick in range(self.current + 1, target + 1)]
+            for index in due_slots:
+                slot = self.slots[index]
+                if not slot:
+                    continue
+                remaining = [timer for timer in slot if timer[0] > target]
+                if len(remaining) != len(slot):
+                    expired.extend(timer for timer in slot if timer[0] <= target)
+                    self.slots[index] = remaining
+            self.current = max(self.current, target)
+        expired.sort(key=lambda timer: timer[0])
+        return [key for _, key in expired]
+
+class RoundScheduler:
+    """
+    Drives every game through its rounds from a single timer wheel.
+    
+    A game starts when it is full or when its lobby timeout expires with at
+    least two players. During a round, each player's latest move is kept
+    and all moves are resolved together when every alive player has moved
+    or the round duration is over. Moves are applied one by one in player
+    ID order, so collisions always resolve the same way.
+    """
+    def __init__(self, game_state, lobby_timeout: float = LOBBY_TIMEOUT,
+                 round_duration: float = ROUND_DURATION, tick: float = SCHEDULER_TICK,
+                 slots: int = SCHEDULER_WHEEL_SLOTS):
+        self.game_state = game_state
+        self.lobby_timeout = lobby_timeout
+        self.round_duration = round_duration
+        self.wheel = TimerWheel(tick, slots)
+        self.rounds_resolved = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def track(self, game: GameRecord) -> None:
+        """Arm the timer of a game that was just created or brought back into memory."""
+        if game.winner is not None:
+            return
+        if game.started:
+            self.wheel.schedule(self.round_duration, (game.id_game, game.round_in_progress))
+        else:
+            self.wheel.schedule(self.lobby_timeout, (game.id_game, LOBBY))
+    
+    def player_joined(self, game_id: int) -> None:
+        """Start a game as soon as it is full."""
+        game = self.game_state.games.get(game_id)
+        if game is not None and len(game.players) >= MAX_PLAYERS_PER_GAME:
+            self.start_game(game)
+    
+    def start_game(self, game: GameRecord) -> bool:
+        """Open the first round of a game with at least two players."""
+        with game.lock:
+            if game.started or game.winner is not None or len(game.players) < 2:
+                return False
+            game.started = True
+            game.round_in_progress = 1
+            self.wheel.schedule(self.round_duration, (game.id_game, 1))
+        self.game_state.event_manager.round_started(game.id_game, 1)
+        return True
+    
+    def submit_move(self, game_id: int, player_id: int,
+                    move_str: str) -> Optional[Tuple[int, Tuple[int, int]]]:
+        """
+        Queue a player's move for the round in progress.
+        
+        Returns (round, target position), or None if the move is not valid
+        now. A later move of the same player in the same round replaces it.
+        """
+        return self.submit_moves([(game_id, player_id, move_str)])[0]
+    
+    def submit_moves(self, moves: List[Tuple[int, int, str]]) -> List[Optional[Tuple[int, Tuple[int, int]]]]:
+        """
+        Queue many (game, player, move) items, with one lock acquisition per game.
+        
+        Results are in the order of ``moves``. Rounds completed by the batch
+        are resolved once every game's items are queued, and their database
+        writes are grouped in one persistence batch.
+        """
+        results: List[Optional[Tuple[int, Tuple[int, int]]]] = [None] * len(moves)
+        by_game: Dict[int, List[int]] = {}
+        for index, (game_id, _, _) in enumerate(moves):
+            by_game.setdefault(game_id, []).append(index)
+        
+        completed = []
+        for game_id, indices in by_game.items():
+            round_done = self._queue_moves(game_id, indices, moves, results)
+            if round_done is not None:
+                completed.append(round_done)
+        
+        with self.game_state.persistence.batch():
+            for game, round_number in completed:
+                self.resolve_round(game, round_number)
+        return results
+    
+    def _queue_moves(self, game_id: int, indices: List[int], moves: List[Tuple[int, int, str]],
+                     results: List[Optional[Tuple[int, Tuple[int, int]]]]) -> Optional[Tuple[GameRecord, int]]:
+        """Queue the moves of one game under its lock, return (game, round) once every alive player has moved."""
+        while True:
+            game = self.game_state.get_game(game_id)
+            if game is None:
+                return None
+            with game.lock:
+                if game.evicted:
+                    continue
+                round_number = game.round_in_progress
+                for index in indices:
+                    _, player_id, move_str = moves[index]
+                    player = self.game_state.players.get(player_id)
+                    if player is None or player.id_game != game_id:
+                        continue
+                    is_valid, target = validate_move(game, player, move_str, self.game_state.board_size)
+                    if is_valid:
+                        game.pending_moves[player_id] = move_str
+                        results[index] = (round_number, target)
+                if game.pending_moves and len(game.pending_moves) >= sum(game.alive_counts.values()):
+                    return game, round_number
+                return None
+    
+    def resolve_round(self, game: GameRecord, round_number: int) -> bool:
+        """Apply the moves queued for a round and open the next one."""
+        moved = []
+        next_round = None
+        with game.lock:
+            if game.evicted or not game.started or game.round_in_progress != round_number:
+                return False
+            pending, game.pending_moves = game.pending_moves, {}
+            for player_id in sorted(pending):
+                command = MoveCommand(self.game_state, game.id_game, player_id, pending[player_id])
+                success, _ = command.execute()
+                if success:
+                    moved.append((player_id, command.original_position, command.new_position))
+                if game.winner is not None:
+                    break
+            
+            game.turn_count += 1
+            # The end of the game already closed the round
+            if game.winner is None:
+                self.game_state.journal.close_round(game.id_game, round_number)
+                next_round = game.round_in_progress = round_number + 1
+                self.wheel.schedule(self.round_duration, (game.id_game, next_round))
+        
+        for player_id, old_position, new_position in moved:
+            self.game_state.event_manager.player_moved(game.id_game, player_id, old_position, new_position)
+        if next_round is not None:
+            self.game_state.event_manager.round_started(game.id_game, next_round)
+        self.rounds_resolved += 1
+        return True
+    
+    def run_due(self, now: Optional[float] = None) -> int:
+        """Handle every expired timer, return how many there were."""
+        expired = self.wheel.advance(now)
+        for game_id, round_number in expired:
+            # Evicted games are re-armed when they come back
+            game = self.game_state.games.get(game_id)
+            if game is None:
+                continue
+            if round_number == LOBBY:
+                if not self.start_game(game) and not game.started and game.winner is None:
+                    self.wheel.schedule(self.lobby_timeout, (game_id, LOBBY))
+            else:
+                self.resolve_round(game, round_number)
+        return len(expired)
+    
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="round-scheduler", daemon=True)
+        self._thread.start()
+    
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._stop.clear()
+    
+    def _run(self) -> None:
+        while not self._stop.wait(self.wheel.tick):
+            try:
+                self.run_due()
+            except Exception as e:
+                logger.error(f"Error advancing game rounds: {e}")
@@ -1,24 +1,54 @@
 import grpc
 from concurrent import futures
+from typing import List, Optional, Tuple
 import sys
 import os
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from config import logger, SERVER_PORT
+from config import (logger, SERVER_PORT, SERVER_MAX_WORKERS, WATCH_KEEPALIVE, MOVE_STREAM_CHUNK,
+                    METRICS_ENABLED, METRICS_PORT)
 import server_pb2
 import server_pb2_grpc
 from .state import GameState
-from .patterns.command import MoveCommand
-from .patterns.observer import GameEventManager, LoggingObserver
+from .streaming import BoardWatchHub, Subscription
+from .metrics import ServerMetrics, MetricsInterceptor, start_metrics_http
+from .interceptors import UnitOfWorkInterceptor
+from db.database import pool_stats
 
 class GameServerServicer(server_pb2_grpc.GameServerServicer):
     def __init__(self):
         self.game_state = GameState()
-        self.event_manager = GameEventManager()
-        self.event_manager.attach(LoggingObserver(logger))
+        self.event_manager = self.game_state.event_manager
+        self.watch_hub = BoardWatchHub()
+        self.event_manager.attach(self.watch_hub)
+        self.metrics = None
+    
+    def attach_metrics(self, metrics: ServerMetrics) -> None:
+        """Serve GetServerStats from ``metrics`` and export the game state sizes with it."""
+        self.metrics = metrics
+        metrics.add_gauge("game_games_in_memory", "Games held in memory.", lambda: len(self.game_state.games))
+        metrics.add_gauge("game_players_in_memory", "Players held in memory.", lambda: len(self.game_state.players))
+        persistence_stats = getattr(self.game_state.persistence, "stats", None)
+        if persistence_stats is not None:
+            metrics.add_gauge("game_write_behind_queue_depth", "Mutations waiting to be written.",
+                              lambda: persistence_stats()["queue_depth"])
+        event_stats = getattr(self.event_manager, "stats", None)
+        if event_stats is not None:
+            metrics.add_gauge("game_event_queue_depth", "Events waiting for an observer.",
+                              lambda: event_stats()["queue_depth"])
+            metrics.add_gauge("game_events_dropped", "Events dropped by full observer queues, since start.",
+                              lambda: event_stats()["dropped"])
+            metrics.add_gauge("game_event_lag_seconds", "Age of the oldest event waiting for an observer.",
+                              lambda: event_stats()["lag_seconds"])
+        metrics.add_gauge("db_pool_size", "Connections kept open by the pool.", lambda: pool_stats()["size"])
+        metrics.add_gauge("db_pool_checked_out", "Connections in use.", lambda: pool_stats()["checked_out"])
+        metrics.add_gauge("db_pool_waits", "Checkouts that waited for a free connection, since start.",
+                          lambda: pool_stats()["waits"])
+        metrics.add_gauge("db_pool_wait_seconds", "Time spent waiting for a free connection, since start.",
+                          lambda: pool_stats()["wait_seconds"])
     
     def GameList(self, request, context):
-        game_ids = list(self.game_state.games.keys())
+        game_ids = self.game_state.list_games()
         return server_pb2.GameListReply(status=True, id_games=game_ids)
     
     def GameSubscribe(self, request, context):
@@ -31,24 +61,33 @@ class GameServerServicer(server_pb2_grpc.GameServerServicer):
         
         return server_pb2.GameSubscribeReply(status=True, role=role, id_player=player_id)
     
+    def GameSubscribeParty(self, request, context):
+        names = list(request.players)
+        joined = self.game_state.add_players_to_game(names, request.id_game)
+        replies = []
+        for name, (player_id, role) in zip(names, joined):
+            self.event_manager.player_joined(request.id_game, player_id, name)
+            replies.append(server_pb2.GameSubscribeReply(status=True, role=role, id_player=player_id))
+        return server_pb2.GameSubscribePartyReply(status=bool(joined), players=replies)
+    
     def GetGameStatus(self, request, context):
-        if request.id_game not in self.game_state.games:
+        game = self.game_state.get_game(request.id_game)
+        if game is None:
             return server_pb2.GetGameStatusReply(status=False)
         if request.id_player not in self.game_state.players:
             return server_pb2.GetGameStatusReply(status=False)
         player = self.game_state.players[request.id_player]
-        if player["id_game"] != request.id_game:
+        if player.id_game != request.id_game:
             return server_pb2.GetGameStatusReply(status=False)
         
-        game = self.game_state.games[request.id_game]
         winner = self.game_state.get_game_winner(request.id_game)
         
         return server_pb2.GetGameStatusReply(
             status=True,
-            started=game["started"],
-            round_in_progress=game["round_in_progress"],
+            started=game.started,
+            round_in_progress=game.round_in_progress,
             winner=winner if winner else "",
-            alive=player["is_alive"]
+            alive=player.is_alive
         )
     
     def GetGameboardStatus(self, request, context):
@@ -57,46 +96,120 @@ class GameServerServicer(server_pb2_grpc.GameServerServicer):
             return server_pb2.GetGameboardStatusReply(status=False)
         return server_pb2.GetGameboardStatusReply(status=True, visible_cells=visible_cells)
     
+    def GetGameboardDelta(self, request, context):
+        delta = self.game_state.get_board_delta(request.id_party, request.id_player, request.since_version)
+        if delta is None:
+            return server_pb2.GetGameboardDeltaReply(status=False)
+        version, full, visible_cells, changes = delta
+        return server_pb2.GetGameboardDeltaReply(
+            status=True,
+            version=version,
+            full=full,
+            visible_cells=visible_cells,
+            changes=[server_pb2.CellChange(row=row, col=col, value=value) for row, col, value in changes]
+        )
+    
     def Move(self, request, context):
-        move_command = MoveCommand(self.game_state, request.id_party, request.id_player, request.move)
-        success, error_message = move_command.execute()
-        
-        if not success:
+        # The move is applied with the other moves of the round when it is resolved
+        queued = self.game_state.scheduler.submit_move(request.id_party, request.id_player, request.move)
+        return self.move_response(queued)
+    
+    def MoveStream(self, request_iterator, context):
+        results = []
+        chunk = []
+        for request in request_iterator:
+            chunk.append((request.id_party, request.id_player, request.move))
+            if len(chunk) >= MOVE_STREAM_CHUNK:
+                results.extend(self.apply_moves(chunk))
+                chunk = []
+        results.extend(self.apply_moves(chunk))
+        return server_pb2.MoveStreamReply(results=results)
+    
+    def apply_moves(self, moves: List[Tuple[int, int, str]]) -> List[server_pb2.MoveResponse]:
+        """Queue (game, player, move) items together, one MoveResponse per item in order."""
+        return [self.move_response(queued) for queued in self.game_state.scheduler.submit_moves(moves)]
+    
+    @staticmethod
+    def move_response(queued: Optional[Tuple[int, Tuple[int, int]]]) -> server_pb2.MoveResponse:
+        if queued is None:
             return server_pb2.MoveResponse(status=False, round_in_progress=-1)
-            
-        game = self.game_state.games[request.id_party]
-        player = self.game_state.players[request.id_player]
         
-        # Get the original position or use a default if it's None
-        original_position = move_command.original_position if move_command.original_position is not None else (-1, -1)
-        
-        # Notify observers about the move
-        self.event_manager.player_moved(
-            request.id_party, 
-            request.id_player,
-            original_position,  
-            player["position"]
-        )
-            
+        round_number, target = queued
         return server_pb2.MoveResponse(
             status=True,
-            round_in_progress=game["round_in_progress"],
+            round_in_progress=round_number,
             move=server_pb2.Move(
                 next_position=server_pb2.Position(
-                    row=player["position"][0], 
-                    col=player["position"][1]
+                    row=target[0],
+                    col=target[1]
                 )
             )
         )
     
+    def GetServerStats(self, request, context):
+        if self.metrics is None:
+            return server_pb2.GetServerStatsReply(status=False)
+        return self.metrics.stats_reply()
+    
     def CreateGame(self, request, context):
         new_game_id = self.game_state.create_new_game()
         return server_pb2.CreateGameResponse(game_id=str(new_game_id), success=True)
     
-def serve():
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
-    server_pb2_grpc.add_GameServerServicer_to_server(GameServerServicer(), server)
-    server.add_insecure_port(f'[::]:{SERVER_PORT}')
+    def watch_snapshot(self, game_id: int, player_id: int):
+        """What a WatchGameboard subscriber currently sees."""
+        game = self.game_state.get_game(game_id)
+        player = self.game_state.players.get(player_id)
+        if game is None or player is None or player.id_game != game_id:
+            return server_pb2.WatchGameboardReply(status=False)
+        
+        winner = self.game_state.get_game_winner(game_id)
+        visible_cells = self.game_state.get_visible_cells(game_id, player_id)
+        return server_pb2.WatchGameboardReply(
+            status=True,
+            visible_cells=visible_cells if visible_cells else "",
+            started=game.started,
+            round_in_progress=game.round_in_progress,
+            winner=winner if winner else "",
+            alive=player.is_alive
+        )
+    
+    @staticmethod
+    def watch_finished(reply) -> bool:
+        """A stream ends once there is nothing left for the player to watch."""
+        return not reply.status or not reply.alive or bool(reply.winner)
+    
+    def WatchGameboard(self, request, context):
+        subscription = self.watch_hub.subscribe(Subscription(request.id_party))
+        try:
+            last_reply = None
+            while context.is_active():
+                reply = self.watch_snapshot(request.id_party, request.id_player)
+                if reply != last_reply:
+                    yield reply
+                    last_reply = reply
+                if self.watch_finished(reply):
+                    return
+                if subscription.dropped:
+                    context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, "Subscriber too slow, events were dropped")
+                subscription.wait(WATCH_KEEPALIVE)
+        finally:
+            self.watch_hub.unsubscribe(subscription)
+    
+def serve(port: int = SERVER_PORT, metrics_port: int = METRICS_PORT, metrics_enabled: bool = METRICS_ENABLED):
+    metrics = ServerMetrics() if metrics_enabled else None
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=SERVER_MAX_WORKERS),
+                         interceptors=([MetricsInterceptor(metrics)] if metrics else []) + [UnitOfWorkInterceptor()])
+    servicer = GameServerServicer()
+    # Read the database before the first RPC rather than during it
+    servicer.game_state.bootstrap()
+    if metrics:
+        servicer.attach_metrics(metrics)
+    server_pb2_grpc.add_GameServerServicer_to_server(servicer, server)
+    server.add_insecure_port(f'[::]:{port}')
     server.start()
-    logger.info(f"Server started listening on port {SERVER_PORT}")
+    if metrics and metrics_port:
+        start_metrics_http(metrics, metrics_port)
+    servicer.game_state.evictor.start()
+    servicer.game_state.scheduler.start()
+    logger.info(f"Server started listening on port {port}")
     return server
@@ -1,20 +1,26 @@
-import random
 import datetime
-from typing import Dict, List, Tuple, Optional, Any
+import threading
+import time
+from typing import Dict, List, Tuple, Optional
+from sqlalchemy import func, select
 from sqlalchemy.exc import SQLAlchemyError
 import sys
 import os
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import logger, BOARD_SIZE, MAX_PLAYERS_PER_GAME
-from db import Session, Party, Role, Player, PlayerInParty, Turn, PlayerPlay
+from db import Session, Party, Role, Player, PlayerInParty, Turn, PlayerPlay, create_persistence, MoveJournal
 import server_pb2
 
 # Import the patterns and models
 from .patterns.strategy import WolfVisibilityStrategy, VillagerVisibilityStrategy
 from .patterns.factory import StandardGameFactory
 from .models.board import BoardManager
-from .rules.win_condition import check_game_winner, check_game_end
+from .models.records import PlayerState, GameRecord
+from .patterns.observer import create_event_manager, LoggingObserver
+from .rules.win_condition import check_game_end
+from .eviction import GameArchive, GameEvictor
+from .scheduler import RoundScheduler
 
 class GameState:
     _instance = None
@@ -30,15 +36,49 @@ class GameState:
             return
             
         self._initialized = True
-        self.games: Dict[int, Dict[str, Any]] = {}
-        self.players: Dict[int, Dict[str, Any]] = {}
+        self.games: Dict[int, GameRecord] = {}
+        self.players: Dict[int, PlayerState] = {}
         self.next_game_id: int = 1
         self.next_player_id: int = 1
+        self.shard_index: int = 0
+        self.shard_count: int = 1
+        self._id_lock = threading.Lock()
+        # One lock per game being loaded, so that cold games load in parallel:
+        # game ID -> [lock, threads using it], the dict guarded by _hydration_lock
+        self._hydration_lock = threading.Lock()
+        self._hydration_locks: Dict[int, list] = {}
+        self._last_access: Dict[int, float] = {}
+        # First board version of the games loaded from the database, see _hydrate_game
+        self.version_epoch: int = time.time_ns() // 1000
         self.board_size: int = BOARD_SIZE
         self.game_factory = StandardGameFactory(self)
         self.board_manager = BoardManager()
-        self._init_database()
-        self._load_state_from_db()
+        self.persistence = create_persistence()
+        self.journal = MoveJournal()
+        self.event_manager = create_event_manager()
+        self.event_manager.attach(LoggingObserver(logger))
+        self.archive = GameArchive()
+        self.evictor = GameEvictor(self)
+        self.scheduler = RoundScheduler(self)
+        # The database is only read by bootstrap(), on server start or first need
+        self.bootstrapped = False
+        self._bootstrap_lock = threading.Lock()
+
+    def bootstrap(self) -> None:
+        """
+        Prepare the database-backed state: default roles and the next IDs.
+        
+        The server calls it before accepting RPCs; otherwise the first ID
+        allocation does. Later calls do nothing.
+        """
+        if self.bootstrapped:
+            return
+        with self._bootstrap_lock:
+            if self.bootstrapped:
+                return
+            self._init_database()
+            self._load_state_from_db()
+            self.bootstrapped = True
 
     def _init_database(self):
         session = Session()
@@ -56,180 +96,506 @@ class GameState:
             session.close()
     
     def _load_state_from_db(self):
-        """Load existing games and players from the database."""
+        """
+        Prepare ID allocation from the database.
+        
+        Games are not loaded here: get_game hydrates an active game the first
+        time it is accessed, so startup cost does not grow with history.
+        """
         session = Session()
         try:
-            # Load games
-            parties = session.query(Party).all()
-            for party in parties:
-                self.games[party.id_party.scalar()] = {
-                    "id_game": party.id_party,
-                    "title": party.title_party,
-                    "players": [],
-                    "started": False,
-                    "round_in_progress": -1,
-                    "board": BoardManager.create_empty_board(self.board_size),
-                    "turn_count": 0
-                }
-                self.next_game_id = max(self.next_game_id, party.id_party.scalar() + 1)
-            
-            # Load players
-            players = session.query(Player).all()
-            for player in players:
-                self.players[player.id_player.scalar()] = {
-                    "id_player": player.id_player.scalar(),
-                    "name": player.pseudo,
-                    "is_alive": True
-                }
-                self.next_player_id = max(self.next_player_id, player.id_player.scalar() + 1)
-            
-            # Load players in games and rest of implementation...
-            
-            logger.info(f"Loaded {len(self.games)} games and {len(self.players)} players from database")
+            max_game_id = session.query(func.max(Party.id_party)).scalar()
+            max_player_id = session.query(func.max(Player.id_player)).scalar()
+            with self._id_lock:
+                self.next_game_id = self._align_id(max(self.next_game_id, (max_game_id or 0) + 1))
+                self.next_player_id = self._align_id(max(self.next_player_id, (max_player_id or 0) + 1))
+            logger.info(f"Next game ID {self.next_game_id}, next player ID {self.next_player_id}")
         except SQLAlchemyError as e:
             logger.error(f"Error loading state from database: {e}")
         finally:
             session.close()
 
-    def create_new_game(self) -> int:
-        """Create a new game and save to database."""
-        game = self.game_factory.create_game(f"Game {self.next_game_id}")
-        self.games[game["id_game"]] = game
+    def get_game(self, game_id: int) -> Optional[GameRecord]:
+        """
+        Get a game, bringing it back into memory on first access: from the
+        eviction archive if it was evicted, otherwise from the database if it
+        is still active.
+        """
+        self._last_access[game_id] = time.monotonic()
+        game = self.games.get(game_id)
+        if game is not None:
+            return game
+        if not self.owns_game(game_id):
+            self._last_access.pop(game_id, None)
+            return None
+        with self._hydration_lock:
+            entry = self._hydration_locks.setdefault(game_id, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                game = self.games.get(game_id)
+                if game is None:
+                    game = self._restore_archived_game(game_id)
+                if game is None:
+                    game = self._hydrate_game(game_id)
+                if game is None:
+                    self._last_access.pop(game_id, None)
+                else:
+                    self.scheduler.track(game)
+                return game
+        finally:
+            with self._hydration_lock:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._hydration_locks[game_id]
+
+    def last_access_times(self) -> Dict[int, float]:
+        """Monotonic time of the last access to each game in memory."""
+        return {game_id: accessed for game_id, accessed in list(self._last_access.items())
+                if game_id in self.games}
+
+    def evict_game(self, game_id: int, accessed_before: Optional[float] = None) -> bool:
+        """
+        Archive a game and drop it and its players from memory.
         
-        # Save to database
+        The game is kept if it was accessed at or after ``accessed_before``.
+        Callers that fetched the game before it was evicted see it flagged
+        with ``evicted`` once they hold its lock and must fetch it again.
+        """
+        game = self.games.get(game_id)
+        if game is None:
+            return False
+        with game.lock:
+            if accessed_before is not None and self._last_access.get(game_id, 0) >= accessed_before:
+                return False
+            self.archive.save(game, [self.players[p] for p in game.players if p in self.players])
+            game.evicted = True
+            for player_id in game.players:
+                self.players.pop(player_id, None)
+            del self.games[game_id]
+            self._last_access.pop(game_id, None)
+        return True
+
+    def _restore_archived_game(self, game_id: int) -> Optional[GameRecord]:
+        """
+        Rebuild an evicted game exactly as it was from the archive, provided
+        its party still exists in the database.
+        """
+        document = self.archive.load(game_id)
+        if document is None:
+            return None
         session = Session()
         try:
-            party = Party(id_party=game["id_game"], title_party=game["title"])
-            session.add(party)
-            session.commit()
-            logger.info(f"Game {game['id_game']} created in database")
+            known = session.get(Party, game_id) is not None
         except SQLAlchemyError as e:
-            session.rollback()
-            logger.error(f"Error saving game to database: {e}")
+            # The archive is all there is to go on
+            logger.error(f"Error checking game {game_id} before restoring it: {e}")
+            known = True
         finally:
             session.close()
+        if not known:
+            logger.warning(f"Discarding archived game {game_id}, its party is not in the database")
+            self.archive.delete(game_id)
+            return None
+        
+        game = self.game_factory.create_game(document["title"], game_id=game_id)
+        # Versions carry on from the evicted board, so deltas asked for older versions fall back to a snapshot
+        game.board.version = document["board_version"]
+        game.started = document["started"]
+        game.round_in_progress = document["round_in_progress"]
+        game.turn_count = document["turn_count"]
+        game.winner = document["winner"]
+        # Moves already accepted for the round in progress, resolved when its timer fires again
+        game.pending_moves = {player_id: move for player_id, move in document["pending_moves"]}
+        for player_id, name, role, is_alive, position in document["players"]:
+            position = tuple(position) if position is not None else None
+            self.players[player_id] = PlayerState(player_id, name, role, game_id, is_alive, position)
+            game.players.append(player_id)
+            if is_alive:
+                self._place_player(game, player_id, position)
+                game.alive_counts[role] += 1
+        
+        self.games[game_id] = game
+        self.archive.delete(game_id)
+        logger.info(f"Restored game {game_id} from archive")
+        return game
+
+    def _hydrate_game(self, game_id: int) -> Optional[GameRecord]:
+        """
+        Rebuild an active game, its players and their roles with one joined query.
+        
+        Finished games are never materialized. Board positions are not stored
+        in the database, so alive players are placed on random free cells.
+        
+        The rebuilt board starts at ``version_epoch``, the wall clock in
+        microseconds when this GameState was created. Versions issued for the
+        game before a restart stay below it as long as a board changes less
+        than once per microsecond, so clients holding one get a full snapshot
+        instead of a delta against a board that no longer matches theirs.
+        """
+        query = (
+            select(Party.title_party, Party.winner, PlayerInParty.id_player, PlayerInParty.id_role,
+                   PlayerInParty.is_alive, Player.pseudo)
+            .select_from(Party)
+            .outerjoin(PlayerInParty, PlayerInParty.id_party == Party.id_party)
+            .outerjoin(Player, Player.id_player == PlayerInParty.id_player)
+            .where(Party.id_party == game_id)
+            .order_by(PlayerInParty.id_player)
+        )
+        session = Session()
+        try:
+            rows = session.execute(query).all()
+        except SQLAlchemyError as e:
+            logger.error(f"Error loading game {game_id} from database: {e}")
+            return None
+        finally:
+            session.close()
+        
+        if not rows or rows[0].winner is not None:
+            return None
+        
+        game = self.game_factory.create_game(rows[0].title_party, game_id=game_id)
+        game.board.version = self.version_epoch
+        for row in rows:
+            if row.id_player is None:
+                continue
+            player_id = row.id_player
+            self.players[player_id] = PlayerState(player_id, row.pseudo, row.id_role, game_id, bool(row.is_alive))
+            game.players.append(player_id)
+            if row.is_alive:
+                position = game.board.random_free_cell()
+                self.players[player_id].position = position
+                self._place_player(game, player_id, position)
+                game.alive_counts[row.id_role] += 1
+        
+        self.games[game_id] = game
+        logger.info(f"Loaded game {game_id} with {len(game.players)} players from database")
+        return game
+
+    def list_games(self) -> List[int]:
+        """IDs of the games in memory and of this shard's active games still in the database."""
+        game_ids = set(self.games)
+        query = select(Party.id_party).where(Party.winner.is_(None))
+        if self.shard_count > 1:
+            query = query.where(Party.id_party % self.shard_count == self.shard_index)
+        session = Session()
+        try:
+            game_ids.update(session.scalars(query))
+        except SQLAlchemyError as e:
+            logger.error(f"Error listing games from database: {e}")
+        finally:
+            session.close()
+        return sorted(game_ids)
+
+    def set_shard(self, index: int, count: int) -> None:
+        """
+        Own only the games whose ID is ``index`` modulo ``count``.
+        
+        Used by the multi-process server: every worker allocates game and
+        player IDs in its own residue class, so IDs stay globally unique.
+        """
+        with self._id_lock:
+            self.shard_index, self.shard_count = index, count
+            self.next_game_id = self._align_id(self.next_game_id)
+            self.next_player_id = self._align_id(self.next_player_id)
+
+    def owns_game(self, game_id: int) -> bool:
+        return game_id % self.shard_count == self.shard_index
+
+    def _align_id(self, value: int) -> int:
+        """Smallest ID of this shard not below ``value``."""
+        return value + (self.shard_index - value) % self.shard_count
+
+    def _allocate_game_id(self) -> int:
+        """Reserve the next game ID, safe to call from any thread."""
+        self.bootstrap()
+        with self._id_lock:
+            game_id = self.next_game_id
+            self.next_game_id += self.shard_count
+            return game_id
+
+    def _allocate_player_id(self) -> int:
+        """Reserve the next player ID, safe to call from any thread."""
+        self.bootstrap()
+        with self._id_lock:
+            player_id = self.next_player_id
+            self.next_player_id += self.shard_count
+            return player_id
+
+    def create_new_game(self) -> int:
+        """Create a new game and save to database."""
+        game = self.game_factory.create_game()
+        self.games[game.id_game] = game
+        self._last_access[game.id_game] = time.monotonic()
+        self.scheduler.track(game)
+        
+        # Save to database
+        self.persistence.create_party(game.id_game, game.title)
         
-        return game["id_game"]
+        return game.id_game
     
     def get_visible_cells(self, game_id: int, player_id: int) -> Optional[str]:
-        if game_id not in self.games or player_id not in self.players:
+        game = self.get_game(game_id)
+        if game is None:
             return None
-            
-        player = self.players[player_id]
-        if player["id_game"] != game_id or not player["is_alive"]:
+        
+        with game.lock:
+            if game.evicted:
+                return self.get_visible_cells(game_id, player_id)
+            player = self.players.get(player_id)
+            if player is None or player.id_game != game_id or not player.is_alive:
+                return None
+            return self._render_view(game, player)
+    
+    def _render_view(self, game: GameRecord, player: PlayerState) -> str:
+        """The board as seen by a player, called with the game lock held."""
+        strategy = WolfVisibilityStrategy() if player.role == server_pb2.Wolf else VillagerVisibilityStrategy()
+        return strategy.get_visible_cells(game.board, player, self.board_size)
+    
+    def get_board_delta(self, game_id: int, player_id: int,
+                        since_version: int) -> Optional[Tuple[int, bool, str, List[Tuple[int, int, str]]]]:
+        """
+        Changes to a player's visible board since a board version.
+        
+        Returns (version, full, visible_cells, changes). When ``full`` is true,
+        ``visible_cells`` is the whole view and ``changes`` is empty: the
+        version is unknown, too old for the change log, or the villager's
+        own view window moved. Otherwise ``changes`` lists (row, col, value) for
+        every cell modified after ``since_version``.
+        """
+        game = self.get_game(game_id)
+        if game is None:
             return None
         
-        strategy = WolfVisibilityStrategy() if player["role"] == server_pb2.Wolf else VillagerVisibilityStrategy()
-        return strategy.get_visible_cells(self, game_id, player_id, self.board_size)
+        with game.lock:
+            if game.evicted:
+                return self.get_board_delta(game_id, player_id, since_version)
+            player = self.players.get(player_id)
+            if player is None or player.id_game != game_id or not player.is_alive:
+                return None
+            board = game.board
+            version = board.version
+            changes = game.changes
+            
+            is_wolf = player.role == server_pb2.Wolf
+            covered = since_version == version or (
+                0 <= since_version < version and changes and changes[0][0] <= since_version + 1
+            )
+            # Wolves see the whole board, only a villager's view depends on where it stands
+            window_moved = not is_wolf and player.view_version > since_version
+            if not covered or window_moved:
+                return version, True, self._render_view(game, player), []
+            
+            cells = {}
+            for change_version, row, col in reversed(changes):
+                if change_version <= since_version:
+                    break
+                cells.setdefault((row, col), None)
+            
+            view = board.render()
+            player_row, player_col = player.position
+            visibility_range = VillagerVisibilityStrategy.visibility_range
+            delta = []
+            for row, col in reversed(list(cells)):
+                if is_wolf or max(abs(row - player_row), abs(col - player_col)) <= visibility_range:
+                    delta.append((row, col, view[row * board.size + col]))
+                else:
+                    delta.append((row, col, 'X'))
+            return version, False, "", delta
     
     def add_player_to_game(self, player_name, game_id):
         """Add a player to an existing game."""
-        if game_id not in self.games:
-            return None, None
-            
-        game = self.games[game_id]
-        if len(game["players"]) >= MAX_PLAYERS_PER_GAME:
+        joined = self.add_players_to_game([player_name], game_id)
+        if not joined:
             return None, None
+        return joined[0]
+    
+    def add_players_to_game(self, player_names: List[str], game_id: int) -> List[Tuple[int, int]]:
+        """
+        Enrol several players in a game at once, in order, as long as seats are left.
+        
+        Returns the (player_id, role) of every player enrolled. They are written
+        to the database together and the game starts if it is now full.
+        """
+        game = self.get_game(game_id)
+        if game is None:
+            return []
+        
+        joined = []
+        with game.lock:
+            if game.evicted:
+                return self.add_players_to_game(player_names, game_id)
+            if game.winner is not None:
+                return []
             
-        # Create new player
-        player_id = self.next_player_id
-        self.next_player_id += 1
-        
-        # Assign role - first player is Wolf, others are Villagers
-        role = server_pb2.Wolf if len(game["players"]) == 0 else server_pb2.Villager
-        
-        # Create player in memory
-        self.players[player_id] = {
-            "id_player": player_id,
-            "name": player_name,
-            "role": role,
-            "id_game": game_id,
-            "is_alive": True,
-            "position": self.board_manager.get_random_empty_position(game["board"], self.board_size)
-        }
-        
-        # Update board with player marker
-        row, col = self.players[player_id]["position"]
-        marker = 'W' if role == server_pb2.Wolf else 'V'
-        game["board"][row][col] = marker
-        
-        # Add player to game
-        game["players"].append(player_id)
+            for player_name in player_names[:MAX_PLAYERS_PER_GAME - len(game.players)]:
+                position = self.board_manager.get_random_empty_position(game.board, self.board_size)
+                if position is None:
+                    logger.warning(f"Game {game_id} board is full, cannot place a new player")
+                    break
+                
+                # Create new player
+                player_id = self._allocate_player_id()
+                
+                # Assign role - first player is Wolf, others are Villagers
+                role = server_pb2.Wolf if len(game.players) == 0 else server_pb2.Villager
+                
+                # Create player in memory
+                self.players[player_id] = PlayerState(player_id, player_name, role, game_id, position=position)
+                
+                # Update board and occupancy index with player marker
+                self._place_player(game, player_id, position)
+                
+                # Add player to game
+                game.players.append(player_id)
+                game.alive_counts[role] += 1
+                joined.append((player_id, player_name, role))
         
+        if not joined:
+            return []
         # Save to database
-        self._save_player_to_db(player_id, player_name, game_id, role)
+        self.persistence.add_players(game_id, joined)
+        self.scheduler.player_joined(game_id)
         
-        return player_id, role
-
-    def _save_player_to_db(self, player_id, player_name, game_id, role):
-        """Save player data to the database."""
-        session = Session()
-        try:
-            # Check if player exists
-            player = session.query(Player).filter_by(id_player=player_id).first()
-            if not player:
-                player = Player(id_player=player_id, pseudo=player_name)
-                session.add(player)
-                
-            # Add player to party
-            pip = PlayerInParty(id_party=game_id, id_player=player_id, id_role=role, is_alive=True)
-            session.add(pip)
-            session.commit()
-            logger.info(f"Player {player_id} saved to database")
-        except SQLAlchemyError as e:
-            session.rollback()
-            logger.error(f"Error saving player to database: {e}")
-        finally:
-            session.close()
+        return [(player_id, role) for player_id, _, role in joined]
 
     def _process_move(self, game_id, player_id, move_str):
         """Process a move from a player."""
         from .rules.movement import process_move
-        return process_move(self, game_id, player_id, move_str)
+        game = self.get_game(game_id)
+        if game is None:
+            return False, None
+        with game.lock:
+            if game.evicted:
+                return self._process_move(game_id, player_id, move_str)
+            return process_move(self, game_id, player_id, move_str)
 
     def get_game_winner(self, game_id):
         """Get the winner of a game if there is one."""
-        if game_id not in self.games:
+        game = self.get_game(game_id)
+        if game is None:
             return None
             
-        game = self.games[game_id]
-        if "winner" in game:
-            return game["winner"]
+        if game.winner is not None:
+            return game.winner
             
         return None
 
     def _find_player_at_position(self, game_id: int, position: tuple) -> Optional[int]:
-        """Find player at a specific position."""
-        for player_id, player in self.players.items():
-            if player.get("id_game") == game_id and player.get("position") == position and player.get("is_alive"):
-                return player_id
-        return None
+        """Find the alive player at a specific position using the game's occupancy index."""
+        game = self.games.get(game_id)
+        if game is None:
+            return None
+        return game.occupancy.get(position)
+
+    def _place_player(self, game: GameRecord, player_id: int, position: Tuple[int, int]) -> None:
+        """Put a player's marker on the board and register it in the occupancy index."""
+        row, col = position
+        marker = 'W' if self.players[player_id].role == server_pb2.Wolf else 'V'
+        game.board.set(row, col, marker)
+        game.changes.append((game.board.version, row, col))
+        game.occupancy[position] = player_id
+        # The player's own view window is now centred on this cell
+        self.players[player_id].view_version = game.board.version
+
+    def _clear_player(self, game: GameRecord, player_id: int, position: Tuple[int, int]) -> None:
+        """Remove a player's marker from the board and from the occupancy index."""
+        if game.occupancy.get(position) != player_id:
+            return
+        del game.occupancy[position]
+        row, col = position
+        game.board.clear(row, col)
+        game.changes.append((game.board.version, row, col))
+
+    def check_occupancy_index(self, game_id: int) -> List[str]:
+        """
+        Cross-check a game's occupancy index against a full scan of its players and board.
+        
+        Returns a list of human-readable inconsistencies, empty when the index is sound.
+        """
+        if game_id not in self.games:
+            return [f"Game {game_id} not found"]
+        
+        game = self.games[game_id]
+        occupancy = game.occupancy
+        errors = []
+        
+        expected = {}
+        for player_id in game.players:
+            player = self.players.get(player_id)
+            if player is None or not player.is_alive:
+                continue
+            position = player.position
+            if position in expected:
+                errors.append(f"Players {expected[position]} and {player_id} share position {position}")
+            expected[position] = player_id
+        
+        for position, player_id in expected.items():
+            if occupancy.get(position) != player_id:
+                errors.append(f"Player {player_id} at {position} is indexed as {occupancy.get(position)}")
+        
+        for position, player_id in occupancy.items():
+            if expected.get(position) != player_id:
+                errors.append(f"Stale index entry {position} -> {player_id}")
+                continue
+            row, col = position
+            marker = 'W' if self.players[player_id].role == server_pb2.Wolf else 'V'
+            if game.board.get(row, col) != marker:
+                errors.append(f"Board cell {position} is {game.board.get(row, col)!r}, expected {marker!r}")
+        
+        for row in range(self.board_size):
+            for col in range(self.board_size):
+                if not game.board.is_empty(row, col) and (row, col) not in occupancy:
+                    errors.append(f"Board cell {(row, col)} is occupied but not indexed")
+        
+        return errors
 
     def _kill_player(self, player_id: int) -> None:
         """Mark a player as dead."""
         if player_id in self.players:
-            self.players[player_id]["is_alive"] = False
+            player = self.players[player_id]
+            if not player.is_alive:
+                return
+            player.is_alive = False
+            game_id = player.id_game
+            
+            # A dead player no longer occupies its cell
+            game = self.games.get(game_id)
+            if game is not None:
+                self._clear_player(game, player_id, player.position)
+                game.alive_counts[player.role] -= 1
             
             # Update database
-            session = Session()
-            try:
-                player_in_party = session.query(PlayerInParty).filter_by(
-                    id_player=player_id, 
-                    id_party=self.players[player_id]["id_game"]
-                ).first()
-                
-                if player_in_party:
-                    setattr(player_in_party, 'is_alive', False)
-                    session.commit()
-            except SQLAlchemyError as e:
-                session.rollback()
-                logger.error(f"Error updating player status in database: {e}")
-            finally:
-                session.close()
+            self.persistence.kill_player(player_id, game_id)
+            self.event_manager.player_died(game_id, player_id)
+            
+            # Only a death can change the outcome of a game
+            self._check_game_end(game_id)
+
+    def _record_play(self, game_id: int, player_id: int, action: str,
+                     origin: Tuple[int, int], target: Tuple[int, int]) -> None:
+        """Journal a player's action for the round in progress."""
+        self.journal.record_play(game_id, self.games[game_id].round_in_progress, player_id,
+                                 action, origin, target)
+
+    def shutdown(self) -> None:
+        """Write any pending mutations to the database."""
+        self.scheduler.stop()
+        self.evictor.stop()
+        self.event_manager.stop()
+        self.journal.stop()
+        self.persistence.stop()
 
     def _check_game_end(self, game_id: int) -> bool:
         """Check if game has ended and update state accordingly."""
         if game_id not in self.games:
             return False
             
-        return check_game_end(self.games[game_id], self.players)
\ No newline at end of file
+        game = self.games[game_id]
+        round_number = game.round_in_progress
+        if not check_game_end(game):
+            return False
+        self.journal.close_round(game_id, round_number)
+        self.persistence.end_party(game_id, game.winner)
+        self.event_manager.game_ended(game_id, game.winner)
+        return True
\ No newline at end of file
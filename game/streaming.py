@@ -0,0 +1,101 @@
+import asyncio
+import queue
+import threading
+from typing import Any, Dict, Set
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import WATCH_QUEUE_SIZE
+from .patterns.observer import Observer
+
+class Subscription:
+    """
+    A WatchGameboard stream waiting for events of one game.
+    
+    Events are buffered in a bounded queue. A subscriber whose queue is full
+    is too slow to keep up: it is marked as dropped and the hub stops
+    feeding it.
+    """
+    def __init__(self, game_id: int, maxsize: int = WATCH_QUEUE_SIZE):
+        self.game_id = game_id
+        self.maxsize = maxsize
+        self.dropped = False
+        self._queue: "queue.Queue[str]" = queue.Queue(maxsize=maxsize)
+    
+    def offer(self, event_type: str) -> bool:
+        """Queue an event without blocking, return False if the subscriber is full."""
+        try:
+            self._queue.put_nowait(event_type)
+            return True
+        except queue.Full:
+            return False
+    
+    def wait(self, timeout: float) -> bool:
+        """Wait for the next event, return False on timeout."""
+        try:
+            self._queue.get(timeout=timeout)
+            return True
+        except queue.Empty:
+            return False
+
+class AsyncSubscription(Subscription):
+    """Subscription consumed from an asyncio event loop."""
+    def __init__(self, game_id: int, loop: asyncio.AbstractEventLoop, maxsize: int = WATCH_QUEUE_SIZE):
+        super().__init__(game_id, maxsize)
+        self._loop = loop
+        self._async_queue: "asyncio.Queue[str]" = asyncio.Queue(maxsize=maxsize)
+    
+    def offer(self, event_type: str) -> bool:
+        # Events come from RPC threads, the queue belongs to the loop
+        if self._async_queue.qsize() >= self.maxsize:
+            return False
+        self._loop.call_soon_threadsafe(self._put, event_type)
+        return True
+    
+    def _put(self, event_type: str) -> None:
+        try:
+            self._async_queue.put_nowait(event_type)
+        except asyncio.QueueFull:
+            self.dropped = True
+    
+    async def wait_async(self, timeout: float) -> bool:
+        try:
+            await asyncio.wait_for(self._async_queue.get(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+class BoardWatchHub(Observer):
+    """Observer fanning game events out to the subscriptions of that game."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions: Dict[int, Set[Subscription]] = {}
+        self.dropped_subscribers = 0
+    
+    def subscribe(self, subscription: Subscription) -> Subscription:
+        with self._lock:
+            self._subscriptions.setdefault(subscription.game_id, set()).add(subscription)
+        return subscription
+    
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.game_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.game_id]
+    
+    def subscriber_count(self, game_id: int) -> int:
+        with self._lock:
+            return len(self._subscriptions.get(game_id, ()))
+    
+    def update(self, game_id: int, event_type: str, data: Dict[str, Any]) -> None:
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(game_id, ()))
+        for subscription in subscriptions:
+            if not subscription.offer(event_type):
+                subscription.dropped = True
+                self.unsubscribe(subscription)
+                with self._lock:
+                    self.dropped_subscribers += 1
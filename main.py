@@ -1,10 +1,22 @@
+import asyncio
 import time
 import sys
 import os
 from game.server import serve
-from config import logger
+from game.aio_server import serve_async
+from game.launcher import serve_sharded, stop_sharded
+from game.state import GameState
+from config import logger, SERVER_MODE, SERVER_WORKERS
 from db.database import init_db
 
+async def run_async_server():
+    server = await serve_async()
+    try:
+        await server.wait_for_termination()
+    finally:
+        await server.stop(0)
+        GameState().shutdown()
+
 if __name__ == '__main__':
     try:
         retry_count = 0
@@ -26,14 +38,31 @@ if __name__ == '__main__':
             logger.error("Maximum retries reached. Could not connect to the database.")
             sys.exit(1)
         
-        logger.info("Starting game server...")
-        server = serve()
-        
-        try:
-            while True:
-                time.sleep(86400)
-        except KeyboardInterrupt:
-            server.stop(0)
+        if SERVER_WORKERS > 1:
+            logger.info(f"Starting game server ({SERVER_WORKERS} worker processes)...")
+            router, workers = serve_sharded()
+            
+            try:
+                while True:
+                    time.sleep(86400)
+            except KeyboardInterrupt:
+                stop_sharded(router, workers)
+        elif SERVER_MODE == "async":
+            logger.info("Starting game server (async mode)...")
+            try:
+                asyncio.run(run_async_server())
+            except KeyboardInterrupt:
+                pass
+        else:
+            logger.info("Starting game server...")
+            server = serve()
+            
+            try:
+                while True:
+                    time.sleep(86400)
+            except KeyboardInterrupt:
+                server.stop(0).wait()
+                GameState().shutdown()
             
     except Exception as e:
         logger.critical(f"Fatal error: {e}")
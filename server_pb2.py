@@ -24,15 +24,17 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0cserver.proto\"$\n\x08Position\x12\x0b\n\x03row\x18\x01 \x01(\x05\x12\x0b\n\x03\x63ol\x18\x02 \x01(\x05\"(\n\x04Move\x12 \n\rnext_position\x18\x01 \x01(\x0b\x32\t.Position\"\x11\n\x0fGameListRequest\"1\n\rGameListReply\x12\x0e\n\x06status\x18\x01 \x01(\x08\x12\x10\n\x08id_games\x18\x02 \x03(\x05\"7\n\x14GameSubscribeRequest\x12\x0e\n\x06player\x18\x01 \x01(\t\x12\x0f\n\x07id_game\x18\x02 \x01(\x05\"R\n\x12GameSubscribeReply\x12\x0e\n\x06status\x18\x01 \x01(\x08\x12\x19\n\x04role\x18\x02 \x01(\x0e\x32\x0b.PlayerRole\x12\x11\n\tid_player\x18\x03 \x01(\x05\":\n\x14GetGameStatusRequest\x12\x0f\n\x07id_game\x18\x01 \x01(\x05\x12\x11\n\tid_player\x18\x02 \x01(\x05\"o\n\x12GetGameStatusReply\x12\x0e\n\x06status\x18\x01 \x01(\x08\x12\x0f\n\x07started\x18\x02 \x01(\x08\x12\x19\n\x11round_in_progress\x18\x03 \x01(\x05\x12\x0e\n\x06winner\x18\x04 \x01(\t\x12\r\n\x05\x61live\x18\x05 \x01(\x08\"@\n\x19GetGameboardStatusRequest\x12\x10\n\x08id_party\x18\x01 \x01(\x05\x12\x11\n\tid_player\x18\x02 \x01(\x05\"@\n\x17GetGameboardStatusReply\x12\x0e\n\x06status\x18\x01 \x01(\x08\x12\x15\n\rvisible_cells\x18\x02 \x01(\t\"@\n\x0bMoveRequest\x12\x10\n\x08id_party\x18\x01 \x01(\x05\x12\x11\n\tid_player\x18\x02 \x01(\x05\x12\x0c\n\x04move\x18\x03 \x01(\t\"N\n\x0cMoveResponse\x12\x0e\n\x06status\x18\x01 \x01(\x08\x12\x19\n\x11round_in_progress\x18\x02 \x01(\x05\x12\x13\n\x04move\x18\x03 \x01(\x0b\x32\x05.Move\"\x13\n\x11\x43reateGameRequest\"M\n\x12\x43reateGameResponse\x12\x0f\n\x07game_id\x18\x01 \x01(\t\x12\x0f\n\x07success\x18\x02 \x01(\x08\x12\x15\n\rerror_message\x18\x03 \x01(\t*$\n\nPlayerRole\x12\x0c\n\x08Villager\x10\x00\x12\x08\n\x04Wolf\x10\x01\x32\xe8\x02\n\nGameServer\x12.\n\x08GameList\x12\x10.GameListRequest\x1a\x0e.GameListReply\"\x00\x12=\n\rGameSubscribe\x12\x15.GameSubscribeRequest\x1a\x13.GameSubscribeReply\"\x00\x12=\n\rGetGameStatus\x12\x15.GetGameStatusRequest\x1a\x13.GetGameStatusReply\"\x00\x12L\n\x12GetGameboardStatus\x12\x1a.GetGameboardStatusRequest\x1a\x18.GetGameboardStatusReply\"\x00\x12%\n\x04Move\x12\x0c.MoveRequest\x1a\r.MoveResponse\"\x00\x12\x37\n\nCreateGame\x12\x12.CreateGameRequest\x1a\x13.CreateGameResponse\"\x00\x62\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0cserver.proto\"$\n\x08Position\x12\x0b\n\x03row\x18\x01 \x01(\x05\x12\x0b\n\x03\x63ol\x18\x02 \x01(\x05\"(\n\x04Move\x12 \n\rnext_position\x18\x01 \x01(\x0b\x32\t.Position\"\x11\n\x0fGameListRequest\"1\n\rGameListReply\x12\x0e\n\x06status\x18\x01 \x01(\x08\x12\x10\n\x08id_games\x18\x02 \x03(\x05\"7\n\x14GameSubscribeRequest\x12\x0e\n\x06player\x18\x01 \x01(\t\x12\x0f\n\x07id_game\x18\x02 \x01(\x05\"R\n\x12GameSubscribeReply\x12\x0e\n\x06status\x18\x01 \x01(\x08\x12\x19\n\x04role\x18\x02 \x01(\x0e\x32\x0b.PlayerRole\x12\x11\n\tid_player\x18\x03 \x01(\x05\"=\n\x19GameSubscribePartyRequest\x12\x0f\n\x07id_game\x18\x01 \x01(\x05\x12\x0f\n\x07players\x18\x02 \x03(\t\"O\n\x17GameSubscribePartyReply\x12\x0e\n\x06status\x18\x01 \x01(\x08\x12$\n\x07players\x18\x02 \x03(\x0b\x32\x13.GameSubscribeReply\":\n\x14GetGameStatusRequest\x12\x0f\n\x07id_game\x18\x01 \x01(\x05\x12\x11\n\tid_player\x18\x02 \x01(\x05\"o\n\x12GetGameStatusReply\x12\x0e\n\x06status\x18\x01 \x01(\x08\x12\x0f\n\x07started\x18\x02 \x01(\x08\x12\x19\n\x11round_in_progress\x18\x03 \x01(\x05\x12\x0e\n\x06winner\x18\x04 \x01(\t\x12\r\n\x05\x61live\x18\x05 \x01(\x08\"@\n\x19GetGameboardStatusRequest\x12\x10\n\x08id_party\x18\x01 \x01(\x05\x12\x11\n\tid_player\x18\x02 \x01(\x05\"@\n\x17GetGameboardStatusReply\x12\x0e\n\x06status\x18\x01 \x01(\x08\x12\x15\n\rvisible_cells\x18\x02 \x01(\t\"5\n\nCellChange\x12\x0b\n\x03row\x18\x01 \x01(\x05\x12\x0b\n\x03\x63ol\x18\x02 \x01(\x05\x12\r\n\x05value\x18\x03 \x01(\t\"V\n\x18GetGameboardDeltaRequest\x12\x10\n\x08id_party\x18\x01 \x01(\x05\x12\x11\n\tid_player\x18\x02 \x01(\x05\x12\x15\n\rsince_version\x18\x03 \x01(\x03\"|\n\x16GetGameboardDeltaReply\x12\x0e\n\x06status\x18\x01 \x01(\x08\x12\x0f\n\x07version\x18\x02 \x01(\x03\x12\x0c\n\x04\x66ull\x18\x03 \x01(\x08\x12\x15\n\rvisible_cells\x18\x04 \x01(\t\x12\x1c\n\x07\x63hanges\x18\x05 \x03(\x0b\x32\x0b.CellChange\"<\n\x15WatchGameboardRequest\x12\x10\n\x08id_party\x18\x01 \x01(\x05\x12\x11\n\tid_player\x18\x02 \x01(\x05\"\x87\x01\n\x13WatchGameboardReply\x12\x0e\n\x06status\x18\x01 \x01(\x08\x12\x15\n\rvisible_cells\x18\x02 \x01(\t\x12\x0f\n\x07started\x18\x03 \x01(\x08\x12\x19\n\x11round_in_progress\x18\x04 \x01(\x05\x12\x0e\n\x06winner\x18\x05 \x01(\t\x12\r\n\x05\x61live\x18\x06 \x01(\x08\"@\n\x0bMoveRequest\x12\x10\n\x08id_party\x18\x01 \x01(\x05\x12\x11\n\tid_player\x18\x02 \x01(\x05\x12\x0c\n\x04move\x18\x03 \x01(\t\"N\n\x0cMoveResponse\x12\x0e\n\x06status\x18\x01 \x01(\x08\x12\x19\n\x11round_in_progress\x18\x02 \x01(\x05\x12\x13\n\x04move\x18\x03 \x01(\x0b\x32\x05.Move\"1\n\x0fMoveStreamReply\x12\x1e\n\x07results\x18\x01 \x03(\x0b\x32\r.MoveResponse\"\x17\n\x15GetServerStatsRequest\"\xc3\x01\n\x0bMethodStats\x12\x0e\n\x06method\x18\x01 \x01(\t\x12\r\n\x05\x63\x61lls\x18\x02 \x01(\x04\x12\x0e\n\x06\x65rrors\x18\x03 \x01(\x04\x12\x11\n\tin_flight\x18\x04 \x01(\x05\x12\x1b\n\x13latency_seconds_sum\x18\x05 \x01(\x01\x12\x13\n\x0blatency_p50\x18\x06 \x01(\x01\x12\x13\n\x0blatency_p95\x18\x07 \x01(\x01\x12\x13\n\x0blatency_p99\x18\x08 \x01(\x01\x12\x16\n\x0e\x64\x62_seconds_sum\x18\t \x01(\x01\"\xa5\x01\n\x13GetServerStatsReply\x12\x0e\n\x06status\x18\x01 \x01(\x08\x12\x1d\n\x07methods\x18\x02 \x03(\x0b\x32\x0c.MethodStats\x12\x30\n\x06gauges\x18\x03 \x03(\x0b\x32 .GetServerStatsReply.GaugesEntry\x1a-\n\x0bGaugesEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x01:\x02\x38\x01\"\x13\n\x11\x43reateGameRequest\"M\n\x12\x43reateGameResponse\x12\x0f\n\x07game_id\x18\x01 \x01(\t\x12\x0f\n\x07success\x18\x02 \x01(\x08\x12\x15\n\rerror_message\x18\x03 \x01(\t*$\n\nPlayerRole\x12\x0c\n\x08Villager\x10\x00\x12\x08\n\x04Wolf\x10\x01\x32\xb9\x05\n\nGameServer\x12.\n\x08GameList\x12\x10.GameListRequest\x1a\x0e.GameListReply\"\x00\x12=\n\rGameSubscribe\x12\x15.GameSubscribeRequest\x1a\x13.GameSubscribeReply\"\x00\x12L\n\x12GameSubscribeParty\x12\x1a.GameSubscribePartyRequest\x1a\x18.GameSubscribePartyReply\"\x00\x12=\n\rGetGameStatus\x12\x15.GetGameStatusRequest\x1a\x13.GetGameStatusReply\"\x00\x12L\n\x12GetGameboardStatus\x12\x1a.GetGameboardStatusRequest\x1a\x18.GetGameboardStatusReply\"\x00\x12%\n\x04Move\x12\x0c.MoveRequest\x1a\r.MoveResponse\"\x00\x12\x37\n\nCreateGame\x12\x12.CreateGameRequest\x1a\x13.CreateGameResponse\"\x00\x12\x42\n\x0eWatchGameboard\x12\x16.WatchGameboardRequest\x1a\x14.WatchGameboardReply\"\x00\x30\x01\x12I\n\x11GetGameboardDelta\x12\x19.GetGameboardDeltaRequest\x1a\x17.GetGameboardDeltaReply\"\x00\x12\x30\n\nMoveStream\x12\x0c.MoveRequest\x1a\x10.MoveStreamReply\"\x00(\x01\x12@\n\x0eGetServerStats\x12\x16.GetServerStatsRequest\x1a\x14.GetServerStatsReply\"\x00\x62\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'server_pb2', _globals)
 if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
-  _globals['_PLAYERROLE']._serialized_start=858
-  _globals['_PLAYERROLE']._serialized_end=894
+  _globals['_GETSERVERSTATSREPLY_GAUGESENTRY']._loaded_options = None
+  _globals['_GETSERVERSTATSREPLY_GAUGESENTRY']._serialized_options = b'8\001'
+  _globals['_PLAYERROLE']._serialized_start=1913
+  _globals['_PLAYERROLE']._serialized_end=1949
   _globals['_POSITION']._serialized_start=16
   _globals['_POSITION']._serialized_end=52
   _globals['_MOVE']._serialized_start=54
@@ -45,22 +47,46 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['_GAMESUBSCRIBEREQUEST']._serialized_end=221
   _globals['_GAMESUBSCRIBEREPLY']._serialized_start=223
   _globals['_GAMESUBSCRIBEREPLY']._serialized_end=305
-  _globals['_GETGAMESTATUSREQUEST']._serialized_start=307
-  _globals['_GETGAMESTATUSREQUEST']._serialized_end=365
-  _globals['_GETGAMESTATUSREPLY']._serialized_start=367
-  _globals['_GETGAMESTATUSREPLY']._serialized_end=478
-  _globals['_GETGAMEBOARDSTATUSREQUEST']._serialized_start=480
-  _globals['_GETGAMEBOARDSTATUSREQUEST']._serialized_end=544
-  _globals['_GETGAMEBOARDSTATUSREPLY']._serialized_start=546
-  _globals['_GETGAMEBOARDSTATUSREPLY']._serialized_end=610
-  _globals['_MOVEREQUEST']._serialized_start=612
-  _globals['_MOVEREQUEST']._serialized_end=676
-  _globals['_MOVERESPONSE']._serialized_start=678
-  _globals['_MOVERESPONSE']._serialized_end=756
-  _globals['_CREATEGAMEREQUEST']._serialized_start=758
-  _globals['_CREATEGAMEREQUEST']._serialized_end=777
-  _globals['_CREATEGAMERESPONSE']._serialized_start=779
-  _globals['_CREATEGAMERESPONSE']._serialized_end=856
-  _globals['_GAMESERVER']._serialized_start=897
-  _globals['_GAMESERVER']._serialized_end=1257
+  _globals['_GAMESUBSCRIBEPARTYREQUEST']._serialized_start=307
+  _globals['_GAMESUBSCRIBEPARTYREQUEST']._serialized_end=368
+  _globals['_GAMESUBSCRIBEPARTYREPLY']._serialized_start=370
+  _globals['_GAMESUBSCRIBEPARTYREPLY']._serialized_end=449
+  _globals['_GETGAMESTATUSREQUEST']._serialized_start=451
+  _globals['_GETGAMESTATUSREQUEST']._serialized_end=509
+  _globals['_GETGAMESTATUSREPLY']._serialized_start=511
+  _globals['_GETGAMESTATUSREPLY']._serialized_end=622
+  _globals['_GETGAMEBOARDSTATUSREQUEST']._serialized_start=624
+  _globals['_GETGAMEBOARDSTATUSREQUEST']._serialized_end=688
+  _globals['_GETGAMEBOARDSTATUSREPLY']._serialized_start=690
+  _globals['_GETGAMEBOARDSTATUSREPLY']._serialized_end=754
+  _globals['_CELLCHANGE']._serialized_start=756
+  _globals['_CELLCHANGE']._serialized_end=809
+  _globals['_GETGAMEBOARDDELTAREQUEST']._serialized_start=811
+  _globals['_GETGAMEBOARDDELTAREQUEST']._serialized_end=897
+  _globals['_GETGAMEBOARDDELTAREPLY']._serialized_start=899
+  _globals['_GETGAMEBOARDDELTAREPLY']._serialized_end=1023
+  _globals['_WATCHGAMEBOARDREQUEST']._serialized_start=1025
+  _globals['_WATCHGAMEBOARDREQUEST']._serialized_end=1085
+  _globals['_WATCHGAMEBOARDREPLY']._serialized_start=1088
+  _globals['_WATCHGAMEBOARDREPLY']._serialized_end=1223
+  _globals['_MOVEREQUEST']._serialized_start=1225
+  _globals['_MOVEREQUEST']._serialized_end=1289
+  _globals['_MOVERESPONSE']._serialized_start=1291
+  _globals['_MOVERESPONSE']._serialized_end=1369
+  _globals['_MOVESTREAMREPLY']._serialized_start=1371
+  _globals['_MOVESTREAMREPLY']._serialized_end=1420
+  _globals['_GETSERVERSTATSREQUEST']._serialized_start=1422
+  _globals['_GETSERVERSTATSREQUEST']._serialized_end=1445
+  _globals['_METHODSTATS']._serialized_start=1448
+  _globals['_METHODSTATS']._serialized_end=1643
+  _globals['_GETSERVERSTATSREPLY']._serialized_start=1646
+  _globals['_GETSERVERSTATSREPLY']._serialized_end=1811
+  _globals['_GETSERVERSTATSREPLY_GAUGESENTRY']._serialized_start=1766
+  _globals['_GETSERVERSTATSREPLY_GAUGESENTRY']._serialized_end=1811
+  _globals['_CREATEGAMEREQUEST']._serialized_start=1813
+  _globals['_CREATEGAMEREQUEST']._serialized_end=1832
+  _globals['_CREATEGAMERESPONSE']._serialized_start=1834
+  _globals['_CREATEGAMERESPONSE']._serialized_end=1911
+  _globals['_GAMESERVER']._serialized_start=1952
+  _globals['_GAMESERVER']._serialized_end=2649
 # @@protoc_insertion_point(module_scope)
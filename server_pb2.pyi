@@ -57,6 +57,22 @@ class GameSubscribeReply(_message.Message):
     id_player: int
     def __init__(self, status: bool = ..., role: _Optional[_Union[PlayerRole, str]] = ..., id_player: _Optional[int] = ...) -> None: ...
 
+class GameSubscribePartyRequest(_message.Message):
+    __slots__ = ("id_game", "players")
+    ID_GAME_FIELD_NUMBER: _ClassVar[int]
+    PLAYERS_FIELD_NUMBER: _ClassVar[int]
+    id_game: int
+    players: _containers.RepeatedScalarFieldContainer[str]
+    def __init__(self, id_game: _Optional[int] = ..., players: _Optional[_Iterable[str]] = ...) -> None: ...
+
+class GameSubscribePartyReply(_message.Message):
+    __slots__ = ("status", "players")
+    STATUS_FIELD_NUMBER: _ClassVar[int]
+    PLAYERS_FIELD_NUMBER: _ClassVar[int]
+    status: bool
+    players: _containers.RepeatedCompositeFieldContainer[GameSubscribeReply]
+    def __init__(self, status: bool = ..., players: _Optional[_Iterable[_Union[GameSubscribeReply, _Mapping]]] = ...) -> None: ...
+
 class GetGameStatusRequest(_message.Message):
     __slots__ = ("id_game", "id_player")
     ID_GAME_FIELD_NUMBER: _ClassVar[int]
@@ -95,6 +111,64 @@ class GetGameboardStatusReply(_message.Message):
     visible_cells: str
     def __init__(self, status: bool = ..., visible_cells: _Optional[str] = ...) -> None: ...
 
+class CellChange(_message.Message):
+    __slots__ = ("row", "col", "value")
+    ROW_FIELD_NUMBER: _ClassVar[int]
+    COL_FIELD_NUMBER: _ClassVar[int]
+    VALUE_FIELD_NUMBER: _ClassVar[int]
+    row: int
+    col: int
+    value: str
+    def __init__(self, row: _Optional[int] = ..., col: _Optional[int] = ..., value: _Optional[str] = ...) -> None: ...
+
+class GetGameboardDeltaRequest(_message.Message):
+    __slots__ = ("id_party", "id_player", "since_version")
+    ID_PARTY_FIELD_NUMBER: _ClassVar[int]
+    ID_PLAYER_FIELD_NUMBER: _ClassVar[int]
+    SINCE_VERSION_FIELD_NUMBER: _ClassVar[int]
+    id_party: int
+    id_player: int
+    since_version: int
+    def __init__(self, id_party: _Optional[int] = ..., id_player: _Optional[int] = ..., since_version: _Optional[int] = ...) -> None: ...
+
+class GetGameboardDeltaReply(_message.Message):
+    __slots__ = ("status", "version", "full", "visible_cells", "changes")
+    STATUS_FIELD_NUMBER: _ClassVar[int]
+    VERSION_FIELD_NUMBER: _ClassVar[int]
+    FULL_FIELD_NUMBER: _ClassVar[int]
+    VISIBLE_CELLS_FIELD_NUMBER: _ClassVar[int]
+    CHANGES_FIELD_NUMBER: _ClassVar[int]
+    status: bool
+    version: int
+    full: bool
+    visible_cells: str
+    changes: _containers.RepeatedCompositeFieldContainer[CellChange]
+    def __init__(self, status: bool = ..., version: _Optional[int] = ..., full: bool = ..., visible_cells: _Optional[str] = ..., changes: _Optional[_Iterable[_Union[CellChange, _Mapping]]] = ...) -> None: ...
+
+class WatchGameboardRequest(_message.Message):
+    __slots__ = ("id_party", "id_player")
+    ID_PARTY_FIELD_NUMBER: _ClassVar[int]
+    ID_PLAYER_FIELD_NUMBER: _ClassVar[int]
+    id_party: int
+    id_player: int
+    def __init__(self, id_party: _Optional[int] = ..., id_player: _Optional[int] = ...) -> None: ...
+
+class WatchGameboardReply(_message.Message):
+    __slots__ = ("status", "visible_cells", "started", "round_in_progress", "winner", "alive")
+    STATUS_FIELD_NUMBER: _ClassVar[int]
+    VISIBLE_CELLS_FIELD_NUMBER: _ClassVar[int]
+    STARTED_FIELD_NUMBER: _ClassVar[int]
+    ROUND_IN_PROGRESS_FIELD_NUMBER: _ClassVar[int]
+    WINNER_FIELD_NUMBER: _ClassVar[int]
+    ALIVE_FIELD_NUMBER: _ClassVar[int]
+    status: bool
+    visible_cells: str
+    started: bool
+    round_in_progress: int
+    winner: str
+    alive: bool
+    def __init__(self, status: bool = ..., visible_cells: _Optional[str] = ..., started: bool = ..., round_in_progress: _Optional[int] = ..., winner: _Optional[str] = ..., alive: bool = ...) -> None: ...
+
 class MoveRequest(_message.Message):
     __slots__ = ("id_party", "id_player", "move")
     ID_PARTY_FIELD_NUMBER: _ClassVar[int]
@@ -115,6 +189,55 @@ class MoveResponse(_message.Message):
     move: Move
     def __init__(self, status: bool = ..., round_in_progress: _Optional[int] = ..., move: _Optional[_Union[Move, _Mapping]] = ...) -> None: ...
 
+class MoveStreamReply(_message.Message):
+    __slots__ = ("results",)
+    RESULTS_FIELD_NUMBER: _ClassVar[int]
+    results: _containers.RepeatedCompositeFieldContainer[MoveResponse]
+    def __init__(self, results: _Optional[_Iterable[_Union[MoveResponse, _Mapping]]] = ...) -> None: ...
+
+class GetServerStatsRequest(_message.Message):
+    __slots__ = ()
+    def __init__(self) -> None: ...
+
+class MethodStats(_message.Message):
+    __slots__ = ("method", "calls", "errors", "in_flight", "latency_seconds_sum", "latency_p50", "latency_p95", "latency_p99", "db_seconds_sum")
+    METHOD_FIELD_NUMBER: _ClassVar[int]
+    CALLS_FIELD_NUMBER: _ClassVar[int]
+    ERRORS_FIELD_NUMBER: _ClassVar[int]
+    IN_FLIGHT_FIELD_NUMBER: _ClassVar[int]
+    LATENCY_SECONDS_SUM_FIELD_NUMBER: _ClassVar[int]
+    LATENCY_P50_FIELD_NUMBER: _ClassVar[int]
+    LATENCY_P95_FIELD_NUMBER: _ClassVar[int]
+    LATENCY_P99_FIELD_NUMBER: _ClassVar[int]
+    DB_SECONDS_SUM_FIELD_NUMBER: _ClassVar[int]
+    method: str
+    calls: int
+    errors: int
+    in_flight: int
+    latency_seconds_sum: float
+    latency_p50: float
+    latency_p95: float
+    latency_p99: float
+    db_seconds_sum: float
+    def __init__(self, method: _Optional[str] = ..., calls: _Optional[int] = ..., errors: _Optional[int] = ..., in_flight: _Optional[int] = ..., latency_seconds_sum: _Optional[float] = ..., latency_p50: _Optional[float] = ..., latency_p95: _Optional[float] = ..., latency_p99: _Optional[float] = ..., db_seconds_sum: _Optional[float] = ...) -> None: ...
+
+class GetServerStatsReply(_message.Message):
+    __slots__ = ("status", "methods", "gauges")
+    class GaugesEntry(_message.Message):
+        __slots__ = ("key", "value")
+        KEY_FIELD_NUMBER: _ClassVar[int]
+        VALUE_FIELD_NUMBER: _ClassVar[int]
+        key: str
+        value: float
+        def __init__(self, key: _Optional[str] = ..., value: _Optional[float] = ...) -> None: ...
+    STATUS_FIELD_NUMBER: _ClassVar[int]
+    METHODS_FIELD_NUMBER: _ClassVar[int]
+    GAUGES_FIELD_NUMBER: _ClassVar[int]
+    status: bool
+    methods: _containers.RepeatedCompositeFieldContainer[MethodStats]
+    gauges: _containers.ScalarMap[str, float]
+    def __init__(self, status: bool = ..., methods: _Optional[_Iterable[_Union[MethodStats, _Mapping]]] = ..., gauges: _Optional[_Mapping[str, float]] = ...) -> None: ...
+
 class CreateGameRequest(_message.Message):
     __slots__ = ()
     def __init__(self) -> None: ...
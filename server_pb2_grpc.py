@@ -44,6 +44,11 @@ class GameServerStub(object):
                 request_serializer=server__pb2.GameSubscribeRequest.SerializeToString,
                 response_deserializer=server__pb2.GameSubscribeReply.FromString,
                 _registered_method=True)
+        self.GameSubscribeParty = channel.unary_unary(
+                '/GameServer/GameSubscribeParty',
+                request_serializer=server__pb2.GameSubscribePartyRequest.SerializeToString,
+                response_deserializer=server__pb2.GameSubscribePartyReply.FromString,
+                _registered_method=True)
         self.GetGameStatus = channel.unary_unary(
                 '/GameServer/GetGameStatus',
                 request_serializer=server__pb2.GetGameStatusRequest.SerializeToString,
@@ -64,6 +69,26 @@ class GameServerStub(object):
                 request_serializer=server__pb2.CreateGameRequest.SerializeToString,
                 response_deserializer=server__pb2.CreateGameResponse.FromString,
                 _registered_method=True)
+        self.WatchGameboard = channel.unary_stream(
+                '/GameServer/WatchGameboard',
+                request_serializer=server__pb2.WatchGameboardRequest.SerializeToString,
+                response_deserializer=server__pb2.WatchGameboardReply.FromString,
+                _registered_method=True)
+        self.GetGameboardDelta = channel.unary_unary(
+                '/GameServer/GetGameboardDelta',
+                request_serializer=server__pb2.GetGameboardDeltaRequest.SerializeToString,
+                response_deserializer=server__pb2.GetGameboardDeltaReply.FromString,
+                _registered_method=True)
+        self.MoveStream = channel.stream_unary(
+                '/GameServer/MoveStream',
+                request_serializer=server__pb2.MoveRequest.SerializeToString,
+                response_deserializer=server__pb2.MoveStreamReply.FromString,
+                _registered_method=True)
+        self.GetServerStats = channel.unary_unary(
+                '/GameServer/GetServerStats',
+                request_serializer=server__pb2.GetServerStatsRequest.SerializeToString,
+                response_deserializer=server__pb2.GetServerStatsReply.FromString,
+                _registered_method=True)
 
 
 class GameServerServicer(object):
@@ -81,6 +106,12 @@ class GameServerServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def GameSubscribeParty(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def GetGameStatus(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
@@ -105,6 +136,30 @@ class GameServerServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def WatchGameboard(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetGameboardDelta(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def MoveStream(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetServerStats(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_GameServerServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -118,6 +173,11 @@ def add_GameServerServicer_to_server(servicer, server):
                     request_deserializer=server__pb2.GameSubscribeRequest.FromString,
                     response_serializer=server__pb2.GameSubscribeReply.SerializeToString,
             ),
+            'GameSubscribeParty': grpc.unary_unary_rpc_method_handler(
+                    servicer.GameSubscribeParty,
+                    request_deserializer=server__pb2.GameSubscribePartyRequest.FromString,
+                    response_serializer=server__pb2.GameSubscribePartyReply.SerializeToString,
+            ),
             'GetGameStatus': grpc.unary_unary_rpc_method_handler(
                     servicer.GetGameStatus,
                     request_deserializer=server__pb2.GetGameStatusRequest.FromString,
@@ -138,6 +198,26 @@ def add_GameServerServicer_to_server(servicer, server):
                     request_deserializer=server__pb2.CreateGameRequest.FromString,
                     response_serializer=server__pb2.CreateGameResponse.SerializeToString,
             ),
+            'WatchGameboard': grpc.unary_stream_rpc_method_handler(
+                    servicer.WatchGameboard,
+                    request_deserializer=server__pb2.WatchGameboardRequest.FromString,
+                    response_serializer=server__pb2.WatchGameboardReply.SerializeToString,
+            ),
+            'GetGameboardDelta': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetGameboardDelta,
+                    request_deserializer=server__pb2.GetGameboardDeltaRequest.FromString,
+                    response_serializer=server__pb2.GetGameboardDeltaReply.SerializeToString,
+            ),
+            'MoveStream': grpc.stream_unary_rpc_method_handler(
+                    servicer.MoveStream,
+                    request_deserializer=server__pb2.MoveRequest.FromString,
+                    response_serializer=server__pb2.MoveStreamReply.SerializeToString,
+            ),
+            'GetServerStats': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetServerStats,
+                    request_deserializer=server__pb2.GetServerStatsRequest.FromString,
+                    response_serializer=server__pb2.GetServerStatsReply.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'GameServer', rpc_method_handlers)
@@ -203,6 +283,33 @@ class GameServer(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def GameSubscribeParty(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/GameServer/GameSubscribeParty',
+            server__pb2.GameSubscribePartyRequest.SerializeToString,
+            server__pb2.GameSubscribePartyReply.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def GetGameStatus(request,
             target,
@@ -310,3 +417,111 @@ class GameServer(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def WatchGameboard(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/GameServer/WatchGameboard',
+            server__pb2.WatchGameboardRequest.SerializeToString,
+            server__pb2.WatchGameboardReply.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetGameboardDelta(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/GameServer/GetGameboardDelta',
+            server__pb2.GetGameboardDeltaRequest.SerializeToString,
+            server__pb2.GetGameboardDeltaReply.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def MoveStream(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_unary(
+            request_iterator,
+            target,
+            '/GameServer/MoveStream',
+            server__pb2.MoveRequest.SerializeToString,
+            server__pb2.MoveStreamReply.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetServerStats(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/GameServer/GetServerStats',
+            server__pb2.GetServerStatsRequest.SerializeToString,
+            server__pb2.GetServerStatsReply.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
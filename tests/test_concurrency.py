@@ -0,0 +1,219 @@
+import unittest
+import sys, os
+import logging
+import random
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from sqlalchemy import create_engine
+from db.database import Base, Session
+from config import MAX_PLAYERS_PER_GAME
+from game.state import GameState
+from game.patterns.command import MoveCommand
+from game.patterns.observer import Observer, AsyncGameEventManager, LoggingObserver
+import server_pb2
+
+THREADS = 16
+
+class ConcurrencyStressTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        fd, cls.db_path = tempfile.mkstemp(suffix=".sqlite")
+        os.close(fd)
+        cls.engine = create_engine(f"sqlite:///{cls.db_path}", connect_args={"timeout": 30})
+        Base.metadata.create_all(cls.engine)
+        Session.remove()
+        Session.configure(bind=cls.engine)
+        cls.game_state = GameState()
+
+    @classmethod
+    def tearDownClass(cls):
+        Session.remove()
+        cls.engine.dispose()
+        os.remove(cls.db_path)
+
+    def _assert_game_invariants(self, game_id):
+        game = self.game_state.games[game_id]
+        self.assertLessEqual(len(game.players), MAX_PLAYERS_PER_GAME)
+        self.assertEqual(len(game.players), len(set(game.players)))
+        roles = [self.game_state.players[p].role for p in game.players]
+        if roles:
+            self.assertEqual(roles.count(server_pb2.Wolf), 1)
+        self.assertEqual(self.game_state.check_occupancy_index(game_id), [])
+
+    def test_many_threads_join_one_game(self):
+        game_id = self.game_state.create_new_game()
+        with ThreadPoolExecutor(max_workers=THREADS) as pool:
+            results = list(pool.map(lambda i: self.game_state.add_player_to_game(f"P{i}", game_id),
+                                    range(MAX_PLAYERS_PER_GAME * 4)))
+        
+        joined = [player_id for player_id, _ in results if player_id is not None]
+        self.assertEqual(len(joined), MAX_PLAYERS_PER_GAME)
+        self.assertEqual(sorted(joined), sorted(self.game_state.games[game_id].players))
+        self._assert_game_invariants(game_id)
+
+    def test_many_threads_create_and_join_many_games(self):
+        with ThreadPoolExecutor(max_workers=THREADS) as pool:
+            game_ids = list(pool.map(lambda _: self.game_state.create_new_game(), range(THREADS * 4)))
+        self.assertEqual(len(game_ids), len(set(game_ids)))
+        
+        rng = random.Random(7)
+        targets = [rng.choice(game_ids) for _ in range(len(game_ids) * 4)]
+        with ThreadPoolExecutor(max_workers=THREADS) as pool:
+            results = list(pool.map(lambda g: self.game_state.add_player_to_game("P", g), targets))
+        
+        player_ids = [player_id for player_id, _ in results if player_id is not None]
+        self.assertEqual(len(player_ids), len(set(player_ids)))
+        for game_id in game_ids:
+            self._assert_game_invariants(game_id)
+
+    def test_concurrent_moves_keep_board_consistent(self):
+        game_ids = [self.game_state.create_new_game() for _ in range(4)]
+        for game_id in game_ids:
+            for i in range(MAX_PLAYERS_PER_GAME):
+                self.game_state.add_player_to_game(f"P{i}", game_id)
+            game = self.game_state.games[game_id]
+            game.started = True
+            game.round_in_progress = 1
+        
+        moves = ["00", "01", "10", "11"]
+        
+        def hammer(seed):
+            rng = random.Random(seed)
+            for _ in range(200):
+                game_id = rng.choice(game_ids)
+                player_id = rng.choice(self.game_state.games[game_id].players)
+                MoveCommand(self.game_state, game_id, player_id, rng.choice(moves)).execute()
+        
+        threads = [threading.Thread(target=hammer, args=(seed,)) for seed in range(THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        for game_id in game_ids:
+            self.assertEqual(self.game_state.check_occupancy_index(game_id), [])
+
+class GatedRecorder(Observer):
+    """Records the batches it receives; the first delivery waits for ``release``."""
+    def __init__(self):
+        self.batches = []
+        self.threads = set()
+        self.entered = threading.Event()
+        self.release = threading.Event()
+    
+    def update_batch(self, events):
+        self.entered.set()
+        self.release.wait(5)
+        self.threads.add(threading.current_thread().name)
+        self.batches.append([data["n"] for _, _, data in events])
+
+class AsyncEventManagerTest(unittest.TestCase):
+    def _publish(self, manager, numbers):
+        for n in numbers:
+            manager.notify(1, "player_moved", {"n": n})
+    
+    def _stalled(self, manager, recorder):
+        # The worker is held in the first delivery, the next events pile up
+        self._publish(manager, [0])
+        self.assertTrue(recorder.entered.wait(5))
+    
+    def test_events_are_delivered_in_batches_off_the_caller_thread(self):
+        manager = AsyncGameEventManager(workers=1, queue_size=100, batch_size=10)
+        recorder = GatedRecorder()
+        manager.attach(recorder)
+        self._stalled(manager, recorder)
+        self._publish(manager, range(1, 26))
+        recorder.release.set()
+        manager.stop()
+        
+        self.assertEqual(recorder.batches, [[0], list(range(1, 11)), list(range(11, 21)), list(range(21, 26))])
+        self.assertNotIn(threading.current_thread().name, recorder.threads)
+        stats = manager.stats()
+        self.assertEqual((stats["delivered"], stats["dropped"], stats["queue_depth"]), (26, 0, 0))
+        self.assertGreater(stats["max_lag_seconds"], 0)
+    
+    def test_drop_policies(self):
+        for policy, kept in [("drop_oldest", [6, 7, 8, 9]), ("drop_newest", [1, 2, 3, 4])]:
+            with self.subTest(policy=policy):
+                manager = AsyncGameEventManager(workers=1, queue_size=4, drop_policy=policy)
+                recorder = GatedRecorder()
+                manager.attach(recorder)
+                self._stalled(manager, recorder)
+                self._publish(manager, range(1, 10))
+                self.assertEqual(manager.stats()["queue_depth"], 4)
+                self.assertGreater(manager.stats()["lag_seconds"], 0)
+                recorder.release.set()
+                manager.stop()
+                self.assertEqual(sum(recorder.batches, []), [0] + kept)
+                self.assertEqual(manager.stats()["dropped"], 5)
+    
+    def test_block_policy_waits_for_the_observer(self):
+        manager = AsyncGameEventManager(workers=1, queue_size=2, drop_policy="block")
+        recorder = GatedRecorder()
+        manager.attach(recorder)
+        self._stalled(manager, recorder)
+        publisher = threading.Thread(target=self._publish, args=(manager, range(1, 6)))
+        publisher.start()
+        publisher.join(0.2)
+        self.assertTrue(publisher.is_alive())
+        recorder.release.set()
+        publisher.join(5)
+        manager.stop()
+        self.assertEqual(sum(recorder.batches, []), list(range(6)))
+        stats = manager.stats()["observers"]["GatedRecorder"]
+        self.assertEqual(stats["dropped"], 0)
+        self.assertGreater(stats["blocked_seconds"], 0)
+    
+    def test_slow_or_failing_observer_does_not_hold_back_the_others(self):
+        class Failing(Observer):
+            def update(self, game_id, event_type, data):
+                raise RuntimeError("broken observer")
+        
+        manager = AsyncGameEventManager(workers=2, queue_size=100)
+        slow, fast = GatedRecorder(), GatedRecorder()
+        fast.release.set()
+        manager.attach(slow)
+        manager.attach(fast)
+        manager.attach(Failing(), drop_policy="drop_newest")
+        self._stalled(manager, slow)
+        self._publish(manager, range(1, 4))
+        for _ in range(100):
+            if sum(fast.batches, []) == [0, 1, 2, 3]:
+                break
+            threading.Event().wait(0.01)
+        self.assertEqual(sum(fast.batches, []), [0, 1, 2, 3])
+        self.assertEqual(slow.batches, [])
+        slow.release.set()
+        manager.stop()
+        self.assertEqual(sum(slow.batches, []), [0, 1, 2, 3])
+        self.assertEqual(manager.stats()["observers"]["Failing"]["failed"], 4)
+    
+    def test_logging_observer_formats_only_when_enabled(self):
+        class Counted:
+            formatted = 0
+            def __repr__(self):
+                Counted.formatted += 1
+                return "counted"
+        
+        logger = logging.getLogger("test_events")
+        logger.addHandler(logging.NullHandler())
+        logger.setLevel(logging.WARNING)
+        observer = LoggingObserver(logger)
+        observer.update(1, "player_moved", {"data": Counted()})
+        observer.update_batch([(1, "player_moved", {"data": Counted()})])
+        self.assertEqual(Counted.formatted, 0)
+        
+        records = []
+        handler = logging.Handler()
+        handler.emit = lambda record: records.append(record.getMessage())
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        observer.update_batch([(1, "player_moved", {"data": Counted()})])
+        self.assertEqual(records, ["Game 1 event: player_moved - {'data': counted}"])
+        logger.removeHandler(handler)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,16 +3,20 @@ import sys, os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from game.rules.movement import validate_move, process_move
-from game.rules.win_condition import check_game_winner
+from game.rules.win_condition import check_game_winner, winner_from_counts
+from game.patterns.observer import Observer
+import random
 from game.state import GameState
 import server_pb2
 
 class GameRulesTests(unittest.TestCase):
     def setUp(self):
         from sqlalchemy import create_engine
+        from sqlalchemy.pool import StaticPool
         from db.database import Base, Session
-        engine = create_engine('sqlite:///:memory:')
+        engine = create_engine('sqlite://', poolclass=StaticPool, connect_args={'check_same_thread': False})
         Base.metadata.create_all(engine)
+        Session.remove()
         Session.configure(bind=engine)
         
         self.game_state = GameState()
@@ -23,12 +27,12 @@ class GameRulesTests(unittest.TestCase):
         # Get player's current position
         assert self.player_id is not None 
         player = self.game_state.players[self.player_id]
-        curr_row, curr_col = player["position"]
+        curr_row, curr_col = player.position
         
         # Set game as started with a valid round
         game = self.game_state.games[self.game_id]
-        game["started"] = True
-        game["round_in_progress"] = 1
+        game.started = True
+        game.round_in_progress = 1
         
         # Test valid move
         is_valid, new_position = validate_move(game, player, "01", self.game_state.board_size)
@@ -36,9 +40,311 @@ class GameRulesTests(unittest.TestCase):
         self.assertEqual(new_position, (curr_row, curr_col + 1))
         
         # Test invalid move (off board)
-        player["position"] = (0, 0)
+        player.position = (0, 0)
         is_valid, new_position = validate_move(game, player, "-10", self.game_state.board_size)
         self.assertFalse(is_valid)
 
+    def _start_game(self):
+        game = self.game_state.games[self.game_id]
+        game.started = True
+        game.round_in_progress = 1
+        return game
+
+    def _put(self, player_id, position):
+        game = self.game_state.games[self.game_id]
+        player = self.game_state.players[player_id]
+        self.game_state._clear_player(game, player_id, player.position)
+        player.position = position
+        self.game_state._place_player(game, player_id, position)
+
+    def test_occupancy_index_follows_moves(self):
+        self._start_game()
+        self._put(self.player_id, (5, 5))
+        self.assertEqual(self.game_state._find_player_at_position(self.game_id, (5, 5)), self.player_id)
+        
+        success, _ = process_move(self.game_state, self.game_id, self.player_id, "01")
+        self.assertTrue(success)
+        self.assertIsNone(self.game_state._find_player_at_position(self.game_id, (5, 5)))
+        self.assertEqual(self.game_state._find_player_at_position(self.game_id, (5, 6)), self.player_id)
+        self.assertEqual(self.game_state.check_occupancy_index(self.game_id), [])
+
+    def test_occupancy_index_on_kill(self):
+        self._start_game()
+        villager_id, role = self.game_state.add_player_to_game("Villager", self.game_id)
+        self.assertEqual(role, server_pb2.Villager)
+        self._put(self.player_id, (2, 2))
+        self._put(villager_id, (2, 3))
+        
+        success, _ = process_move(self.game_state, self.game_id, self.player_id, "01")
+        self.assertTrue(success)
+        self.assertFalse(self.game_state.players[villager_id].is_alive)
+        self.assertEqual(self.game_state._find_player_at_position(self.game_id, (2, 3)), self.player_id)
+        self.assertEqual(self.game_state.check_occupancy_index(self.game_id), [])
+
+    def test_move_command_undo_restores_index(self):
+        from game.patterns.command import MoveCommand
+        self._start_game()
+        self._put(self.player_id, (4, 4))
+        
+        command = MoveCommand(self.game_state, self.game_id, self.player_id, "10")
+        success, _ = command.execute()
+        self.assertTrue(success)
+        success, _ = command.undo()
+        self.assertTrue(success)
+        self.assertEqual(self.game_state._find_player_at_position(self.game_id, (4, 4)), self.player_id)
+        self.assertIsNone(self.game_state._find_player_at_position(self.game_id, (5, 4)))
+        self.assertEqual(self.game_state.check_occupancy_index(self.game_id), [])
+
+    def test_game_ended_fires_when_last_wolf_dies(self):
+        class Recorder(Observer):
+            def __init__(self):
+                self.events = []
+            def update(self, game_id, event_type, data):
+                self.events.append((game_id, event_type, data))
+        
+        recorder = Recorder()
+        self.game_state.event_manager.attach(recorder)
+        try:
+            self.game_state.add_player_to_game("Villager", self.game_id)
+            self.game_state._kill_player(self.player_id)
+            self.game_state.event_manager.flush()
+        finally:
+            self.game_state.event_manager.detach(recorder)
+        
+        ended = [data for game_id, event_type, data in recorder.events
+                 if game_id == self.game_id and event_type == 'game_ended']
+        self.assertEqual([data['winner'] for data in ended], ["Villagers"])
+        self.assertEqual(self.game_state.get_game_winner(self.game_id), "Villagers")
+
+    def _apply_delta(self, view, delta):
+        version, full, visible_cells, changes = delta
+        if full:
+            return visible_cells
+        cells = list(view)
+        size = self.game_state.board_size
+        for row, col, value in changes:
+            cells[row * size + col] = value
+        return "".join(cells)
+
+    def test_board_delta_reconstructs_visible_cells(self):
+        self._start_game()
+        villager_id, _ = self.game_state.add_player_to_game("Villager", self.game_id)
+        self._put(self.player_id, (0, 0))
+        self._put(villager_id, (7, 7))
+        
+        version, full, wolf_view, _ = self.game_state.get_board_delta(self.game_id, self.player_id, -1)
+        self.assertTrue(full)
+        _, _, villager_view, _ = self.game_state.get_board_delta(self.game_id, villager_id, -1)
+        
+        # The wolf moving is a two-cell delta for the wolf, outside the villager's window
+        process_move(self.game_state, self.game_id, self.player_id, "11")
+        delta = self.game_state.get_board_delta(self.game_id, self.player_id, version)
+        self.assertFalse(delta[1])
+        self.assertEqual(sorted(delta[3]), [(0, 0, '0'), (1, 1, 'W')])
+        wolf_view = self._apply_delta(wolf_view, delta)
+        self.assertEqual(wolf_view, self.game_state.get_visible_cells(self.game_id, self.player_id))
+        
+        delta = self.game_state.get_board_delta(self.game_id, villager_id, version)
+        self.assertFalse(delta[1])
+        self.assertEqual(sorted(delta[3]), [(0, 0, 'X'), (1, 1, 'X')])
+        self.assertEqual(self._apply_delta(villager_view, delta),
+                         self.game_state.get_visible_cells(self.game_id, villager_id))
+        
+        # Nothing changed since the latest version
+        self.assertEqual(self.game_state.get_board_delta(self.game_id, self.player_id, delta[0])[3], [])
+        
+        # A player whose own window moved gets a full snapshot
+        process_move(self.game_state, self.game_id, villager_id, "10")
+        self.assertTrue(self.game_state.get_board_delta(self.game_id, villager_id, delta[0])[1])
+
+    def test_board_delta_falls_back_to_snapshot_when_log_is_exceeded(self):
+        self._start_game()
+        game = self.game_state.games[self.game_id]
+        old_version = game.board.version
+        for _ in range(game.changes.maxlen):
+            self._put(self.player_id, (0, 0))
+            self._put(self.player_id, (0, 1))
+        self.assertTrue(self.game_state.get_board_delta(self.game_id, self.player_id, old_version)[1])
+
+class BoardTests(unittest.TestCase):
+    def test_flat_board_accessors(self):
+        from game.models.board import Board
+        board = Board(4)
+        self.assertTrue(board.is_empty(3, 2))
+        board.set(3, 2, 'W')
+        self.assertEqual(board.get(3, 2), 'W')
+        self.assertEqual(board.row(3), "  W ")
+        self.assertEqual(len(board.cells), 16)
+        board.clear(3, 2)
+        self.assertTrue(board.is_empty(3, 2))
+
+    def test_rendering_matches_cell_by_cell_view(self):
+        from game.models.board import Board
+        rng = random.Random(3)
+        for size in (1, 5, 12):
+            board = Board(size)
+            for _ in range(size):
+                board.set(rng.randrange(size), rng.randrange(size), rng.choice("WV"))
+            cells = lambda r, c: board.get(r, c) if not board.is_empty(r, c) else '0'
+            
+            self.assertEqual(board.render(), "".join(cells(r, c) for r in range(size) for c in range(size)))
+            for center in [(0, 0), (size - 1, size - 1), (size // 2, size // 3)]:
+                expected = "".join(cells(r, c) if max(abs(r - center[0]), abs(c - center[1])) <= 2 else 'X'
+                                   for r in range(size) for c in range(size))
+                self.assertEqual(board.render_window(center, 2), expected)
+
+    def test_random_free_cell_only_returns_empty_cells(self):
+        from game.models.board import Board
+        rng = random.Random(11)
+        board = Board(3)
+        seen = set()
+        while board.free_count():
+            for _ in range(20):
+                row, col = board.random_free_cell(rng)
+                self.assertTrue(board.is_empty(row, col))
+            row, col = board.random_free_cell(rng)
+            seen.add((row, col))
+            board.set(row, col, 'V')
+        self.assertEqual(len(seen), 9)
+        self.assertIsNone(board.random_free_cell(rng))
+        
+        board.clear(1, 1)
+        self.assertEqual(board.random_free_cell(rng), (1, 1))
+
+    def test_render_cache_follows_version(self):
+        from game.models.board import Board
+        board = Board(3)
+        first = board.render()
+        self.assertIs(board.render(), first)
+        board.set(1, 1, 'W')
+        self.assertEqual(board.render(), "0000W0000")
+
+class AliveCountersPropertyTests(unittest.TestCase):
+    """Random join/kill sequences: the O(1) counters must agree with a full recount."""
+    def setUp(self):
+        from sqlalchemy import create_engine
+        from sqlalchemy.pool import StaticPool
+        from db.database import Base, Session
+        engine = create_engine('sqlite://', poolclass=StaticPool, connect_args={'check_same_thread': False})
+        Base.metadata.create_all(engine)
+        Session.remove()
+        Session.configure(bind=engine)
+        self.game_state = GameState()
+        
+    def _recount(self, game):
+        counts = {server_pb2.Wolf: 0, server_pb2.Villager: 0}
+        for player_id in game.players:
+            player = self.game_state.players[player_id]
+            if player.is_alive:
+                counts[player.role] += 1
+        return counts
+        
+    def test_counters_match_full_recount(self):
+        for seed in range(50):
+            rng = random.Random(seed)
+            game_id = self.game_state.create_new_game()
+            game = self.game_state.games[game_id]
+            for _ in range(rng.randint(1, 30)):
+                if game.winner is not None:
+                    break
+                alive = [p for p in game.players if self.game_state.players[p].is_alive]
+                if alive and rng.random() < 0.4:
+                    self.game_state._kill_player(rng.choice(alive))
+                else:
+                    self.game_state.add_player_to_game("P", game_id)
+                
+                with self.subTest(seed=seed):
+                    self.assertEqual(game.alive_counts, self._recount(game))
+                    if game.players:
+                        self.assertEqual(winner_from_counts(game.alive_counts),
+                                         check_game_winner(game, self.game_state.players))
+            
+            # Once decided, the stored winner is the one a recount gives
+            if game.winner is not None:
+                self.assertEqual(game.winner, check_game_winner(game, self.game_state.players))
+
+class RoundSchedulerTests(unittest.TestCase):
+    def setUp(self):
+        from sqlalchemy import create_engine
+        from sqlalchemy.pool import StaticPool
+        from db.database import Base, Session
+        from game.scheduler import RoundScheduler
+        engine = create_engine('sqlite://', poolclass=StaticPool, connect_args={'check_same_thread': False})
+        Base.metadata.create_all(engine)
+        Session.remove()
+        Session.configure(bind=engine)
+        self.game_state = GameState()
+        
+        # A scheduler of our own, driven by hand
+        previous = self.game_state.scheduler
+        self.scheduler = RoundScheduler(self.game_state, lobby_timeout=10, round_duration=5, tick=1)
+        self.game_state.scheduler = self.scheduler
+        self.addCleanup(setattr, self.game_state, "scheduler", previous)
+        self.now = self.scheduler.wheel.origin
+        
+        self.game_id = self.game_state.create_new_game()
+        self.wolf_id, _ = self.game_state.add_player_to_game("Wolf", self.game_id)
+        self.villager_id, _ = self.game_state.add_player_to_game("Villager", self.game_id)
+        self.game = self.game_state.games[self.game_id]
+    
+    def _put(self, player_id, position):
+        player = self.game_state.players[player_id]
+        self.game_state._clear_player(self.game, player_id, player.position)
+        player.position = position
+        self.game_state._place_player(self.game, player_id, position)
+    
+    def test_timer_wheel_fires_in_due_order(self):
+        from game.scheduler import TimerWheel
+        wheel = TimerWheel(tick=1, slots=4, now=0)
+        wheel.schedule(3, "c")
+        wheel.schedule(1, "a")
+        wheel.schedule(9, "late")
+        wheel.schedule(2, "b")
+        self.assertEqual(wheel.advance(0.5), [])
+        self.assertEqual(wheel.advance(3), ["a", "b", "c"])
+        # More than a turn of the wheel at once
+        self.assertEqual(wheel.advance(20), ["late"])
+    
+    def test_game_starts_after_lobby_timeout(self):
+        self.scheduler.run_due(self.now + 9)
+        self.assertFalse(self.game.started)
+        self.scheduler.run_due(self.now + 10)
+        self.assertTrue(self.game.started)
+        self.assertEqual(self.game.round_in_progress, 1)
+    
+    def test_full_game_starts_immediately(self):
+        for i in range(6):
+            self.game_state.add_player_to_game(f"Villager {i}", self.game_id)
+        self.assertTrue(self.game.started)
+    
+    def test_moves_wait_for_the_round_to_resolve(self):
+        self.scheduler.start_game(self.game)
+        self._put(self.wolf_id, (0, 0))
+        self._put(self.villager_id, (5, 5))
+        
+        self.assertEqual(self.scheduler.submit_move(self.game_id, self.wolf_id, "01"), (1, (0, 1)))
+        self.assertEqual(self.game_state.players[self.wolf_id].position, (0, 0))
+        self.assertIsNone(self.scheduler.submit_move(self.game_id, self.wolf_id, "up"))
+        
+        # The round ends at its deadline even if the villager did not move
+        self.scheduler.run_due(self.now + 5)
+        self.assertEqual(self.game_state.players[self.wolf_id].position, (0, 1))
+        self.assertEqual(self.game.round_in_progress, 2)
+        self.assertEqual(self.game.pending_moves, {})
+    
+    def test_round_resolves_early_in_player_order(self):
+        self.scheduler.start_game(self.game)
+        self._put(self.wolf_id, (2, 2))
+        self._put(self.villager_id, (1, 3))
+        
+        # Both head for (2, 3): the wolf has the lower ID, moves first and the villager walks into it
+        self.scheduler.submit_move(self.game_id, self.villager_id, "10")
+        self.assertEqual(self.game.round_in_progress, 1)
+        self.scheduler.submit_move(self.game_id, self.wolf_id, "01")
+        
+        self.assertFalse(self.game_state.players[self.villager_id].is_alive)
+        self.assertEqual(self.game_state.players[self.wolf_id].position, (2, 3))
+        self.assertEqual(self.game.winner, "Wolves")
+
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()
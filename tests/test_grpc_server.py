@@ -5,7 +5,10 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import server_pb2
 import server_pb2_grpc
+from config import MAX_PLAYERS_PER_GAME
 from game.server import serve
+from game.state import GameState
+from game.aio_server import serve_async
 import threading
 import time
 import collections.abc
@@ -53,5 +56,255 @@ class GrpcServerTest(unittest.TestCase):
         # First player should be Wolf
         self.assertEqual(join_response.role, server_pb2.Wolf)
 
+    def test_subscribe_party(self):
+        game_id = int(self.stub.CreateGame(server_pb2.CreateGameRequest()).game_id)
+        reply = self.stub.GameSubscribeParty(server_pb2.GameSubscribePartyRequest(
+            id_game=game_id, players=[f"Bot {i}" for i in range(MAX_PLAYERS_PER_GAME + 1)]))
+        self.assertTrue(reply.status)
+        self.assertEqual(len(reply.players), MAX_PLAYERS_PER_GAME)
+        self.assertEqual(reply.players[0].role, server_pb2.Wolf)
+        self.assertEqual(len({player.id_player for player in reply.players}), MAX_PLAYERS_PER_GAME)
+        
+    def test_watch_gameboard_pushes_changes(self):
+        game_id = int(self.stub.CreateGame(server_pb2.CreateGameRequest()).game_id)
+        wolf = self.stub.GameSubscribe(server_pb2.GameSubscribeRequest(player="Wolf", id_game=game_id))
+        
+        stream = self.stub.WatchGameboard(
+            server_pb2.WatchGameboardRequest(id_party=game_id, id_player=wolf.id_player))
+        try:
+            first = next(stream)
+            self.assertTrue(first.status)
+            self.assertEqual(first.visible_cells.count('W'), 1)
+            
+            self.stub.GameSubscribe(server_pb2.GameSubscribeRequest(player="Villager", id_game=game_id))
+            second = next(stream)
+            self.assertEqual(second.visible_cells.count('V'), 1)
+        finally:
+            stream.cancel()
+        
+    def test_watch_gameboard_rejects_unknown_player(self):
+        replies = list(self.stub.WatchGameboard(
+            server_pb2.WatchGameboardRequest(id_party=-1, id_player=-1)))
+        self.assertEqual(len(replies), 1)
+        self.assertFalse(replies[0].status)
+
+    def test_move_stream_answers_in_order(self):
+        game_id = int(self.stub.CreateGame(server_pb2.CreateGameRequest()).game_id)
+        player_ids = [self.stub.GameSubscribe(server_pb2.GameSubscribeRequest(player=f"P{i}", id_game=game_id)).id_player
+                      for i in range(MAX_PLAYERS_PER_GAME)]
+        
+        # The server runs in this process, pick a move that stays on the board for each player
+        game_state = GameState()
+        last = game_state.board_size - 1
+        moves = []
+        for player_id in player_ids:
+            row, col = game_state.players[player_id].position
+            moves.append("01" if col < last else "10" if row < last else "00")
+        requests = [server_pb2.MoveRequest(id_party=game_id, id_player=p, move=m) for p, m in zip(player_ids, moves)]
+        requests.insert(3, server_pb2.MoveRequest(id_party=game_id, id_player=-1, move="01"))
+        
+        reply = self.stub.MoveStream(iter(requests))
+        self.assertEqual(len(reply.results), len(requests))
+        self.assertFalse(reply.results[3].status)
+        for request, result in zip(requests, reply.results):
+            if request.id_player != -1:
+                self.assertTrue(result.status)
+                self.assertEqual(result.round_in_progress, 1)
+        
+        # Every player moved, the round is over
+        status = self.stub.GetGameStatus(server_pb2.GetGameStatusRequest(id_game=game_id, id_player=player_ids[0]))
+        self.assertEqual(status.round_in_progress, 2)
+    
+    def test_server_stats_count_calls(self):
+        before = {m.method: m.calls for m in self.stub.GetServerStats(server_pb2.GetServerStatsRequest()).methods}
+        self.stub.CreateGame(server_pb2.CreateGameRequest())
+        
+        stats = self.stub.GetServerStats(server_pb2.GetServerStatsRequest())
+        self.assertTrue(stats.status)
+        methods = {m.method: m for m in stats.methods}
+        self.assertEqual(methods["CreateGame"].calls, before.get("CreateGame", 0) + 1)
+        self.assertEqual(methods["GetServerStats"].in_flight, 1)
+        self.assertIn("game_games_in_memory", stats.gauges)
+
+class ServerMetricsTest(unittest.TestCase):
+    def test_histogram_quantiles(self):
+        from game.metrics import Histogram
+        histogram = Histogram((1.0, 2.0, 4.0))
+        for value in (0.5, 1.5, 1.5, 3.0):
+            histogram.observe(value)
+        self.assertEqual(histogram.quantile(0.25), 1.0)
+        self.assertEqual(histogram.quantile(0.5), 1.5)
+        self.assertEqual(histogram.quantile(1.0), 4.0)
+        self.assertEqual(Histogram().quantile(0.99), 0.0)
+    
+    def test_prometheus_text(self):
+        from game.metrics import ServerMetrics
+        metrics = ServerMetrics()
+        metrics.add_gauge("game_games_in_memory", "Games held in memory.", lambda: 3)
+        metrics.end(metrics.begin("Move"), failed=False)
+        metrics.end(metrics.begin("Move"), failed=True)
+        
+        text = metrics.render_prometheus()
+        self.assertIn('grpc_server_handling_seconds_bucket{method="Move",le="+Inf"} 2', text)
+        self.assertIn('grpc_server_errors_total{method="Move"} 1', text)
+        self.assertIn('grpc_server_in_flight{method="Move"} 0', text)
+        self.assertIn("game_games_in_memory 3.0", text)
+
+    def test_failed_statements_leave_nothing_on_the_connection(self):
+        from sqlalchemy import create_engine, text
+        from sqlalchemy.exc import OperationalError
+        from game.metrics import install_db_timing, _db_time
+        install_db_timing()
+        engine = create_engine("sqlite://")
+        spent = [0.0]
+        token = _db_time.set(spent)
+        try:
+            with engine.connect() as connection:
+                for _ in range(3):
+                    with self.assertRaises(OperationalError):
+                        connection.execute(text("SELECT * FROM missing"))
+                connection.execute(text("SELECT 1"))
+                self.assertEqual(dict(connection.info), {})
+        finally:
+            _db_time.reset(token)
+            engine.dispose()
+        self.assertGreater(spent[0], 0)
+
+class BoardWatchHubTest(unittest.TestCase):
+    def test_slow_subscriber_is_dropped(self):
+        from game.streaming import BoardWatchHub, Subscription
+        hub = BoardWatchHub()
+        slow = hub.subscribe(Subscription(1, maxsize=2))
+        other_game = hub.subscribe(Subscription(2, maxsize=2))
+        
+        for _ in range(3):
+            hub.update(1, 'player_moved', {})
+        
+        self.assertTrue(slow.dropped)
+        self.assertFalse(other_game.dropped)
+        self.assertEqual(hub.subscriber_count(1), 0)
+        self.assertEqual(hub.subscriber_count(2), 1)
+        self.assertEqual(hub.dropped_subscribers, 1)
+
+class ShardWorker(server_pb2_grpc.GameServerServicer):
+    """Stand-in for a game worker that owns the game IDs equal to ``index`` modulo 2."""
+    def __init__(self, index):
+        self.index = index
+        self.created = 0
+        self.down = False
+    
+    def GameList(self, request, context):
+        if self.down:
+            context.abort(grpc.StatusCode.UNAVAILABLE, "worker down")
+        return server_pb2.GameListReply(status=True, id_games=[self.index + 2, self.index + 4])
+    
+    def CreateGame(self, request, context):
+        self.created += 1
+        return server_pb2.CreateGameResponse(game_id=str(self.index + 2 * self.created), success=True)
+    
+    def GetGameStatus(self, request, context):
+        return server_pb2.GetGameStatusReply(status=request.id_game % 2 == self.index, round_in_progress=self.index)
+    
+    def MoveStream(self, request_iterator, context):
+        return server_pb2.MoveStreamReply(results=[
+            server_pb2.MoveResponse(status=request.id_party % 2 == self.index, round_in_progress=request.id_player)
+            for request in request_iterator])
+
+class GameRouterTest(unittest.TestCase):
+    def setUp(self):
+        from concurrent import futures
+        from game.router import serve_router
+        self.workers = []
+        self.shards = [ShardWorker(0), ShardWorker(1)]
+        for index, port in enumerate((9992, 9993)):
+            worker = grpc.server(futures.ThreadPoolExecutor(max_workers=4))
+            server_pb2_grpc.add_GameServerServicer_to_server(self.shards[index], worker)
+            worker.add_insecure_port(f'[::]:{port}')
+            worker.start()
+            self.workers.append(worker)
+        self.router = serve_router(["localhost:9992", "localhost:9993"], 9994)
+        self.channel = grpc.insecure_channel('localhost:9994')
+        self.stub = server_pb2_grpc.GameServerStub(self.channel)
+    
+    def tearDown(self):
+        self.channel.close()
+        self.router.stop(0)
+        for worker in self.workers:
+            worker.stop(0)
+    
+    def test_requests_reach_the_owning_worker(self):
+        self.assertEqual(list(self.stub.GameList(server_pb2.GameListRequest()).id_games), [2, 3, 4, 5])
+        created = [int(self.stub.CreateGame(server_pb2.CreateGameRequest()).game_id) for _ in range(4)]
+        self.assertEqual(sorted(game_id % 2 for game_id in created), [0, 0, 1, 1])
+        
+        for game_id in (6, 7):
+            reply = self.stub.GetGameStatus(server_pb2.GetGameStatusRequest(id_game=game_id, id_player=1))
+            self.assertTrue(reply.status)
+            self.assertEqual(reply.round_in_progress, game_id % 2)
+        
+        requests = [server_pb2.MoveRequest(id_party=game_id, id_player=i, move="01")
+                    for i, game_id in enumerate([3, 2, 5, 5, 4])]
+        results = self.stub.MoveStream(iter(requests)).results
+        self.assertEqual([result.round_in_progress for result in results], [0, 1, 2, 3, 4])
+        self.assertTrue(all(result.status for result in results))
+    
+    def test_game_list_skips_a_worker_that_is_down(self):
+        self.shards[1].down = True
+        self.assertEqual(list(self.stub.GameList(server_pb2.GameListRequest()).id_games), [2, 4])
+        self.shards[0].down = True
+        with self.assertRaises(grpc.RpcError) as raised:
+            self.stub.GameList(server_pb2.GameListRequest())
+        self.assertEqual(raised.exception.code(), grpc.StatusCode.UNAVAILABLE)
+    
+    def test_shards_allocate_disjoint_ids(self):
+        game_state = GameState()
+        self.addCleanup(game_state.set_shard, 0, 1)
+        allocated = set()
+        for index in range(3):
+            game_state.set_shard(index, 3)
+            ids = [game_state._allocate_game_id() for _ in range(5)]
+            self.assertTrue(all(game_id % 3 == index for game_id in ids))
+            self.assertTrue(game_state.owns_game(ids[0]))
+            self.assertFalse(game_state.owns_game(ids[0] + 1))
+            allocated.update(ids)
+        self.assertEqual(len(allocated), 15)
+
+class AsyncGrpcServerTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.server = await serve_async(9991)
+        self.channel = grpc.aio.insecure_channel('localhost:9991')
+        self.stub = server_pb2_grpc.GameServerStub(self.channel)
+        
+    async def asyncTearDown(self):
+        await self.channel.close()
+        await self.server.stop(0)
+        
+    async def test_create_and_join_game(self):
+        create_response = await self.stub.CreateGame(server_pb2.CreateGameRequest())
+        self.assertTrue(create_response.success)
+        game_id = int(create_response.game_id)
+        
+        join_response = await self.stub.GameSubscribe(
+            server_pb2.GameSubscribeRequest(player="TestPlayer", id_game=game_id))
+        self.assertTrue(join_response.status)
+        self.assertEqual(join_response.role, server_pb2.Wolf)
+        
+        list_response = await self.stub.GameList(server_pb2.GameListRequest())
+        self.assertIn(game_id, list_response.id_games)
+        
+    async def test_watch_gameboard_pushes_changes(self):
+        game_id = int((await self.stub.CreateGame(server_pb2.CreateGameRequest())).game_id)
+        wolf = await self.stub.GameSubscribe(server_pb2.GameSubscribeRequest(player="Wolf", id_game=game_id))
+        
+        stream = self.stub.WatchGameboard(
+            server_pb2.WatchGameboardRequest(id_party=game_id, id_player=wolf.id_player))
+        first = await stream.read()
+        self.assertEqual(first.visible_cells.count('W'), 1)
+        
+        await self.stub.GameSubscribe(server_pb2.GameSubscribeRequest(player="Villager", id_game=game_id))
+        second = await stream.read()
+        self.assertEqual(second.visible_cells.count('V'), 1)
+        stream.cancel()
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,321 @@
+import unittest
+import sys, os
+import tempfile
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from sqlalchemy import create_engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.orm import sessionmaker
+from db.database import Base
+from db.models import Party, Player, PlayerInParty, Turn, PlayerPlay
+from db.persistence import SyncPersistence, WriteBehindPersistence, coalesce_operations
+from db.journal import MoveJournal
+import server_pb2
+
+class WriteBehindPersistenceTest(unittest.TestCase):
+    def setUp(self):
+        fd, self.db_path = tempfile.mkstemp(suffix=".sqlite")
+        os.close(fd)
+        self.engine = create_engine(f"sqlite:///{self.db_path}")
+        Base.metadata.create_all(self.engine)
+        self.session_factory = sessionmaker(bind=self.engine)
+        
+    def tearDown(self):
+        self.engine.dispose()
+        os.remove(self.db_path)
+        
+    def _alive(self, game_id, player_id):
+        session = self.session_factory()
+        try:
+            return session.get(PlayerInParty, (game_id, player_id)).is_alive
+        finally:
+            session.close()
+        
+    def test_operations_are_written_in_submission_order(self):
+        # One operation per batch so every step is its own transaction
+        persistence = WriteBehindPersistence(self.session_factory, batch_size=1, flush_interval=0)
+        persistence.create_party(1, "Game 1")
+        persistence.add_player(1, "Wolf", 1, server_pb2.Wolf)
+        persistence.add_player(2, "Villager", 1, server_pb2.Villager)
+        persistence.kill_player(2, 1)
+        persistence.end_party(1, "Wolves")
+        persistence.stop()
+        
+        self.assertTrue(self._alive(1, 1))
+        self.assertFalse(self._alive(1, 2))
+        session = self.session_factory()
+        try:
+            self.assertEqual(session.get(Party, 1).winner, "Wolves")
+        finally:
+            session.close()
+        self.assertEqual(persistence.stats()["failed"], 0)
+        
+    def test_sync_batch_writes_on_exit(self):
+        persistence = SyncPersistence(self.session_factory)
+        persistence.create_party(1, "Game 1")
+        persistence.add_player(1, "Villager", 1, server_pb2.Villager)
+        with persistence.batch():
+            persistence.kill_player(1, 1)
+            with persistence.batch():
+                persistence.end_party(1, "Wolves")
+            self.assertTrue(self._alive(1, 1))
+        
+        self.assertFalse(self._alive(1, 1))
+        session = self.session_factory()
+        try:
+            self.assertEqual(session.get(Party, 1).winner, "Wolves")
+        finally:
+            session.close()
+        
+    def test_unit_of_work_checks_out_one_connection(self):
+        from sqlalchemy import event
+        from db.database import RequestSession, create_pooled_engine, unit_of_work, pool_stats
+        engine = create_pooled_engine(f"sqlite:///{self.db_path}", pool_size=2, max_overflow=0)
+        checkouts = []
+        event.listen(engine, "checkout", lambda *args: checkouts.append(1))
+        persistence = SyncPersistence(sessionmaker(bind=engine, class_=RequestSession))
+        
+        with unit_of_work():
+            persistence.create_party(1, "Game 1")
+            persistence.add_player(1, "Wolf", 1, server_pb2.Wolf)
+            self.assertEqual(pool_stats(engine)["checked_out"], 1)
+        
+        self.assertEqual(len(checkouts), 1)
+        self.assertEqual(pool_stats(engine)["checked_out"], 0)
+        self.assertTrue(self._alive(1, 1))
+        engine.dispose()
+        
+    def test_streams_do_not_hold_a_unit_of_work(self):
+        import grpc
+        from db.database import _current_unit
+        from game.interceptors import UnitOfWorkInterceptor
+        seen = []
+        
+        def unary(request, context):
+            seen.append(_current_unit.get() is not None)
+        
+        def stream(request, context):
+            seen.append(_current_unit.get() is not None)
+            yield request
+        
+        interceptor = UnitOfWorkInterceptor()
+        details = type("Details", (), {"method": "/GameServer/Method"})()
+        stream_handler = grpc.unary_stream_rpc_method_handler(stream)
+        self.assertIs(interceptor.intercept_service(lambda _: stream_handler, details), stream_handler)
+        list(stream_handler.unary_stream(None, None))
+        interceptor.intercept_service(lambda _: grpc.unary_unary_rpc_method_handler(unary), details).unary_unary(None, None)
+        self.assertEqual(seen, [False, True])
+        
+    def test_joins_are_upserted_together(self):
+        persistence = SyncPersistence(self.session_factory)
+        persistence.create_party(1, "Game 1")
+        with persistence.batch():
+            persistence.add_players(1, [(1, "Wolf", server_pb2.Wolf), (2, "Villager", server_pb2.Villager)])
+            persistence.kill_player(2, 1)
+        # The same joins again, as after a retried batch: already there, nothing fails
+        persistence.add_players(1, [(1, "Wolf", server_pb2.Wolf), (2, "Villager", server_pb2.Villager)])
+        
+        self.assertTrue(self._alive(1, 1))
+        self.assertFalse(self._alive(1, 2))
+        session = self.session_factory()
+        try:
+            self.assertEqual(session.query(Player).count(), 2)
+            self.assertEqual(session.query(PlayerInParty).count(), 2)
+        finally:
+            session.close()
+        
+    def test_graceful_stop_flushes_queued_writes(self):
+        # A long flush interval keeps everything queued until stop()
+        persistence = WriteBehindPersistence(self.session_factory, batch_size=1000, flush_interval=60)
+        persistence.create_party(1, "Game 1")
+        for player_id in range(1, 51):
+            persistence.add_player(player_id, f"P{player_id}", 1, server_pb2.Villager)
+        persistence.stop()
+        
+        session = self.session_factory()
+        try:
+            self.assertEqual(session.query(Party).count(), 1)
+            self.assertEqual(session.query(Player).count(), 50)
+            self.assertEqual(session.query(PlayerInParty).count(), 50)
+        finally:
+            session.close()
+        self.assertRaises(RuntimeError, persistence.add_player, 99, "Late", 1, server_pb2.Villager)
+        
+    def test_full_queue_applies_backpressure(self):
+        release = threading.Event()
+        
+        def slow_session():
+            release.wait()
+            return self.session_factory()
+        
+        persistence = WriteBehindPersistence(slow_session, queue_size=2, batch_size=1, flush_interval=0)
+        producer = threading.Thread(target=lambda: [persistence.create_party(i, f"Game {i}") for i in range(1, 6)])
+        producer.start()
+        producer.join(0.3)
+        self.assertTrue(producer.is_alive())
+        
+        release.set()
+        producer.join()
+        persistence.stop()
+        self.assertGreater(persistence.stats()["backpressure_waits"], 0)
+        session = self.session_factory()
+        try:
+            self.assertEqual(session.query(Party).count(), 5)
+        finally:
+            session.close()
+        
+    def test_kill_is_folded_into_pending_join(self):
+        operations = coalesce_operations([
+            ("add_player", {"id_player": 1, "name": "P", "id_party": 1, "id_role": 0, "is_alive": True}),
+            ("kill_player", {"id_player": 1, "id_party": 1}),
+            ("kill_player", {"id_player": 1, "id_party": 1}),
+        ])
+        self.assertEqual(len(operations), 1)
+        self.assertFalse(operations[0][1]["is_alive"])
+
+class MoveJournalTest(unittest.TestCase):
+    def setUp(self):
+        # Shared by the journal's writer thread
+        self.engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+        Base.metadata.create_all(self.engine)
+        self.session_factory = sessionmaker(bind=self.engine)
+        
+    def _play_two_rounds(self, journal):
+        journal.record_play(1, 1, 10, "move", (0, 0), (0, 1))
+        journal.record_play(1, 1, 11, "move", (5, 5), (6, 5))
+        # A second action in the same round replaces the first one
+        journal.record_play(1, 1, 10, "kill", (0, 1), (1, 1))
+        journal.record_play(1, 2, 10, "move", (1, 1), (1, 2))
+        
+    def test_flush_strategies_write_turns_and_plays(self):
+        for strategy in ("orm", "executemany", "values"):
+            with self.subTest(strategy=strategy):
+                for table in reversed(Base.metadata.sorted_tables):
+                    with self.engine.begin() as connection:
+                        connection.execute(table.delete())
+                journal = MoveJournal(self.session_factory, strategy=strategy, batch_size=100, flush_interval=60)
+                self._play_two_rounds(journal)
+                self.assertEqual(journal.pending(), 3)
+                self.assertEqual(journal.flush(), 3)
+                
+                session = self.session_factory()
+                try:
+                    turns = session.query(Turn).order_by(Turn.id_turn).all()
+                    self.assertEqual(len(turns), 2)
+                    # Round 1 was closed when round 2 started
+                    self.assertIsNotNone(turns[0].end_time)
+                    self.assertIsNone(turns[1].end_time)
+                    kill = session.get(PlayerPlay, (10, turns[0].id_turn))
+                    self.assertEqual(kill.action, "kill")
+                    self.assertEqual((kill.target_position_row, kill.target_position_col), (1, 1))
+                    self.assertEqual(session.query(PlayerPlay).count(), 3)
+                finally:
+                    session.close()
+                
+    def test_close_round_updates_turn_after_flush(self):
+        journal = MoveJournal(self.session_factory, strategy="executemany", batch_size=100, flush_interval=60)
+        journal.record_play(1, 1, 10, "move", (0, 0), (0, 1))
+        journal.flush()
+        journal.close_round(1, 1)
+        journal.flush()
+        
+        session = self.session_factory()
+        try:
+            self.assertIsNotNone(session.query(Turn).one().end_time)
+        finally:
+            session.close()
+        
+    def _wait_for_plays(self, count):
+        session = self.session_factory()
+        try:
+            for _ in range(200):
+                if session.query(PlayerPlay).count() == count:
+                    break
+                session.rollback()
+                time.sleep(0.01)
+            return session.query(PlayerPlay).count()
+        finally:
+            session.close()
+        
+    def test_batch_size_wakes_up_the_writer(self):
+        journal = MoveJournal(self.session_factory, strategy="executemany", batch_size=2, flush_interval=60)
+        journal.record_play(1, 1, 10, "move", (0, 0), (0, 1))
+        journal.record_play(1, 1, 11, "move", (0, 0), (0, 1))
+        self.assertEqual(self._wait_for_plays(2), 2)
+        self.assertEqual(journal.pending(), 0)
+        journal.stop()
+        
+    def test_plays_are_written_on_an_interval(self):
+        journal = MoveJournal(self.session_factory, strategy="executemany", batch_size=100, flush_interval=0.05)
+        journal.record_play(1, 1, 10, "move", (0, 0), (0, 1))
+        self.assertEqual(self._wait_for_plays(1), 1)
+        journal.stop()
+        
+    def test_failed_write_keeps_the_plays(self):
+        failures = []
+        
+        def session_factory():
+            session = self.session_factory()
+            if not failures:
+                failures.append(1)
+                session.execute = lambda *args, **kwargs: (_ for _ in ()).throw(SQLAlchemyError("down"))
+            return session
+        
+        journal = MoveJournal(session_factory, strategy="executemany", batch_size=100, flush_interval=60)
+        self._play_two_rounds(journal)
+        journal.close_round(1, 2)
+        self.assertEqual(journal.flush(), 0)
+        self.assertEqual(journal.pending(), 3)
+        self.assertEqual(journal.flush(), 3)
+        journal.stop()
+        
+        session = self.session_factory()
+        try:
+            self.assertEqual(session.query(PlayerPlay).count(), 3)
+            self.assertEqual([turn.end_time is not None for turn in session.query(Turn)], [True, True])
+        finally:
+            session.close()
+
+class MigrationTest(unittest.TestCase):
+    def test_upgrade_adds_missing_indexes(self):
+        from sqlalchemy import inspect
+        from db.migrations import upgrade
+        engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(engine)
+        # A database created before the indexes were declared
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.drop(engine)
+        
+        upgrade(engine)
+        upgrade(engine)
+        
+        inspector = inspect(engine)
+        self.assertEqual({index["name"]: index["column_names"] for index in inspector.get_indexes("players_in_parties")},
+                         {"ix_players_in_parties_party_alive": ["id_party", "is_alive"]})
+        self.assertEqual([index["name"] for index in inspector.get_indexes("turns")], ["ix_turns_id_party"])
+        self.assertEqual([index["name"] for index in inspector.get_indexes("players_play")], ["ix_players_play_id_turn"])
+        engine.dispose()
+
+class LazyStartupTest(unittest.TestCase):
+    def test_import_and_game_state_do_not_touch_the_database(self):
+        import subprocess
+        script = ("import db, db.database\n"
+                  "from db import *\n"
+                  "from game.state import GameState\n"
+                  "game_state = GameState()\n"
+                  "assert db.database._engine is None and db.database._db_url is None\n"
+                  "assert not game_state.bootstrapped\n")
+        # An unresolvable host: resolving it at import time would show up as a warning
+        env = dict(os.environ, DB_HOST="db")
+        env.pop("DB_URL", None)
+        result = subprocess.run([sys.executable, "-c", script], cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                env=env, capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertNotIn("Could not resolve hostname", result.stderr)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,20 +1,27 @@
 import unittest
 import sys
 import os
+import tempfile
+import threading
+import time
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from db.database import Base, Session
+from db.models import Party, Player, PlayerInParty
 import server_pb2
+from config import MAX_PLAYERS_PER_GAME
 from game.state import GameState
+from game.eviction import GameArchive, GameEvictor
 from game.server import GameServerServicer
 from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
 from sqlalchemy.orm import sessionmaker, scoped_session
 
 class TestWithSQLite(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
-        # Use SQLite in-memory database for testing
-        engine = create_engine('sqlite:///:memory:')
+        # Use SQLite in-memory database for testing, shared with the background writers
+        engine = create_engine('sqlite://', poolclass=StaticPool, connect_args={'check_same_thread': False})
         
         # Import models to ensure they're registered with SQLAlchemy
         from db.models import Party, Role, Player, PlayerInParty, Turn, PlayerPlay
@@ -24,6 +31,7 @@ class TestWithSQLite(unittest.TestCase):
         
         # Configure session factory - use scoped_session to better manage connections
         cls.session_factory = scoped_session(sessionmaker(bind=engine))
+        Session.remove()
         Session.configure(bind=engine)
         
         # Initialize roles or any other required data
@@ -78,5 +86,217 @@ class TestWithSQLite(unittest.TestCase):
         self.assertIsNotNone(player_id)
         self.assertEqual(role, server_pb2.Wolf)  # First player should be Wolf
         
+    def test_whole_party_is_enrolled_at_once(self):
+        game_id = self.game_state.create_new_game()
+        names = [f"Bot {i}" for i in range(MAX_PLAYERS_PER_GAME + 2)]
+        
+        joined = self.game_state.add_players_to_game(names, game_id)
+        self.assertEqual(len(joined), MAX_PLAYERS_PER_GAME)
+        self.assertEqual([role for _, role in joined].count(server_pb2.Wolf), 1)
+        self.assertTrue(self.game_state.get_game(game_id).started)
+        self.assertEqual(self.game_state.add_players_to_game(["Late"], game_id), [])
+        
+        session = Session()
+        try:
+            rows = session.query(PlayerInParty).filter_by(id_party=game_id).all()
+            self.assertEqual(sorted(row.id_player for row in rows), sorted(player_id for player_id, _ in joined))
+        finally:
+            session.close()
+        
+    def test_active_game_is_hydrated_on_first_access(self):
+        active_id, finished_id = 10**6, 10**6 + 1
+        session = Session()
+        session.add_all([
+            Party(id_party=active_id, title_party="Active"),
+            Party(id_party=finished_id, title_party="Finished", winner="Wolves"),
+            Player(id_player=10**6, pseudo="Wolf"),
+            Player(id_player=10**6 + 1, pseudo="Villager"),
+            Player(id_player=10**6 + 2, pseudo="Dead"),
+        ])
+        session.add_all([
+            PlayerInParty(id_party=active_id, id_player=10**6, id_role=server_pb2.Wolf, is_alive=True),
+            PlayerInParty(id_party=active_id, id_player=10**6 + 1, id_role=server_pb2.Villager, is_alive=True),
+            PlayerInParty(id_party=active_id, id_player=10**6 + 2, id_role=server_pb2.Villager, is_alive=False),
+        ])
+        session.commit()
+        Session.remove()
+        
+        self.assertNotIn(active_id, self.game_state.games)
+        self.assertIn(active_id, self.game_state.list_games())
+        self.assertNotIn(finished_id, self.game_state.list_games())
+        
+        game = self.game_state.get_game(active_id)
+        self.assertEqual(game.title, "Active")
+        self.assertEqual(game.players, [10**6, 10**6 + 1, 10**6 + 2])
+        self.assertEqual(game.alive_counts, {server_pb2.Wolf: 1, server_pb2.Villager: 1})
+        self.assertEqual(self.game_state.players[10**6].role, server_pb2.Wolf)
+        self.assertFalse(self.game_state.players[10**6 + 2].is_alive)
+        self.assertEqual(self.game_state.check_occupancy_index(active_id), [])
+        
+        # Finished games stay in the database
+        self.assertIsNone(self.game_state.get_game(finished_id))
+        self.assertNotIn(finished_id, self.game_state.games)
+    
+    def test_delta_across_a_rehydration_is_a_full_board(self):
+        game_id = self.game_state.create_new_game()
+        wolf_id, _ = self.game_state.add_player_to_game("Wolf", game_id)
+        self.game_state.add_player_to_game("Villager", game_id)
+        version, _, _, _ = self.game_state.get_board_delta(game_id, wolf_id, -1)
+        
+        # A restarted server loads the game from the database, players on new cells
+        game = self.game_state.games.pop(game_id)
+        for player_id in game.players:
+            self.game_state.players.pop(player_id)
+        new_version, full, cells, changes = self.game_state.get_board_delta(game_id, wolf_id, version)
+        self.assertGreater(new_version, version)
+        self.assertTrue(full)
+        self.assertEqual(cells, self.game_state.games[game_id].board.render())
+        self.assertEqual(changes, [])
+    
+    def test_cold_games_load_in_parallel(self):
+        self._use_temp_archive()
+        # The first load waits for the second one: a shared lock would deadlock until the timeout
+        second_loaded = threading.Event()
+        
+        def slow_hydrate(game_id):
+            if game_id == 2 * 10**6:
+                self.assertTrue(second_loaded.wait(5))
+            game = self.game_state.game_factory.create_game(f"Game {game_id}", game_id=game_id)
+            self.game_state.games[game_id] = game
+            second_loaded.set()
+            return game
+        
+        self.game_state._hydrate_game = slow_hydrate
+        self.addCleanup(vars(self.game_state).pop, "_hydrate_game")
+        first = threading.Thread(target=self.game_state.get_game, args=(2 * 10**6,))
+        first.start()
+        self.assertEqual(self.game_state.get_game(2 * 10**6 + 1).title, f"Game {2 * 10**6 + 1}")
+        first.join(5)
+        self.assertEqual(self.game_state.games[2 * 10**6].title, f"Game {2 * 10**6}")
+        self.assertEqual(self.game_state._hydration_locks, {})
+        for game_id in (2 * 10**6, 2 * 10**6 + 1):
+            self.game_state.evict_game(game_id)
+    
+    def _use_temp_archive(self):
+        archive_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(archive_dir.cleanup)
+        previous = self.game_state.archive
+        self.game_state.archive = GameArchive(archive_dir.name)
+        self.addCleanup(setattr, self.game_state, "archive", previous)
+    
+    def test_finished_game_is_evicted_and_restored(self):
+        self._use_temp_archive()
+        game_id = self.game_state.create_new_game()
+        wolf_id, _ = self.game_state.add_player_to_game("Wolf", game_id)
+        villager_id, _ = self.game_state.add_player_to_game("Villager", game_id)
+        self.game_state._kill_player(wolf_id)
+        self.assertEqual(self.game_state.get_game_winner(game_id), "Villagers")
+        position = self.game_state.players[villager_id].position
+        version = self.game_state.games[game_id].board.version
+        
+        evictor = GameEvictor(self.game_state, finished_ttl=0, idle_ttl=3600)
+        self.assertIn(game_id, evictor.candidates(time.monotonic()))
+        self.assertGreaterEqual(evictor.run_once(), 1)
+        self.assertNotIn(game_id, self.game_state.games)
+        self.assertNotIn(villager_id, self.game_state.players)
+        
+        reply = self.servicer.GetGameStatus(
+            server_pb2.GetGameStatusRequest(id_game=game_id, id_player=villager_id), None)
+        self.assertTrue(reply.status)
+        self.assertEqual(reply.winner, "Villagers")
+        self.assertTrue(reply.alive)
+        self.assertEqual(self.game_state.players[villager_id].position, position)
+        self.assertFalse(self.game_state.players[wolf_id].is_alive)
+        self.assertEqual(self.game_state.check_occupancy_index(game_id), [])
+        # Versions go on from the evicted board: a client's older version is never taken for a newer one
+        new_version, full, _, _ = self.game_state.get_board_delta(game_id, villager_id, version - 1)
+        self.assertGreater(new_version, version)
+        self.assertTrue(full)
+    
+    def test_pending_moves_survive_eviction(self):
+        self._use_temp_archive()
+        game_id = self.game_state.create_new_game()
+        wolf_id, _ = self.game_state.add_player_to_game("Wolf", game_id)
+        self.game_state.add_player_to_game("Villager", game_id)
+        scheduler = self.game_state.scheduler
+        self.assertTrue(scheduler.start_game(self.game_state.games[game_id]))
+        for move in ("01", "02", "10", "12", "20", "21", "22"):
+            accepted = scheduler.submit_move(game_id, wolf_id, move)
+            if accepted is not None:
+                break
+        round_number, target = accepted
+        
+        self.assertTrue(self.game_state.evict_game(game_id))
+        game = self.game_state.get_game(game_id)
+        self.assertEqual(game.pending_moves, {wolf_id: move})
+        self.assertTrue(scheduler.resolve_round(game, round_number))
+        self.assertEqual(self.game_state.players[wolf_id].position, target)
+    
+    def test_archive_is_private_to_the_server_and_its_database(self):
+        self._use_temp_archive()
+        game_id = self.game_state.create_new_game()
+        self.game_state.add_player_to_game("Wolf", game_id)
+        self.game_state.evict_game(game_id)
+        # Another server using the same ARCHIVE_DIR does not see the document
+        other = GameArchive(os.path.dirname(self.game_state.archive.directory))
+        self.addCleanup(other.clear)
+        self.assertIsNone(other.load(game_id))
+        
+        # Nor does this one once the party is gone from the database
+        session = Session()
+        for table in reversed(Base.metadata.sorted_tables):
+            session.execute(table.delete())
+        session.commit()
+        Session.remove()
+        self.assertIsNone(self.game_state.get_game(game_id))
+        self.assertIsNone(self.game_state.archive.load(game_id))
+    
+    def test_reads_fetch_a_game_evicted_before_they_lock_it(self):
+        self._use_temp_archive()
+        game_id = self.game_state.create_new_game()
+        wolf_id, _ = self.game_state.add_player_to_game("Wolf", game_id)
+        villager_id, _ = self.game_state.add_player_to_game("Villager", game_id)
+        wolf_view = self.game_state.get_visible_cells(game_id, wolf_id)
+        villager_view = self.game_state.get_visible_cells(game_id, villager_id)
+        get_game = self.game_state.get_game
+        
+        def get_game_then_evict(requested_id):
+            # The evictor runs between the lookup and the lock of every first call
+            game = get_game(requested_id)
+            if game is not None and not game.evicted and evictions:
+                evictions.pop()
+                self.game_state.evict_game(requested_id)
+            return game
+        
+        self.game_state.get_game = get_game_then_evict
+        self.addCleanup(vars(self.game_state).pop, "get_game")
+        evictions = [None]
+        self.assertEqual(self.game_state.get_visible_cells(game_id, wolf_id), wolf_view)
+        evictions = [None]
+        self.assertEqual(self.game_state.get_visible_cells(game_id, villager_id), villager_view)
+        evictions = [None]
+        _, full, cells, _ = self.game_state.get_board_delta(game_id, villager_id, 0)
+        self.assertTrue(full)
+        self.assertEqual(cells, villager_view)
+        self.assertFalse(evictions)
+    
+    def test_least_recently_used_games_are_evicted_over_limit(self):
+        self._use_temp_archive()
+        for game_id in list(self.game_state.games):
+            self.game_state.evict_game(game_id)
+        game_ids = [self.game_state.create_new_game() for _ in range(3)]
+        self.game_state.add_player_to_game("Wolf", game_ids[0])
+        self.game_state.get_game(game_ids[0])
+        
+        evictor = GameEvictor(self.game_state, finished_ttl=3600, idle_ttl=3600, max_resident=1)
+        self.assertEqual(evictor.run_once(), 2)
+        self.assertEqual(list(self.game_state.games), [game_ids[0]])
+        
+        # Active games come back from the archive with their players
+        game = self.game_state.get_game(game_ids[1])
+        self.assertIsNotNone(game)
+        self.assertEqual(game.players, [])
+        self.assertEqual(len(self.game_state.get_game(game_ids[0]).players), 1)
+        
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file